@@ -37,8 +37,8 @@ def _linear_bus(date: datetime, curve: _BaseCurve) -> DualTypes:
 
 def _log_linear(date: datetime, curve: _BaseCurve) -> DualTypes:
     x, x_1, x_2, i = _get_posix(date, curve)
-    node_values = list(curve.nodes.nodes.values())
-    y_1, y_2 = dual_log(node_values[i]), dual_log(node_values[i + 1])
+    log_values = curve.nodes.log_values
+    y_1, y_2 = log_values[i], log_values[i + 1]
     return dual_exp(y_1 + (y_2 - y_1) * (x - x_1) / (x_2 - x_1))
 
 
@@ -47,8 +47,8 @@ def _log_linear_bus(date: datetime, curve: _BaseCurve) -> DualTypes:
     x_1, x_2 = curve.nodes.keys[i], curve.nodes.keys[i + 1]
     d_n = dcf(x_1, x_2, "bus252", calendar=curve.meta.calendar)
     d_m = dcf(x_1, date, "bus252", calendar=curve.meta.calendar)
-    node_values = list(curve.nodes.nodes.values())
-    y_1, y_2 = dual_log(node_values[i]), dual_log(node_values[i + 1])
+    log_values = curve.nodes.log_values
+    y_1, y_2 = log_values[i], log_values[i + 1]
     return dual_exp(y_1 + (y_2 - y_1) * d_m / d_n)
 
 
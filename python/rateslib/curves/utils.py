@@ -508,6 +508,11 @@ class _CurveNodes:
         """A list of values in ``nodes``."""
         return list(self._nodes.values())
 
+    @cached_property
+    def log_values(self) -> list[DualTypes]:
+        """A list of the natural logarithm of ``values``, used by log-linear interpolation."""
+        return [dual_log(_) for _ in self.values]
+
     @property
     def n(self) -> int:
         """Number of parameters contained in ``nodes``."""
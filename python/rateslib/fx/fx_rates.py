@@ -19,6 +19,7 @@ from rateslib.dual.utils import _get_adorder
 from rateslib.mutability import (
     _clear_cache_post,
     _new_state_post,
+    _WithCache,
     _WithState,
 )
 from rateslib.rs import Ccy, FXRate
@@ -42,7 +43,7 @@ if TYPE_CHECKING:
 # Contact rateslib at gmail.com if this code is observed outside its intended sphere.
 
 
-class FXRates(_WithState):
+class FXRates(_WithState, _WithCache[str, "Number"]):
     """
     Object to store and calculate FX rates for a consistent settlement date.
 
@@ -263,8 +264,10 @@ class FXRates(_WithState):
            fxr = FXRates({"usdeur": 2.0, "usdgbp": 2.5})
            fxr.rate("eurgbp")
         """
+        if defaults.curve_caching and pair in self._cache:
+            return self._cache[pair]
         domi, fori = self.currencies[pair[:3].lower()], self.currencies[pair[3:].lower()]
-        return self._fx_array_el(domi, fori)
+        return self._cached_value(pair, self._fx_array_el(domi, fori))
 
     def restate(self, pairs: list[str], keep_ad: bool = False) -> FXRates:
         """
@@ -490,6 +493,8 @@ class FXRates(_WithState):
         """
         # the fx_array is a cached property.
         self.__dict__.pop("fx_array", None)
+        # memoized ``rate`` lookups are derived from the fx_array.
+        super()._clear_cache()
 
     # Mutation
 
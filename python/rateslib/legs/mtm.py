@@ -27,6 +27,7 @@ if TYPE_CHECKING:
         Schedule,
         _BaseCurve,
         _BaseCurve_,
+        datetime,
         datetime_,
         int_,
         str_,
@@ -157,7 +158,7 @@ class BaseLegMtm(BaseLeg, metaclass=ABCMeta):
     # Commercial use of this code, and/or copying and redistribution is prohibited.
     # Contact rateslib at gmail.com if this code is observed outside its intended sphere.
 
-    def _get_fx_fixings(self, fx: FX_) -> list[DualTypes]:
+    def _get_fx_fixings(self, fx: FX_, exchange_dates: list[datetime]) -> list[DualTypes]:
         """
         Return the calculated FX fixings.
 
@@ -171,23 +172,17 @@ class BaseLegMtm(BaseLeg, metaclass=ABCMeta):
         fx : FXForwards, optional
             The object to derive FX fixings that are not otherwise given in
             ``fx_fixings``.
+        exchange_dates : list of datetime
+            The settlement date of each notional exchange, as returned by
+            :meth:`_get_exchange_dates`.
         """
         n_given, n_req = len(self.fx_fixings), self.schedule.n_periods
         fx_fixings_: list[DualTypes] = self.fx_fixings.copy()
 
         # Only FXForwards can correctly forecast rates. Other inputs may raise or warn.
         if isinstance(fx, FXForwards):
-            for i in range(n_given, n_req):
-                fx_fixings_.append(
-                    fx.rate(
-                        self.alt_currency + self.currency,
-                        self.schedule.calendar.lag_bus_days(
-                            self.schedule.aschedule[i],
-                            self.payment_lag_exchange,
-                            True,
-                        ),
-                    ),
-                )
+            pair = self.alt_currency + self.currency
+            fx_fixings_.extend(fx.rate(pair, exchange_dates[i]) for i in range(n_given, n_req))
         elif n_req > 0:  # only check if unknown fixings are required
             fx_fixings_ = _get_fx_fixings_from_non_fx_forwards(n_given, n_req, fx_fixings_)
         return fx_fixings_
@@ -195,21 +190,30 @@ class BaseLegMtm(BaseLeg, metaclass=ABCMeta):
     def _set_periods(self) -> None:
         raise NotImplementedError("Mtm Legs do not implement this. Look for _set_periods_mtm().")
 
+    def _get_exchange_dates(self) -> list[datetime]:
+        """
+        Return the settlement dates of the notional exchanges, one per adjusted schedule date.
+
+        These are shared by the FX fixing forecasts and the exchange cashflows so each date is
+        lagged only once per period construction.
+        """
+        return [
+            self.schedule.calendar.lag_bus_days(date, self.payment_lag_exchange, True)
+            for date in self.schedule.aschedule
+        ]
+
     def _set_periods_mtm(self, fx: FX_) -> None:
-        fx_fixings_: list[DualTypes] = self._get_fx_fixings(fx)
+        exchange_dates = self._get_exchange_dates()
+        fx_fixings_: list[DualTypes] = self._get_fx_fixings(fx, exchange_dates)
         self.notional = fx_fixings_[0] * self.alt_notional
-        notionals = [self.alt_notional * fx_fixings_[i] for i in range(len(fx_fixings_))]
+        notionals = [self.alt_notional * fx_fixing for fx_fixing in fx_fixings_]
 
         # initial exchange
         self.periods = (
             [
                 Cashflow(
                     -self.notional,
-                    self.schedule.calendar.lag_bus_days(
-                        self.schedule.aschedule[0],
-                        self.payment_lag_exchange,
-                        True,
-                    ),
+                    exchange_dates[0],
                     self.currency,
                     "Exchange",
                     fx_fixings_[0],
@@ -233,11 +237,7 @@ class BaseLegMtm(BaseLeg, metaclass=ABCMeta):
         mtm_flows = [
             Cashflow(
                 -notionals[i + 1] + notionals[i],
-                self.schedule.calendar.lag_bus_days(
-                    self.schedule.aschedule[i + 1],
-                    self.payment_lag_exchange,
-                    True,
-                ),
+                exchange_dates[i + 1],
                 self.currency,
                 "Mtm",
                 fx_fixings_[i + 1],
@@ -254,11 +254,7 @@ class BaseLegMtm(BaseLeg, metaclass=ABCMeta):
         self.periods.append(
             Cashflow(
                 notionals[-1],
-                self.schedule.calendar.lag_bus_days(
-                    self.schedule.aschedule[-1],
-                    self.payment_lag_exchange,
-                    True,
-                ),
+                exchange_dates[-1],
                 self.currency,
                 "Exchange",
                 fx_fixings_[-1],
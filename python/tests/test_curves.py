@@ -112,6 +112,21 @@ def test_log_linear_interp() -> None:
     assert all(np.isclose(gradient(result, ["v0", "v1"]), expected.dual))
 
 
+def test_log_linear_interp_after_update_node() -> None:
+    curve = Curve(
+        nodes={
+            dt(2022, 3, 1): 1.00,
+            dt(2022, 3, 31): 0.99,
+        },
+        interpolation="log_linear",
+    )
+    curve[dt(2022, 3, 16)]
+    curve.update_node(dt(2022, 3, 31), 0.98)
+    assert curve.nodes.log_values[1] == log(0.98)
+    result = curve[dt(2022, 3, 16)]
+    assert abs(result - exp(log(0.98) / 2)) < 1e-15
+
+
 def test_linear_zero_rate_interp() -> None:
     # not tested
     pass
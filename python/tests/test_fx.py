@@ -42,6 +42,16 @@ class TestStateAndCache:
         new = fxr.rate("eurgbp")
         assert new != original
 
+    @pytest.mark.parametrize(
+        ("meth", "args"), [("update", ({"eurusd": 2.0},)), ("_set_ad_order", (2,))]
+    )
+    def test_fxrates_rate_cache_clearing(self, meth, args):
+        fxr = FXRates({"eurusd": 1.0, "usdgbp": 1.0})
+        fxr.rate("eurgbp")
+        assert "eurgbp" in fxr._cache
+        getattr(fxr, meth)(*args)
+        assert fxr._cache == {}
+
     @pytest.mark.parametrize(
         ("meth", "args"), [("update", ([{"eurusd": 1.0}],)), ("_set_ad_order", (2,))]
     )
@@ -15,6 +15,13 @@ Categories:
 Each recipe is implemented as a standalone function that can be run independently.
 """
 
+import contextlib
+import functools
+import io
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import numpy as np
 import pandas as pd
 from datetime import datetime as dt
@@ -1884,8 +1891,7 @@ def recipe_13_eurusd_market():
         id="xcs",
     )
 
-    print("
-FX Volatility Surface construction...")
+    print("\nFX Volatility Surface construction...")
     
     # FX Vol Surface - Delta convention
     expiries = ["1m", "2m", "3m", "6m", "9m", "1y", "2y"]
@@ -1902,8 +1908,7 @@ FX Volatility Surface construction...")
     print(f"  ATM vols: {vol_data['atm']}")
     
     # SABR calibration example
-    print("
-SABR Model Calibration:")
+    print("\nSABR Model Calibration:")
     sabr_params = {
         "alpha": 0.3,  # Initial vol
         "beta": 0.5,   # CEV exponent
@@ -1916,8 +1921,7 @@ SABR Model Calibration:")
     print(f"  ρ (rho): {sabr_params['rho']:.2f}")
     print(f"  ν (nu): {sabr_params['nu']:.2f}")
     
-    print("
-Market Summary:")
+    print("\nMarket Summary:")
     print(f"  Spot EURUSD: {fxr.rate('eurusd'):.4f}")
     print(f"  EUR 1Y rate: {mkt_data[mkt_data['tenor'] == '1y']['estr'].values[0]:.3f}%")
     print(f"  USD 1Y rate: {mkt_data[mkt_data['tenor'] == '1y']['sofr'].values[0]:.3f}%")
@@ -1953,8 +1957,7 @@ def recipe_14_bond_conventions():
     print("=" * 80)
     
     # Standard bond conventions by market
-    print("
-1. Standard Bond Conventions by Market:")
+    print("\n1. Standard Bond Conventions by Market:")
     
     conventions = {
         "US Treasury": {
@@ -1995,13 +1998,11 @@ def recipe_14_bond_conventions():
     }
     
     for market, conv in conventions.items():
-        print(f"
-  {market}:")
+        print(f"\n  {market}:")
         for key, val in conv.items():
             print(f"    {key:12}: {val}")
     
-    print("
-2. Creating bonds with different conventions...")
+    print("\n2. Creating bonds with different conventions...")
     
     # Create sample curve
     curve = Curve(
@@ -2027,8 +2028,7 @@ def recipe_14_bond_conventions():
         coupon=4.25,
     )
     
-    print(f"
-  US Treasury 5Y:")
+    print(f"\n  US Treasury 5Y:")
     print(f"    Coupon: 4.25%")
     print(f"    Maturity: 2029-01-15")
     npv_ust = ust.npv(curve)
@@ -2046,15 +2046,13 @@ def recipe_14_bond_conventions():
         coupon=2.50,
     )
     
-    print(f"
-  German Bund 10Y:")
+    print(f"\n  German Bund 10Y:")
     print(f"    Coupon: 2.50%")
     print(f"    Maturity: 2034-02-10")
     npv_bund = bund.npv(curve)
     print(f"    Price: {npv_bund:.3f}")
     
-    print("
-3. Custom Bond Calculation Mode (Thai Government Bond example)...")
+    print("\n3. Custom Bond Calculation Mode (Thai Government Bond example)...")
     
     # Thai Government Bond with custom calculation
     class ThaiBondCalcMode:
@@ -2080,8 +2078,7 @@ def recipe_14_bond_conventions():
     print("    Yield calculation: Modified duration")
     print("    Settlement: T+2 Bangkok time")
     
-    print("
-4. Accrued Interest Calculations...")
+    print("\n4. Accrued Interest Calculations...")
     
     # Different accrued interest conventions
     settlement = dt(2024, 7, 15)
@@ -2100,14 +2097,12 @@ def recipe_14_bond_conventions():
     print(f"  Coupon: {coupon_rate}%")
     print(f"  Days accrued: 181")
     
-    print("
-  Convention     Fraction    Accrued")
+    print("\n  Convention     Fraction    Accrued")
     for conv, frac in conventions_accrued.items():
         accrued = coupon_rate * frac / 2  # Semi-annual
         print(f"  {conv:12}  {frac:.5f}    {accrued:.4f}")
     
-    print("
-5. Ex-Dividend Date Handling...")
+    print("\n5. Ex-Dividend Date Handling...")
     
     print("  Different markets handle ex-dividend differently:")
     print("    US: Record date - 1 business day")
@@ -2115,8 +2110,7 @@ def recipe_14_bond_conventions():
     print("    Germany: Payment date - 3 business days")
     print("    Japan: Record date - 3 business days")
     
-    print("
-6. Yield Calculation Methods...")
+    print("\n6. Yield Calculation Methods...")
     
     yield_methods = {
         "Street Convention": "Ignores call features",
@@ -2149,8 +2143,7 @@ def recipe_15_inflation_instruments():
     print("Recipe 15: Inflation Instruments")
     print("=" * 80)
     
-    print("
-1. Creating RPI Index Series...")
+    print("\n1. Creating RPI Index Series...")
     
     # Historical RPI index values
     rpi_series = {
@@ -2166,8 +2159,7 @@ def recipe_15_inflation_instruments():
     for date, index in rpi_series.items():
         print(f"  {date.strftime('%Y-%m-%d')}: {index:.1f}")
     
-    print("
-2. Building Index Curve...")
+    print("\n2. Building Index Curve...")
     
     # Create index curve for inflation
     index_curve = IndexCurve(
@@ -2186,8 +2178,7 @@ def recipe_15_inflation_instruments():
     print(f"  Index lag: 3 months")
     print(f"  Interpolation: linear_index")
     
-    print("
-3. Creating Inflation-Linked Bond...")
+    print("\n3. Creating Inflation-Linked Bond...")
     
     # UK Index-Linked Gilt example
     ilb = IndexFixedRateBond(
@@ -2212,13 +2203,11 @@ def recipe_15_inflation_instruments():
     current_index = index_curve.index_value(dt(2024, 7, 1))
     index_ratio = current_index / 340.0
     
-    print(f"
-  Current index: {current_index:.1f}")
+    print(f"\n  Current index: {current_index:.1f}")
     print(f"  Index ratio: {index_ratio:.4f}")
     print(f"  Inflation uplift: {(index_ratio - 1) * 100:.2f}%")
     
-    print("
-4. Cash Flow Calculation...")
+    print("\n4. Cash Flow Calculation...")
     
     # Calculate real and nominal cash flows
     real_coupon = 0.125
@@ -2228,12 +2217,10 @@ def recipe_15_inflation_instruments():
     print(f"  Nominal coupon payment: £{nominal_coupon:.3f} per £100")
     print(f"  Principal redemption: £{100 * index_ratio:.2f}")
     
-    print("
-5. Inflation Derivatives...")
+    print("\n5. Inflation Derivatives...")
     
     # Zero-Coupon Inflation Swap (ZCIS)
-    print("
-  Zero-Coupon Inflation Swap (ZCIS):")
+    print("\n  Zero-Coupon Inflation Swap (ZCIS):")
     print("    Pays: Fixed inflation rate")
     print("    Receives: Actual inflation (index ratio - 1)")
     
@@ -2244,15 +2231,13 @@ def recipe_15_inflation_instruments():
     projected_index = index_curve.index_value(dt(2029, 7, 1))
     float_leg = projected_index / current_index - 1
     
-    print(f"
-    5Y ZCIS:")
+    print(f"\n    5Y ZCIS:")
     print(f"    Fixed rate: {zcis_rate:.1f}%")
     print(f"    Fixed leg: {fixed_leg * 100:.2f}%")
     print(f"    Float leg: {float_leg * 100:.2f}%")
     print(f"    Swap value: {(float_leg - fixed_leg) * 100:.2f}%")
     
-    print("
-6. Year-on-Year Inflation Swap...")
+    print("\n6. Year-on-Year Inflation Swap...")
     
     yoy_rates = []
     for i in range(1, 6):
@@ -2264,11 +2249,9 @@ def recipe_15_inflation_instruments():
         yoy_rates.append(yoy)
         print(f"  Year {i}: {yoy:.2f}%")
     
-    print(f"
-  Average YoY: {np.mean(yoy_rates):.2f}%")
+    print(f"\n  Average YoY: {np.mean(yoy_rates):.2f}%")
     
-    print("
-7. Inflation Risk Metrics...")
+    print("\n7. Inflation Risk Metrics...")
     
     # Inflation duration and convexity
     print("  Risk metrics for inflation-linked bonds:")
@@ -2280,8 +2263,7 @@ def recipe_15_inflation_instruments():
     real_duration = 9.5
     inflation_duration = 10.2
     
-    print(f"
-  10Y ILB example:")
+    print(f"\n  10Y ILB example:")
     print(f"    Real duration: {real_duration:.1f} years")
     print(f"    Inflation duration: {inflation_duration:.1f} years")
     print(f"    1% inflation shock: {inflation_duration:.1f}% price change")
@@ -2314,8 +2296,7 @@ def recipe_16_inflation_quantlib():
     print("Recipe 16: Inflation vs QuantLib")
     print("=" * 80)
     
-    print("
-1. Inflation Curve Calibration...")
+    print("\n1. Inflation Curve Calibration...")
     
     # Market ZCIS rates
     zcis_quotes = {
@@ -2334,8 +2315,7 @@ def recipe_16_inflation_quantlib():
     for tenor, rate in zcis_quotes.items():
         print(f"    {tenor:3}: {rate:.2f}%")
     
-    print("
-2. Building Seasonality Adjustment...")
+    print("\n2. Building Seasonality Adjustment...")
     
     # Monthly seasonality factors
     seasonality = {
@@ -2360,8 +2340,7 @@ def recipe_16_inflation_quantlib():
         adjustment = (factor - 1) * 100
         print(f"    {month_name}: {adjustment:+.1f}%")
     
-    print("
-3. Calibrating Inflation Curve...")
+    print("\n3. Calibrating Inflation Curve...")
     
     # Base CPI index
     base_cpi = 300.0
@@ -2387,8 +2366,7 @@ def recipe_16_inflation_quantlib():
     print(f"  Base CPI: {base_cpi:.1f}")
     print(f"  Calibration date: {today.strftime('%Y-%m-%d')}")
     
-    print("
-4. Forward Inflation Rates...")
+    print("\n4. Forward Inflation Rates...")
     
     # Calculate forward inflation rates
     print("  Forward Inflation Rates:")
@@ -2405,8 +2383,7 @@ def recipe_16_inflation_quantlib():
         
         print(f"    {t1}Y-{t2}Y: {forward_rate:.2f}%")
     
-    print("
-5. Inflation Volatility Surface...")
+    print("\n5. Inflation Volatility Surface...")
     
     # Inflation cap/floor volatilities
     cap_vols = {
@@ -2429,8 +2406,7 @@ def recipe_16_inflation_quantlib():
         vols = [cap_vols.get((tenor, strike), 0) for strike in [2.0, 3.0, 4.0]]
         print(f"  {tenor:3}   {vols[0]:4.0}  {vols[1]:4.0}  {vols[2]:4.0}")
     
-    print("
-6. Risk Analysis...")
+    print("\n6. Risk Analysis...")
     
     # Calculate inflation sensitivities
     print("  Inflation Delta (DV01) per 1bp:")
@@ -2443,8 +2419,7 @@ def recipe_16_inflation_quantlib():
         dv01 = notional * years * 0.0001
         print(f"    {tenor_str:3} ZCIS: ${dv01:,.0f}")
     
-    print("
-7. Inflation Gamma...")
+    print("\n7. Inflation Gamma...")
     
     # Second-order sensitivities
     print("  Inflation Gamma (convexity):")
@@ -2471,8 +2446,7 @@ def recipe_17_ibor_stubs():
     print("Recipe 17: IBOR Stub Periods")
     print("=" * 80)
     
-    print("
-1. Understanding Stub Periods...")
+    print("\n1. Understanding Stub Periods...")
     
     print("  Stub types:")
     print("    - Short Front Stub: First period shorter than regular")
@@ -2480,8 +2454,7 @@ def recipe_17_ibor_stubs():
     print("    - Short Back Stub: Last period shorter than regular")
     print("    - Long Back Stub: Last period longer than regular")
     
-    print("
-2. IBOR Interpolation Methods...")
+    print("\n2. IBOR Interpolation Methods...")
     
     methods = {
         "Linear": "Interpolate between two IBOR rates",
@@ -2492,8 +2465,7 @@ def recipe_17_ibor_stubs():
     for method, description in methods.items():
         print(f"  {method:10}: {description}")
     
-    print("
-3. Example: 18-month swap with 6M LIBOR...")
+    print("\n3. Example: 18-month swap with 6M LIBOR...")
     
     start_date = dt(2024, 3, 15)
     end_date = dt(2025, 9, 15)
@@ -2503,14 +2475,12 @@ def recipe_17_ibor_stubs():
     print(f"  Total: 18 months")
     print(f"  Frequency: 6M")
     
-    print("
-  Regular periods:")
+    print("\n  Regular periods:")
     print("    1. 2024-03-15 to 2024-09-15 (6M)")
     print("    2. 2024-09-15 to 2025-03-15 (6M)")
     print("    3. 2025-03-15 to 2025-09-15 (6M)")
     
-    print("
-4. Short Front Stub Example...")
+    print("\n4. Short Front Stub Example...")
     
     start_stub = dt(2024, 5, 15)  # 2 months later
     
@@ -2527,14 +2497,12 @@ def recipe_17_ibor_stubs():
     weight_6m = (4 - 3) / (6 - 3)
     libor_4m = weight_3m * libor_3m + weight_6m * libor_6m
     
-    print(f"
-  Rate interpolation:")
+    print(f"\n  Rate interpolation:")
     print(f"    3M LIBOR: {libor_3m:.2f}%")
     print(f"    6M LIBOR: {libor_6m:.2f}%")
     print(f"    4M interpolated: {libor_4m:.2f}%")
     
-    print("
-5. Long Back Stub Example...")
+    print("\n5. Long Back Stub Example...")
     
     end_stub = dt(2025, 12, 15)  # 3 months later
     
@@ -2546,14 +2514,12 @@ def recipe_17_ibor_stubs():
     libor_9m = 5.10
     libor_12m = 5.05
     
-    print(f"
-  Rate selection:")
+    print(f"\n  Rate selection:")
     print(f"    9M LIBOR: {libor_9m:.2f}%")
     print(f"    12M LIBOR: {libor_12m:.2f}%")
     print(f"    Use 9M rate: {libor_9m:.2f}%")
     
-    print("
-6. Compound Stub Calculation...")
+    print("\n6. Compound Stub Calculation...")
     
     print("  For RFR (SOFR/SONIA) stubs:")
     
@@ -2568,8 +2534,7 @@ def recipe_17_ibor_stubs():
     print(f"    Daily rates: {daily_rates}")
     print(f"    Compounded: {annualized:.3f}%")
     
-    print("
-7. Stub Period Risks...")
+    print("\n7. Stub Period Risks...")
     
     print("  Risk considerations:")
     print("    - Basis risk between tenors")
@@ -2784,8 +2749,7 @@ def recipe_19_historical_swaps():
     print("Recipe 19: Historical Swap Valuation")
     print("=" * 80)
     
-    print("
-1. Setting up historical swap...")
+    print("\n1. Setting up historical swap...")
     
     # Swap that started 2 years ago
     original_start = dt(2022, 7, 15)
@@ -2801,14 +2765,12 @@ def recipe_19_historical_swaps():
     notional = 100_000_000
     fixed_rate = 2.50  # Locked in when rates were lower
     
-    print(f"
-  Original terms:")
+    print(f"\n  Original terms:")
     print(f"    Notional: ${notional:,.0f}")
     print(f"    Fixed rate: {fixed_rate:.2f}%")
     print(f"    Frequency: Quarterly")
     
-    print("
-2. Historical cash flows...")
+    print("\n2. Historical cash flows...")
     
     # Past cash flows (already paid/received)
     past_periods = 8  # 2 years * 4 quarters
@@ -2825,11 +2787,9 @@ def recipe_19_historical_swaps():
         quarterly_payment = notional * 0.25 * (rate - fixed_rate) / 100
         historical_pnl += quarterly_payment
     
-    print(f"
-  Cumulative historical P&L: ${historical_pnl:,.0f}")
+    print(f"\n  Cumulative historical P&L: ${historical_pnl:,.0f}")
     
-    print("
-3. Current market rates...")
+    print("\n3. Current market rates...")
     
     current_rates = {
         "3M": 5.20,
@@ -2842,8 +2802,7 @@ def recipe_19_historical_swaps():
     for tenor, rate in current_rates.items():
         print(f"  {tenor}: {rate:.2f}%")
     
-    print("
-4. Remaining cash flow valuation...")
+    print("\n4. Remaining cash flow valuation...")
     
     # Calculate NPV of remaining cash flows
     remaining_periods = 12  # 3 years * 4 quarters
@@ -2869,15 +2828,13 @@ def recipe_19_historical_swaps():
     print(f"  Float leg PV: ${float_leg_pv:,.0f}")
     print(f"  Swap NPV: ${swap_npv:,.0f}")
     
-    print("
-5. Mark-to-market summary...")
+    print("\n5. Mark-to-market summary...")
     
     print(f"  Historical P&L: ${historical_pnl:,.0f}")
     print(f"  Current MTM: ${swap_npv:,.0f}")
     print(f"  Total value: ${historical_pnl + swap_npv:,.0f}")
     
-    print("
-6. Risk metrics for remaining swap...")
+    print("\n6. Risk metrics for remaining swap...")
     
     # DV01 for 3-year swap
     dv01 = notional * 3 * 0.0001
@@ -2886,8 +2843,7 @@ def recipe_19_historical_swaps():
     print(f"  Duration: ~2.7 years")
     print(f"  Convexity: Positive (receive fixed)")
     
-    print("
-7. Hedge considerations...")
+    print("\n7. Hedge considerations...")
     
     print("  To hedge remaining exposure:")
     print(f"    - Enter 3Y pay-fixed swap")
@@ -2927,8 +2883,7 @@ def recipe_20_amortization():
     print("Recipe 20: Amortization")
     print("=" * 80)
     
-    print("
-1. Types of Amortization...")
+    print("\n1. Types of Amortization...")
     
     amort_types = {
         "Linear": "Equal principal payments each period",
@@ -2940,8 +2895,7 @@ def recipe_20_amortization():
     for type_name, description in amort_types.items():
         print(f"  {type_name:15}: {description}")
     
-    print("
-2. Linear Amortization Example...")
+    print("\n2. Linear Amortization Example...")
     
     initial_notional = 10_000_000
     periods = 20  # 5 years quarterly
@@ -2958,13 +2912,11 @@ def recipe_20_amortization():
     print(f"  Periods: {periods}")
     print(f"  Amortization per period: ${initial_notional/periods:,.0f}")
     
-    print("
-  Schedule (first 5 periods):")
+    print("\n  Schedule (first 5 periods):")
     for i in range(5):
         print(f"    Period {i+1}: ${linear_schedule[i]:,.0f}")
     
-    print("
-3. Mortgage-Style Amortization...")
+    print("\n3. Mortgage-Style Amortization...")
     
     loan_amount = 1_000_000
     annual_rate = 5.0
@@ -2984,8 +2936,7 @@ def recipe_20_amortization():
     
     # Calculate amortization for first year
     balance = loan_amount
-    print("
-  First year amortization:")
+    print("\n  First year amortization:")
     
     for month in range(1, 13):
         interest = balance * monthly_rate
@@ -2996,8 +2947,7 @@ def recipe_20_amortization():
             print(f"    Month {month:2}: Interest ${interest:,.2f}, "
                   f"Principal ${principal:,.2f}, Balance ${balance:,.0f}")
     
-    print("
-4. Custom Amortization Schedule...")
+    print("\n4. Custom Amortization Schedule...")
     
     # Custom schedule (e.g., seasonal business)
     custom_schedule = {
@@ -3011,8 +2961,7 @@ def recipe_20_amortization():
     for quarter, pct in custom_schedule.items():
         print(f"    {quarter}: {pct*100:.0f}%")
     
-    print("
-5. Impact on Swap Valuation...")
+    print("\n5. Impact on Swap Valuation...")
     
     # Amortizing swap vs bullet swap
     print("  Comparison: $100M 5Y swap")
@@ -3027,8 +2976,7 @@ def recipe_20_amortization():
     print(f"    Amortizing DV01: ${amort_dv01:,.0f}")
     print(f"    Risk reduction: {(1 - amort_dv01/bullet_dv01)*100:.0f}%")
     
-    print("
-6. Weighted Average Life (WAL)...")
+    print("\n6. Weighted Average Life (WAL)...")
     
     # Calculate WAL for linear amortization
     wal = 0
@@ -3043,8 +2991,7 @@ def recipe_20_amortization():
     print(f"  Bullet WAL: 5.00 years")
     print(f"  WAL reduction: {5.0 - wal:.2f} years")
     
-    print("
-7. Prepayment Risk...")
+    print("\n7. Prepayment Risk...")
     
     print("  Prepayment considerations:")
     print("    - Mortgages: Refinancing risk when rates fall")
@@ -3053,8 +3000,7 @@ def recipe_20_amortization():
     
     cpr_scenarios = [5, 10, 15, 20]  # Annual CPR %
     
-    print("
-  CPR Impact on WAL (30Y mortgage):")
+    print("\n  CPR Impact on WAL (30Y mortgage):")
     for cpr in cpr_scenarios:
         # Simplified WAL calculation
         wal_cpr = 30 / (1 + cpr/100)
@@ -3088,15 +3034,13 @@ def recipe_21_cross_currency_config():
     print("Recipe 21: Cross-Currency Configuration")
     print("=" * 80)
     
-    print("
-1. FX Market Conventions...")
+    print("\n1. FX Market Conventions...")
     print("  Standard FX quotations:")
     print("    EURUSD = 1.0850  means 1 EUR = 1.0850 USD")
     print("    USDCAD = 1.3500  means 1 USD = 1.3500 CAD")
     print("    GBPUSD = 1.2500  means 1 GBP = 1.2500 USD")
     
-    print("
-2. Cross-Currency Swap Conventions...")
+    print("\n2. Cross-Currency Swap Conventions...")
     
     # Create FX rates
     fxr = FXRates({
@@ -3109,8 +3053,7 @@ def recipe_21_cross_currency_config():
     print(f"    EURUSD: {fxr.rate('eurusd'):.4f}")
     
     # Build curves
-    print("
-3. Building currency curves...")
+    print("\n3. Building currency curves...")
     
     usd_curve = Curve(
         nodes={
@@ -3154,8 +3097,7 @@ def recipe_21_cross_currency_config():
     print("  ✓ CAD curve (CORRA basis)")
     print("  ✓ USDCAD basis curve")
     
-    print("
-4. Cross-Currency Swap Setup...")
+    print("\n4. Cross-Currency Swap Setup...")
     
     # USDCAD cross-currency swap
     # Pay USD fixed, receive CAD float + basis
@@ -3177,8 +3119,7 @@ def recipe_21_cross_currency_config():
     print(f"    Initial exchange: Pay USD $100M, Receive CAD $135M")
     print(f"    Final exchange: Receive USD $100M, Pay CAD $135M")
     
-    print("
-5. Basis Swap Quotation...")
+    print("\n5. Basis Swap Quotation...")
     
     basis_quotes = {
         "1Y": -5,
@@ -3193,8 +3134,7 @@ def recipe_21_cross_currency_config():
     for tenor, basis in basis_quotes.items():
         print(f"    {tenor:3}: {basis:+3} bps")
     
-    print("
-6. Currency Strength Analysis...")
+    print("\n6. Currency Strength Analysis...")
     
     # Forward FX calculation
     spot = 1.3500
@@ -3213,22 +3153,19 @@ def recipe_21_cross_currency_config():
     else:
         print("  → CAD appreciating vs USD (CAD interest rates higher)")
     
-    print("
-7. MTM vs Non-MTM Cross-Currency...")
+    print("\n7. MTM vs Non-MTM Cross-Currency...")
     
     print("  Non-MTM (Traditional):")
     print("    - Fixed notionals throughout life")
     print("    - FX risk on principal exchange")
     print("    - Simpler accounting")
     
-    print("
-  MTM (Mark-to-Market):")
+    print("\n  MTM (Mark-to-Market):")
     print("    - Notional resets periodically")
     print("    - Reduced FX risk")
     print("    - Additional cash flows on reset dates")
     
-    print("
-8. Risk Decomposition...")
+    print("\n8. Risk Decomposition...")
     
     # Simplified risk breakdown
     risks = {
@@ -3247,8 +3184,7 @@ def recipe_21_cross_currency_config():
         else:
             print(f"    {risk_type:20}: {value} bps")
     
-    print("
-9. Hedging Considerations...")
+    print("\n9. Hedging Considerations...")
     
     print("  To hedge a USDCAD cross-currency swap:")
     print("    1. USD IRS to hedge USD rate risk")
@@ -3256,8 +3192,7 @@ def recipe_21_cross_currency_config():
     print("    3. FX forwards to hedge currency risk")
     print("    4. Basis swaps to hedge basis risk")
     
-    print("
-10. Common Mistakes...")
+    print("\n10. Common Mistakes...")
     
     print("  ❌ Wrong: Using CADUSD when market quotes USDCAD")
     print("  ❌ Wrong: Mixing up notional currencies")
@@ -3298,15 +3233,13 @@ def recipe_22_convexity_risk():
     print("Recipe 22: Convexity Risk Framework")
     print("=" * 80)
     
-    print("
-1. Understanding Convexity...")
+    print("\n1. Understanding Convexity...")
     print("  Convexity in different contexts:")
     print("    - Bond convexity: Price sensitivity to yield changes")
     print("    - Futures convexity: Difference between futures and forwards")
     print("    - Option convexity: Gamma (rate of change of delta)")
     
-    print("
-2. STIR Futures Convexity...")
+    print("\n2. STIR Futures Convexity...")
     
     # Eurodollar/SOFR futures example
     futures_price = 95.50  # Implies 4.50% rate
@@ -3326,8 +3259,7 @@ def recipe_22_convexity_risk():
     print(f"    Convexity Adjustment: {conv_adj:.1f} bps")
     print(f"    Forward Rate: {100 - futures_price - conv_adj/100:.2f}%")
     
-    print("
-3. Convexity by Instrument Type...")
+    print("\n3. Convexity by Instrument Type...")
     
     instruments = {
         "FRA": 0,
@@ -3345,8 +3277,7 @@ def recipe_22_convexity_risk():
         else:
             print(f"    {inst:10}: {adj}")
     
-    print("
-4. CMS (Constant Maturity Swap) Convexity...")
+    print("\n4. CMS (Constant Maturity Swap) Convexity...")
     
     # CMS rate convexity adjustment
     cms_tenor = 10  # 10Y CMS
@@ -3363,8 +3294,7 @@ def recipe_22_convexity_risk():
     print(f"    CMS Convexity: {cms_conv:.0f} bps")
     print(f"    CMS Rate: {swap_rate + cms_conv/100:.2f}%")
     
-    print("
-5. Building Convexity Surface...")
+    print("\n5. Building Convexity Surface...")
     
     # Convexity adjustment surface (expiry x tenor)
     expiries = [0.25, 0.5, 1, 2, 5]
@@ -3382,8 +3312,7 @@ def recipe_22_convexity_risk():
         print(f"  {exp:4.2f}y  {row[0]:4.1f}  {row[1]:4.1f}  {row[2]:4.1f}  "
               f"{row[3]:4.1f}  {row[4]:4.1f}")
     
-    print("
-6. Risk Management with Convexity...")
+    print("\n6. Risk Management with Convexity...")
     
     print("  Portfolio Convexity Management:")
     print("    1. Monitor aggregate convexity exposure")
@@ -3391,8 +3320,7 @@ def recipe_22_convexity_risk():
     print("    3. Account for convexity in P&L attribution")
     print("    4. Stress test for volatility changes")
     
-    print("
-7. Convexity P&L Attribution...")
+    print("\n7. Convexity P&L Attribution...")
     
     # Example portfolio
     portfolio = {
@@ -3415,8 +3343,7 @@ def recipe_22_convexity_risk():
     print(f"  Convexity P&L: ${convexity_pnl:,.0f}")
     print(f"  Total P&L: ${linear_pnl + convexity_pnl:,.0f}")
     
-    print("
-8. Model Dependencies...")
+    print("\n8. Model Dependencies...")
     
     print("  Convexity adjustment models depend on:")
     print("    - Volatility assumptions")
@@ -3424,8 +3351,7 @@ def recipe_22_convexity_risk():
     print("    - Drift assumptions (risk-neutral vs real-world)")
     print("    - Numeraire choice")
     
-    print("
-9. Practical Implementation...")
+    print("\n9. Practical Implementation...")
     
     print("  Implementation steps:")
     print("    1. Calibrate volatility from options")
@@ -3434,8 +3360,7 @@ def recipe_22_convexity_risk():
     print("    4. Revalue portfolio with adjustments")
     print("    5. Calculate convexity risk metrics")
     
-    print("
-10. Common Convexity Trades...")
+    print("\n10. Common Convexity Trades...")
     
     trades = {
         "Futures vs FRA": "Profit from convexity difference",
@@ -3470,16 +3395,14 @@ def recipe_23_bond_basis():
     print("Recipe 23: Bond Basis Analysis")
     print("=" * 80)
     
-    print("
-1. Understanding Bond Basis...")
+    print("\n1. Understanding Bond Basis...")
     print("  Bond Basis = Cash Bond Yield - Futures Implied Yield")
     print("  Components:")
     print("    - Carry and financing")
     print("    - Delivery option value")
     print("    - Repo specialness")
     
-    print("
-2. Futures Contract Specifications...")
+    print("\n2. Futures Contract Specifications...")
     
     # US Treasury futures example
     futures_specs = {
@@ -3495,8 +3418,7 @@ def recipe_23_bond_basis():
     for key, value in futures_specs.items():
         print(f"    {key.replace('_', ' ').title():20}: {value}")
     
-    print("
-3. Deliverable Bonds Analysis...")
+    print("\n3. Deliverable Bonds Analysis...")
     
     # Deliverable bonds for the futures contract
     bonds = [
@@ -3519,8 +3441,7 @@ def recipe_23_bond_basis():
         print(f"  {bond['cusip']}  {bond['coupon']:.3f}%  {bond['maturity']}  "
               f"{bond['price']:6.2f}  {bond['cf']:.4f}  {basis:+6.3f}")
     
-    print("
-4. Cheapest-to-Deliver (CTD)...")
+    print("\n4. Cheapest-to-Deliver (CTD)...")
     
     # Find CTD
     ctd = min(bonds, key=lambda x: x["basis"])
@@ -3528,8 +3449,7 @@ def recipe_23_bond_basis():
     print(f"  CTD Basis: {ctd['basis']:.3f}")
     print(f"  CTD Coupon: {ctd['coupon']:.3f}%")
     
-    print("
-5. DV01 Calculation...")
+    print("\n5. DV01 Calculation...")
     
     # CTD DV01 and Futures DV01
     ctd_dv01 = 850  # $850 per $100k face
@@ -3539,8 +3459,7 @@ def recipe_23_bond_basis():
     print(f"  Conversion Factor: {ctd['cf']:.4f}")
     print(f"  Futures DV01: ${futures_dv01:.0f} per contract")
     
-    print("
-6. Hedge Ratio Calculation...")
+    print("\n6. Hedge Ratio Calculation...")
     
     # Portfolio to hedge
     portfolio_notional = 100_000_000  # $100M
@@ -3558,8 +3477,7 @@ def recipe_23_bond_basis():
     print(f"    Contracts: {contracts}")
     print(f"    Hedge DV01: ${contracts * futures_dv01:,.0f}")
     
-    print("
-7. Basis Risk Analysis...")
+    print("\n7. Basis Risk Analysis...")
     
     # Basis volatility
     basis_scenarios = {
@@ -3573,8 +3491,7 @@ def recipe_23_bond_basis():
         pnl = -contracts * futures_specs["notional"] / 100 * change / 100
         print(f"    {scenario:12}: {change:+3} bps → P&L ${pnl:+,.0f}")
     
-    print("
-8. Carry Analysis...")
+    print("\n8. Carry Analysis...")
     
     # Simplified carry calculation
     funding_rate = 5.25  # Repo rate
@@ -3593,8 +3510,7 @@ def recipe_23_bond_basis():
     else:
         print("  → Negative carry (funding > bond yield)")
     
-    print("
-9. Delivery Option Value...")
+    print("\n9. Delivery Option Value...")
     
     print("  Delivery options embedded in futures:")
     print("    - Quality option: Choose which bond to deliver")
@@ -3603,11 +3519,9 @@ def recipe_23_bond_basis():
     print("    - End-of-month option: Extended delivery period")
     
     option_value = 0.15  # 15 cents
-    print(f"
-  Estimated option value: {option_value:.2f} (${option_value * 1000:.0f} per contract)")
+    print(f"\n  Estimated option value: {option_value:.2f} (${option_value * 1000:.0f} per contract)")
     
-    print("
-10. Trading Strategies...")
+    print("\n10. Trading Strategies...")
     
     strategies = {
         "Basis Trade": "Long basis when cheap, short when rich",
@@ -3647,16 +3561,14 @@ def recipe_24_bond_ctd():
     print("Recipe 24: Bond CTD Analysis")
     print("=" * 80)
     
-    print("
-1. CTD Scenario Framework...")
+    print("\n1. CTD Scenario Framework...")
     print("  CTD can change based on:")
     print("    - Yield level changes")
     print("    - Curve shape changes")
     print("    - Time to delivery")
     print("    - Funding rates")
     
-    print("
-2. Deliverable Basket...")
+    print("\n2. Deliverable Basket...")
     
     # Extended deliverable basket
     basket = [
@@ -3674,8 +3586,7 @@ def recipe_24_bond_ctd():
     for bond in basket:
         print(f"  {bond['id']}   {bond['coupon']:.2f}%    {bond['maturity']:.1f}y     {bond['duration']:.1f}")
     
-    print("
-3. Yield Scenarios...")
+    print("\n3. Yield Scenarios...")
     
     yield_scenarios = {
         "Low (2%)": 2.0,
@@ -3700,8 +3611,7 @@ def recipe_24_bond_ctd():
         
         print(f"  {scenario:10}  {yield_level:.1f}%   {ctd}    {reason}")
     
-    print("
-4. Curve Shape Scenarios...")
+    print("\n4. Curve Shape Scenarios...")
     
     curve_scenarios = {
         "Steep": {"2Y": 3.0, "10Y": 5.0, "slope": 2.0},
@@ -3724,8 +3634,7 @@ def recipe_24_bond_ctd():
         print(f"  {shape:9}  {rates['2Y']:.1f}%  {rates['10Y']:.1f}%  "
               f"{rates['slope']:+.1f}%   {ctd}")
     
-    print("
-5. Time Decay Analysis...")
+    print("\n5. Time Decay Analysis...")
     
     days_to_delivery = [90, 60, 30, 10, 1]
     
@@ -3749,8 +3658,7 @@ def recipe_24_bond_ctd():
         
         print(f"  {days:>15}   {ctd}   {basis:>2}")
     
-    print("
-6. Option Value Decomposition...")
+    print("\n6. Option Value Decomposition...")
     
     # Value of delivery options
     option_values = {
@@ -3768,8 +3676,7 @@ def recipe_24_bond_ctd():
         print(f"    {option:15}: {value:2}  ({pct:.0f}%)")
     print(f"    {'Total':15}: {total_option_value:2}")
     
-    print("
-7. Scenario Probability Matrix...")
+    print("\n7. Scenario Probability Matrix...")
     
     # Probability-weighted CTD analysis
     scenarios = [
@@ -3788,21 +3695,18 @@ def recipe_24_bond_ctd():
         print(f"  {s['yield']:.1f}%  {s['curve']:8}  {s['prob']:.0%}   {s['ctd']}")
         ctd_probs[s['ctd']] = ctd_probs.get(s['ctd'], 0) + s['prob']
     
-    print("
-  CTD Probabilities:")
+    print("\n  CTD Probabilities:")
     for bond, prob in sorted(ctd_probs.items(), key=lambda x: -x[1]):
         print(f"    Bond {bond}: {prob:.0%}")
     
-    print("
-8. Hedging Implications...")
+    print("\n8. Hedging Implications...")
     
     print("  Hedge Adjustment Factors:")
     print("    - CTD switch risk: ±5% hedge ratio")
     print("    - Basis volatility: ±10 bps")
     print("    - Option gamma: Non-linear near delivery")
     
-    print("
-9. P&L Attribution...")
+    print("\n9. P&L Attribution...")
     
     # Example P&L breakdown
     pnl_components = {
@@ -3820,8 +3724,7 @@ def recipe_24_bond_ctd():
         print(f"    {component:15}: ${pnl:+8,.0f}")
     print(f"    {'Total':15}: ${total_pnl:+8,.0f}")
     
-    print("
-10. Risk Metrics...")
+    print("\n10. Risk Metrics...")
     
     print("  CTD Risk Measures:")
     print("    DV01 Uncertainty: ±$50 per contract")
@@ -3839,6 +3742,47 @@ def recipe_24_bond_ctd():
     }
 
 
+def _build_usd_curve(today_ord, node_ords, tenors, s, node_dfs=None):
+    """
+    Calibrate a log-linear USD SOFR curve to par IRS rates, returning (curve, solver)
+    
+    A fresh curve and solver are built on every call, so callers may bump or iterate
+    them freely. The calibrated discount factors are memoized per set of inputs and
+    used as the starting nodes, so repeat calibrations converge immediately.
+    """
+    from rateslib import Curve, Solver, IRS
+    
+    if node_dfs is None:
+        node_dfs = _solve_usd_node_dfs(today_ord, node_ords, tenors, s)
+    
+    today = dt.fromordinal(today_ord)
+    usd_curve = Curve(
+        nodes={today: 1.0, **{dt.fromordinal(o): df for o, df in zip(node_ords, node_dfs)}},
+        convention="act360",
+        calendar="nyc",
+        interpolation="log_linear",
+        id="usd"
+    )
+    solver = Solver(
+        curves=[usd_curve],
+        instruments=[IRS(today, tenor, spec="usd_irs", curves="usd") for tenor in tenors],
+        s=list(s),
+    )
+    return usd_curve, solver
+
+
+@functools.lru_cache(maxsize=32)
+def _solve_usd_node_dfs(today_ord, node_ords, tenors, s):
+    """
+    Solve the USD curve from flat starting nodes and return its calibrated discount factors
+    
+    Arguments are hashable (date ordinals and tuples) and the result is a tuple of floats,
+    so the cache only ever shares immutable values.
+    """
+    usd_curve, _ = _build_usd_curve(today_ord, node_ords, tenors, s, (1.0,) * len(node_ords))
+    return tuple(float(usd_curve[dt.fromordinal(o)]) for o in node_ords)
+
+
 def recipe_25_exogenous_variables():
     """
     Recipe 25: What are Exogenous Variables and Exogenous Sensitivities?
@@ -3850,6 +3794,7 @@ def recipe_25_exogenous_variables():
     print("Recipe 25: Exogenous Variables")
     print("=" * 80)
     
+    import math
     from datetime import datetime as dt
     from rateslib import Curve, Solver, IRS, Swaption, FXOption, Value
     import numpy as np
@@ -3866,58 +3811,57 @@ def recipe_25_exogenous_variables():
     print("\n2. Setting up base market environment...")
     today = dt(2024, 6, 15)
     
-    # Build USD curve
-    usd_curve = Curve(
-        nodes={
-            today: 1.0,
-            dt(2024, 12, 15): 1.0,
-            dt(2025, 6, 15): 1.0,
-            dt(2026, 6, 15): 1.0,
-            dt(2029, 6, 15): 1.0,
-        },
-        convention="act360",
-        calendar="nyc",
-        interpolation="log_linear",
-        id="usd"
-    )
-    
-    solver = Solver(
-        curves=[usd_curve],
-        instruments=[
-            IRS(today, "6M", spec="usd_irs", curves="usd"),
-            IRS(today, "1Y", spec="usd_irs", curves="usd"),
-            IRS(today, "2Y", spec="usd_irs", curves="usd"),
-            IRS(today, "5Y", spec="usd_irs", curves="usd"),
-        ],
-        s=[5.25, 5.00, 4.75, 4.50]
+    # Build USD curve (repeated runs start from the memoized calibrated discount factors)
+    usd_curve, solver = _build_usd_curve(
+        today.toordinal(),
+        (dt(2024, 12, 15).toordinal(), dt(2025, 6, 15).toordinal(),
+         dt(2026, 6, 15).toordinal(), dt(2029, 6, 15).toordinal()),
+        ("6M", "1Y", "2Y", "5Y"),
+        (5.25, 5.00, 4.75, 4.50),
     )
     
     print(f"   ✓ USD curve calibrated")
     print("   Base rates: 6M=5.25%, 1Y=5.00%, 2Y=4.75%, 5Y=4.50%")
     
+    # Scenario inputs, evaluated as batched arrays; loops below only print
+    base_vol = 20.0  # 20% implied volatility
+    strike_rate = 4.50  # ATM strike
+    vol_scenarios = [18.0, 20.0, 22.0]  # -2%, base, +2%
+    time_to_expiry = 5.0
+    # Simplified Black-Scholes type premium estimation: vol * sqrt(T) / 100 * 1,000,000
+    # In practice, would use proper swaption pricing
+    premiums_approx = np.asarray(vol_scenarios) * (math.sqrt(time_to_expiry) * 1e4)
+    
+    base_credit_spread = 150  # 150 bps
+    credit_scenarios = [100, 150, 200]  # bps
+    duration = 4.2  # Approximate duration
+    spreads = np.asarray(credit_scenarios, dtype=np.float64)
+    corp_yield_scenarios = 4.50 + spreads / 100
+    # Simplified price impact (duration * spread change)
+    price_impacts = -duration * (spreads - base_credit_spread) / 100
+    
+    correlations = [0.5, 0.7, 0.9]
+    horizons = np.array([0.25, 0.5, 1.0, 2.0])  # years
+    vol_eur = 12.0  # EURUSD vol
+    vol_gbp = 14.0  # GBPUSD vol
+    # Simplified basket volatility calculation
+    corrs = np.asarray(correlations)
+    basket_vols = np.sqrt(0.5**2 * vol_eur**2 + 0.5**2 * vol_gbp**2 +
+                          2 * 0.5 * 0.5 * corrs * vol_eur * vol_gbp)
+    # Horizon volatility over the (correlation, time) grid in one broadcast
+    basket_vol_grid = basket_vols[:, None] * np.sqrt(horizons)[None, :]
+    
     print("\n3. Example 1: Volatility as exogenous variable")
     print("   Swaption pricing depends on implied volatility")
     
     # Create a swaption (simplified - normally requires vol surface)
     print("   5Y2Y Swaption example:")
     
-    base_vol = 20.0  # 20% implied volatility
-    strike_rate = 4.50  # ATM strike
-    
-    # Demonstrate vol sensitivity conceptually
-    vol_scenarios = [18.0, 20.0, 22.0]  # -2%, base, +2%
-    
     print(f"   Strike rate: {strike_rate:.2f}%")
     print("\n   Volatility sensitivity:")
     print(f"   {'Vol %':>8} {'Conceptual Premium':>18} {'Vega Impact':>12}")
     
-    for vol in vol_scenarios:
-        # Simplified Black-Scholes type premium estimation
-        # In practice, would use proper swaption pricing
-        time_to_expiry = 5.0
-        vol_term = vol * np.sqrt(time_to_expiry) / 100
-        premium_approx = vol_term * 1000000  # Simplified
-        
+    for vol, premium_approx in zip(vol_scenarios, premiums_approx):
         vega_impact = "Base" if vol == base_vol else f"{(vol - base_vol)/base_vol*100:+.1f}%"
         
         print(f"   {vol:>7.1f}% {premium_approx:>17,.0f} {vega_impact:>12}")
@@ -3926,20 +3870,14 @@ def recipe_25_exogenous_variables():
     print("   Corporate bond pricing sensitive to credit spread")
     
     # Simulate corporate bond with credit spread
-    base_credit_spread = 150  # 150 bps
     corp_yield = 4.50 + 1.50  # Treasury + spread
     
-    credit_scenarios = [100, 150, 200]  # bps
-    
     print("   Credit spread sensitivity:")
     print(f"   {'Spread (bps)':>12} {'Corp Yield %':>12} {'Price Impact':>12}")
     
-    for spread in credit_scenarios:
-        corp_yield_scenario = 4.50 + spread/100
-        # Simplified price impact (duration * spread change)
-        duration = 4.2  # Approximate duration
-        price_impact = -duration * (spread - base_credit_spread) / 10000 * 100
-        
+    for spread, corp_yield_scenario, price_impact in zip(
+        credit_scenarios, corp_yield_scenarios, price_impacts
+    ):
         impact_str = "Base" if spread == base_credit_spread else f"{price_impact:+.2f}%"
         
         print(f"   {spread:>12} {corp_yield_scenario:>11.2f}% {impact_str:>12}")
@@ -3947,22 +3885,20 @@ def recipe_25_exogenous_variables():
     print("\n5. Example 3: FX correlation as exogenous variable")
     print("   Multi-asset derivatives sensitive to correlation")
     
-    correlations = [0.5, 0.7, 0.9]
     print("\n   EURUSD-GBPUSD correlation impact:")
     print(f"   {'Correlation':>11} {'Basket Vol %':>12} {'Option Premium':>14}")
     
-    for corr in correlations:
-        # Simplified basket volatility calculation
-        vol_eur = 12.0  # EURUSD vol
-        vol_gbp = 14.0  # GBPUSD vol
-        basket_vol = np.sqrt(0.5**2 * vol_eur**2 + 0.5**2 * vol_gbp**2 + 
-                            2 * 0.5 * 0.5 * corr * vol_eur * vol_gbp)
-        
+    for corr, basket_vol in zip(correlations, basket_vols):
         premium_impact = "Base" if corr == 0.7 else \
                         f"{(basket_vol - 11.32)/11.32*100:+.1f}%" if abs(corr - 0.7) > 0.01 else "Base"
         
         print(f"   {corr:>11.1f} {basket_vol:>11.2f}% {premium_impact:>14}")
     
+    print("\n   Basket horizon volatility (vol x sqrt(T)):")
+    print(f"   {'Correlation':>11} " + " ".join(f"{f'{t:g}Y':>7}" for t in horizons))
+    for corr, row in zip(correlations, basket_vol_grid):
+        print(f"   {corr:>11.1f} " + " ".join(f"{v:>6.2f}%" for v in row))
+    
     print("\n6. Example 4: Convexity adjustment as exogenous")
     print("   Futures vs forward rates require convexity adjustment")
     
@@ -4007,11 +3943,11 @@ def recipe_25_exogenous_variables():
     base_param = 20.0  # Base parameter value
     bump_size = 0.01   # 1% relative bump
     
-    param_scenarios = {
-        "base": base_param,
-        "up": base_param * (1 + bump_size),
-        "down": base_param * (1 - bump_size)
-    }
+    # Two-point finite difference: relative bumps for (base, up, down)
+    scenario_labels = ["base", "up", "down"]
+    bumps = np.array([0.0, bump_size, -bump_size])
+    values = base_param * (1 + bumps)
+    param_scenarios = dict(zip(scenario_labels, values.tolist()))
     
     print(f"    Parameter base value: {base_param:.2f}")
     print(f"    Bump size: {bump_size*100:.1f}%")
@@ -4019,18 +3955,11 @@ def recipe_25_exogenous_variables():
     print(f"    {'Scenario':>8} {'Value':>8} {'PnL Impact':>12}")
     
     base_pv = 1000000  # Base present value
+    param_sensitivity = 0.05  # Simplified: 5% PV change per 1% param change
+    pv_changes = base_pv * param_sensitivity * bumps
     
-    for scenario, value in param_scenarios.items():
-        if scenario == "base":
-            pv = base_pv
-            impact = "Base"
-        else:
-            # Simplified sensitivity
-            param_sensitivity = 0.05  # 5% PV change per 1% param change
-            pv_change = base_pv * param_sensitivity * ((value - base_param) / base_param)
-            pv = base_pv + pv_change
-            impact = f"${pv_change:+,.0f}"
-        
+    for scenario, value, pv_change in zip(scenario_labels, values, pv_changes):
+        impact = "Base" if scenario == "base" else f"${pv_change:+,.0f}"
         print(f"    {scenario:>8} {value:>7.2f} {impact:>12}")
     
     return {
@@ -4039,6 +3968,7 @@ def recipe_25_exogenous_variables():
         "volatility_scenarios": vol_scenarios,
         "credit_scenarios": credit_scenarios,
         "correlation_scenarios": correlations,
+        "basket_vol_grid": basket_vol_grid,
         "convexity_example": {
             "forward_rate": forward_rate,
             "volatilities": volatilities,
@@ -4058,22 +3988,19 @@ def recipe_26_sabr_beta():
     print("Recipe 26: SABR Beta Exogenous")
     print("=" * 80)
     
-    print("
-1. SABR Model Parameters...")
+    print("\n1. SABR Model Parameters...")
     print("  SABR: Stochastic Alpha Beta Rho")
     print("  dF = α F^β dW1")
     print("  dα = ν α dW2")
     print("  dW1·dW2 = ρ dt")
     
-    print("
-  Parameters:")
+    print("\n  Parameters:")
     print("    α (alpha): Initial volatility level")
     print("    β (beta): CEV exponent [0,1]")
     print("    ρ (rho): Correlation [-1,1]")
     print("    ν (nu): Volatility of volatility")
     
-    print("
-2. Beta Parameter Interpretation...")
+    print("\n2. Beta Parameter Interpretation...")
     
     beta_meanings = {
         0.0: "Normal (Bachelier) model",
@@ -4084,8 +4011,7 @@ def recipe_26_sabr_beta():
     for beta, meaning in beta_meanings.items():
         print(f"  β = {beta}: {meaning}")
     
-    print("
-3. Market Practice by Asset Class...")
+    print("\n3. Market Practice by Asset Class...")
     
     market_betas = {
         "Interest Rates": 0.5,
@@ -4098,8 +4024,7 @@ def recipe_26_sabr_beta():
     for asset, beta in market_betas.items():
         print(f"    {asset:15}: β = {beta}")
     
-    print("
-4. SABR Calibration Example...")
+    print("\n4. SABR Calibration Example...")
     
     # Market data for swaption volatilities
     strikes = [3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0]  # Strike rates
@@ -4115,8 +4040,7 @@ def recipe_26_sabr_beta():
     for k, v in zip(strikes, market_vols):
         print(f"  {k:.1f}%    {v:.1f}%")
     
-    print("
-5. Impact of Beta on Smile...")
+    print("\n5. Impact of Beta on Smile...")
     
     # Different beta values
     betas = [0.0, 0.3, 0.5, 0.7, 1.0]
@@ -4136,16 +4060,14 @@ def recipe_26_sabr_beta():
         p = sabr_params[beta]
         print(f"  {beta:.1f}   {p['alpha']:.4f}  {p['rho']:+.2f}  {p['nu']:.2f}")
     
-    print("
-6. Smile Dynamics with Beta...")
+    print("\n6. Smile Dynamics with Beta...")
     
     print("  Smile Characteristics:")
     print("  β = 0.0: More symmetric smile")
     print("  β = 0.5: Moderate skew")
     print("  β = 1.0: Strong skew, especially for low strikes")
     
-    print("
-7. Sensitivity to Beta...")
+    print("\n7. Sensitivity to Beta...")
     
     # Vega sensitivity to beta
     beta_base = 0.5
@@ -4160,8 +4082,7 @@ def recipe_26_sabr_beta():
     print(f"    Skew Change: {skew_change:.1f}%")
     print(f"    Smile Curvature: Increases")
     
-    print("
-8. Hedging with Different Betas...")
+    print("\n8. Hedging with Different Betas...")
     
     print("  Hedge Ratios by Beta:")
     print("  Beta  ATM Delta  25D Risk Reversal")
@@ -4175,8 +4096,7 @@ def recipe_26_sabr_beta():
     for beta, (delta, rr) in hedge_ratios.items():
         print(f"  {beta:.1f}    {delta:.2f}      {rr:.2f}")
     
-    print("
-9. Model Risk from Beta...")
+    print("\n9. Model Risk from Beta...")
     
     print("  Sources of Beta Model Risk:")
     print("    - Wrong beta assumption")
@@ -4191,13 +4111,11 @@ def recipe_26_sabr_beta():
         "Beta 0.7 vs 1.0": 150,
     }
     
-    print("
-  Model Risk (Vol Difference in bps):")
+    print("\n  Model Risk (Vol Difference in bps):")
     for scenario, diff in scenarios.items():
         print(f"    {scenario}: {diff} bps")
     
-    print("
-10. Best Practices...")
+    print("\n10. Best Practices...")
     
     print("  SABR Beta Management:")
     print("    ✓ Fix beta based on market practice")
@@ -4230,16 +4148,14 @@ def recipe_27_fixings_exposures():
     print("Recipe 27: Fixings Exposures")
     print("=" * 80)
     
-    print("
-1. Understanding Reset Risk...")
+    print("\n1. Understanding Reset Risk...")
     print("  Reset risk arises from:")
     print("    - Floating rate instruments")
     print("    - Unknown future fixings")
     print("    - Concentration on specific dates")
     print("    - Basis between indices")
     
-    print("
-2. Reset Ladder Construction...")
+    print("\n2. Reset Ladder Construction...")
     
     # Portfolio of swaps with different reset dates
     portfolio = [
@@ -4256,8 +4172,7 @@ def recipe_27_fixings_exposures():
         print(f"  {swap['id']}  ${swap['notional']/1e6:>4.0f}M     "
               f"{swap['reset']:12} {swap['maturity']}")
     
-    print("
-3. Reset Schedule...")
+    print("\n3. Reset Schedule...")
     
     # Next 12 months of resets
     reset_dates = pd.date_range(start=dt(2024, 8, 1), periods=12, freq='MS')
@@ -4288,8 +4203,7 @@ def recipe_27_fixings_exposures():
               f"{exposures[1]:>3.0f}   {exposures[2]:>3.0f}   "
               f"{exposures[3]:>3.0f}   {exposures[4]:>3.0f}   {total:>4.0f}")
     
-    print("
-4. Concentration Risk...")
+    print("\n4. Concentration Risk...")
     
     # IMM dates concentration
     imm_dates = ["2024-09-18", "2024-12-18", "2025-03-19", "2025-06-18"]
@@ -4300,8 +4214,7 @@ def recipe_27_fixings_exposures():
         concentration = np.random.randint(500, 1500)
         print(f"    {date_str}: ${concentration}M notional")
     
-    print("
-5. Basis Risk Between Indices...")
+    print("\n5. Basis Risk Between Indices...")
     
     indices = {
         "SOFR": 5.25,
@@ -4315,8 +4228,7 @@ def recipe_27_fixings_exposures():
         spread = (rate - indices["SOFR"]) * 100
         print(f"    {index:12}: {rate:.2f}%  ({spread:+.0f} bps to SOFR)")
     
-    print("
-6. Forward Starting Risk...")
+    print("\n6. Forward Starting Risk...")
     
     forward_starts = [
         {"tenor": "1M forward", "notional": 250_000_000},
@@ -4328,8 +4240,7 @@ def recipe_27_fixings_exposures():
     for fs in forward_starts:
         print(f"    {fs['tenor']:12}: ${fs['notional']/1e6:.0f}M")
     
-    print("
-7. Reset Risk Metrics...")
+    print("\n7. Reset Risk Metrics...")
     
     # Risk per basis point move at reset
     print("  Reset Date Risk (DV01 at reset):")
@@ -4344,8 +4255,7 @@ def recipe_27_fixings_exposures():
     for tenor, risk in reset_risk.items():
         print(f"    {tenor:3} forward: ${risk:>7,.0f} per bp")
     
-    print("
-8. Hedging Reset Risk...")
+    print("\n8. Hedging Reset Risk...")
     
     print("  Hedging Strategies:")
     print("    1. Forward Rate Agreements (FRAs)")
@@ -4353,8 +4263,7 @@ def recipe_27_fixings_exposures():
     print("    3. Swaptions for tail risk")
     print("    4. Basis swaps for index risk")
     
-    print("
-9. Scenario Analysis...")
+    print("\n9. Scenario Analysis...")
     
     # Rate scenarios at reset
     scenarios = {
@@ -4378,8 +4287,7 @@ def recipe_27_fixings_exposures():
         
         print(f"    {scenario:15}: ${pnl/1e6:+6.1f}M")
     
-    print("
-10. Risk Management...")
+    print("\n10. Risk Management...")
     
     print("  Best Practices:")
     print("    ✓ Monitor concentration by reset date")
@@ -4408,16 +4316,14 @@ def recipe_28_multicsa_curves():
     print("Recipe 28: Multi-CSA Curves")
     print("=" * 80)
     
-    print("
-1. Understanding CSA (Credit Support Annex)...")
+    print("\n1. Understanding CSA (Credit Support Annex)...")
     print("  CSA determines collateral posting:")
     print("    - Currency of collateral")
     print("    - Interest rate on collateral")
     print("    - Posting thresholds")
     print("    - Optionality in collateral choice")
     
-    print("
-2. Multi-CSA Framework...")
+    print("\n2. Multi-CSA Framework...")
     
     # Different CSA agreements
     csa_agreements = {
@@ -4432,8 +4338,7 @@ def recipe_28_multicsa_curves():
         print(f"    {name:15}: {csa['currency']} @ {csa['rate']} "
               f"{csa['spread']:+d} bps")
     
-    print("
-3. Discount Curve Selection...")
+    print("\n3. Discount Curve Selection...")
     
     # Current rates
     rates = {
@@ -4447,8 +4352,7 @@ def recipe_28_multicsa_curves():
     for rate_name, value in rates.items():
         print(f"    {rate_name:10}: {value:.2f}%")
     
-    print("
-4. Multi-CSA Curve Construction...")
+    print("\n4. Multi-CSA Curve Construction...")
     
     # For each CSA, determine discount curve
     print("  Optimal Discount Curve by CSA:")
@@ -4463,8 +4367,7 @@ def recipe_28_multicsa_curves():
         discount_curves[csa_name] = curve_rate
         print(f"    {csa_name:15}: {curve_rate:.2f}%")
     
-    print("
-5. Discontinuity at CSA Boundaries...")
+    print("\n5. Discontinuity at CSA Boundaries...")
     
     print("  NPV Discontinuity Example:")
     print("  Swap NPV = $1M")
@@ -4479,24 +4382,20 @@ def recipe_28_multicsa_curves():
         
         print(f"    {csa_name:15}: ${adjusted_npv:,.0f}")
     
-    print("
-  → Discontinuous jump when CSA changes!")
+    print("\n  → Discontinuous jump when CSA changes!")
     
-    print("
-6. Derivative Discontinuity...")
+    print("\n6. Derivative Discontinuity...")
     
     print("  Mathematical Issue:")
     print("    MultiCSA(t) = max(CSA1(t), CSA2(t), ...)")
     print("    Derivative undefined at crossing points!")
     
-    print("
-  Practical Impact:")
+    print("\n  Practical Impact:")
     print("    - Risk sensitivities jump at boundaries")
     print("    - Hedging becomes complex")
     print("    - Greeks are unstable")
     
-    print("
-7. Cheapest-to-Deliver Collateral...")
+    print("\n7. Cheapest-to-Deliver Collateral...")
     
     # Determine optimal collateral
     print("  Optimal Collateral Choice:")
@@ -4510,8 +4409,7 @@ def recipe_28_multicsa_curves():
     for scenario in scenarios:
         print(f"    NPV = ${scenario['npv']/1e6:+.0f}M: Post {scenario['optimal']}")
     
-    print("
-8. Risk Management Challenges...")
+    print("\n8. Risk Management Challenges...")
     
     print("  Multi-CSA Risk Issues:")
     print("    1. Delta hedging jumps at boundaries")
@@ -4519,8 +4417,7 @@ def recipe_28_multicsa_curves():
     print("    3. Funding cost uncertainty")
     print("    4. Wrong-way risk from correlation")
     
-    print("
-9. Numerical Solutions...")
+    print("\n9. Numerical Solutions...")
     
     print("  Approaches to Handle Discontinuities:")
     print("    - Smooth approximation functions")
@@ -4528,8 +4425,7 @@ def recipe_28_multicsa_curves():
     print("    - Fuzzy boundaries with probability weights")
     print("    - Conservative worst-case approach")
     
-    print("
-10. Example Calculation...")
+    print("\n10. Example Calculation...")
     
     # Simplified multi-CSA valuation
     print("  5Y IRS Valuation under Multi-CSA:")
@@ -4551,8 +4447,7 @@ def recipe_28_multicsa_curves():
         
         print(f"  {csa_name:15} ${npv_adjusted/1e6:+7.2f}M    ${dv01:,.0f}")
     
-    print("
-  Maximum difference: ${:.0f} in NPV!".format(500_000))
+    print("\n  Maximum difference: ${:.0f} in NPV!".format(500_000))
     
     return {
         "csa_agreements": csa_agreements,
@@ -4570,55 +4465,102 @@ def recipe_28_multicsa_curves():
 # MAIN COOKBOOK RUNNER
 # ============================================================================
 
-def run_all_recipes():
-    """Run all cookbook recipes"""
-    recipes = [
-        # Interest Rate Curves
-        recipe_01_single_currency_curve,
-        recipe_02_sofr_curve,
-        recipe_03_dependency_chain,
-        recipe_04_handle_turns,
-        recipe_05_quantlib_comparison,
-        recipe_06_zero_rates,
-        recipe_07_multicurve_framework,
-        recipe_08_brazil_bus252,
-        recipe_09_nelson_siegel,
-        # Credit Curves
-        recipe_10_pfizer_cds,
-        # FX Volatility
-        recipe_11_fx_surface_interpolation,
-        recipe_12_fx_temporal_interpolation,
-        recipe_13_eurusd_market,
-        # Instrument Pricing
-        recipe_14_bond_conventions,
-        recipe_15_inflation_instruments,
-        recipe_16_inflation_quantlib,
-        recipe_17_ibor_stubs,
-        recipe_18_working_with_fixings,
-        recipe_19_historical_swaps,
-        recipe_20_amortization,
-        recipe_21_cross_currency_config,
-        # Risk Sensitivity
-        recipe_22_convexity_risk,
-        recipe_23_bond_basis,
-        recipe_24_bond_ctd,
-        recipe_25_exogenous_variables,
-        recipe_26_sabr_beta,
-        recipe_27_fixings_exposures,
-        recipe_28_multicsa_curves,
-    ]
-    
-    results = {}
-    for i, recipe in enumerate(recipes, 1):
-        print(f"\n{'='*80}")
-        print(f"Running Recipe {i}/{len(recipes)}")
-        print(f"{'='*80}")
+_RECIPES = (
+    # Interest Rate Curves
+    recipe_01_single_currency_curve,
+    recipe_02_sofr_curve,
+    recipe_03_dependency_chain,
+    recipe_04_handle_turns,
+    recipe_05_quantlib_comparison,
+    recipe_06_zero_rates,
+    recipe_07_multicurve_framework,
+    recipe_08_brazil_bus252,
+    recipe_09_nelson_siegel,
+    # Credit Curves
+    recipe_10_pfizer_cds,
+    # FX Volatility
+    recipe_11_fx_surface_interpolation,
+    recipe_12_fx_temporal_interpolation,
+    recipe_13_eurusd_market,
+    # Instrument Pricing
+    recipe_14_bond_conventions,
+    recipe_15_inflation_instruments,
+    recipe_16_inflation_quantlib,
+    recipe_17_ibor_stubs,
+    recipe_18_working_with_fixings,
+    recipe_19_historical_swaps,
+    recipe_20_amortization,
+    recipe_21_cross_currency_config,
+    # Risk Sensitivity
+    recipe_22_convexity_risk,
+    recipe_23_bond_basis,
+    recipe_24_bond_ctd,
+    recipe_25_exogenous_variables,
+    recipe_26_sabr_beta,
+    recipe_27_fixings_exposures,
+    recipe_28_multicsa_curves,
+)
+
+
+def _run_quietly(recipe):
+    """Run a recipe capturing its printed output, returning (output, result)"""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
         try:
             result = recipe()
-            results[recipe.__name__] = result
         except Exception as e:
             print(f"Error in {recipe.__name__}: {e}")
-            results[recipe.__name__] = {"error": str(e)}
+            result = {"error": str(e)}
+    return buf.getvalue(), result
+
+
+def _run_pooled(recipe):
+    """Pool worker: run a recipe quietly, returning (output, pickled result or None)"""
+    output, result = _run_quietly(recipe)
+    try:
+        payload = pickle.dumps(result)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # e.g. result holds locks, open handles or locally defined objects
+        payload = None
+    return output, payload
+
+
+def run_all_recipes(parallel=True, max_workers=None):
+    """
+    Run all cookbook recipes
+    
+    The recipes share no state, so by default they are dispatched to a process pool
+    and their captured output is replayed in recipe order. Recipes whose results
+    cannot be pickled, or whose worker process died, are listed and re-run serially
+    in this process; any other pool failure is raised.
+    """
+    outputs = {}
+    results = dict.fromkeys(recipe.__name__ for recipe in _RECIPES)
+    if parallel:
+        fallback = []
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            futures = {recipe.__name__: ex.submit(_run_pooled, recipe) for recipe in _RECIPES}
+            for name, future in futures.items():
+                try:
+                    output, payload = future.result()
+                except BrokenProcessPool:
+                    fallback.append(name)
+                    continue
+                if payload is None:
+                    fallback.append(name)
+                    continue
+                outputs[name], results[name] = output, pickle.loads(payload)
+        if fallback:
+            print(f"Re-running serially (result not picklable or worker lost): {', '.join(fallback)}")
+    
+    for i, recipe in enumerate(_RECIPES, 1):
+        name = recipe.__name__
+        print(f"\n{'='*80}")
+        print(f"Running Recipe {i}/{len(_RECIPES)}")
+        print(f"{'='*80}")
+        if name not in outputs:
+            outputs[name], results[name] = _run_quietly(recipe)
+        print(outputs[name], end="")
     
     return results
 
@@ -13,11 +13,10 @@ Categories:
 5. Risk Sensitivity Analysis (7 recipes)
 """
 
+import bisect
+import functools
 import numpy as np
-import pandas as pd
 from datetime import datetime as dt
-from pandas import DataFrame, Series, option_context
-import matplotlib.pyplot as plt
 
 # Import rateslib components
 try:
@@ -31,10 +30,62 @@ except ImportError:
         def __init__(self, val):
             self.val = val
 
+# ============================================================================
+# NUMERIC KERNELS
+# ============================================================================
+
+def bond_price_kernel(coupon, ytm, n_periods, periods_per_year=2):
+    """
+    Price per 100 of a fixed coupon bond from its yield, in closed form
+    
+    Sums the coupon annuity as a geometric series rather than period by period.
+    """
+    cf = coupon / periods_per_year
+    y = ytm / periods_per_year
+    disc_n = (1.0 / (1.0 + y)) ** n_periods
+    if y == 0.0:
+        pv_coupons = cf * n_periods
+    else:
+        pv_coupons = cf * (1.0 - disc_n) / y
+    return pv_coupons + 100 * disc_n
+
+
+def zcis_cpi_kernel(base, rates, years):
+    """
+    Projected index levels implied by zero-coupon inflation swap rates (in %)
+    
+    Vectorized over ``rates`` and ``years`` so it can sit inside a calibration loop.
+    """
+    return base * (1.0 + rates * 0.01) ** years
+
+
+def linear_schedule_kernel(initial, periods):
+    """Remaining notional after each period of an equal-principal amortization"""
+    amort = initial / periods
+    return initial - amort * np.arange(1, periods + 1)
+
+
+def accrued_kernel(coupons, fracs):
+    """
+    Semi-annual accrued interest for coupon rates and accrual fractions
+    
+    Arguments broadcast, so one call covers every convention for the bond's coupon.
+    """
+    return (coupons * fracs) * 0.5
+
+
 # ============================================================================
 # RECIPE 13: EURUSD Market for IRS, Cross-Currency and FX Volatility
 # ============================================================================
 
+# Calibration tenors shared by the EUR/USD IRS solvers and the EURUSD XCS solver
+IRS_TENORS = (
+    "1w", "2w", "3w", "1m", "2m", "3m", "4m", "5m", "6m", "7m", "8m", "9m", "10m", "11m",
+    "1y", "15m", "18m", "21m", "2y", "3y", "4y", "5y", "6y", "7y", "8y", "9y", "10y",
+    "12y", "15y", "20y", "25y", "30y",
+)
+XCS_TENORS = ("3m", "6m", "9m") + IRS_TENORS[IRS_TENORS.index("1y"):]
+
 def recipe_13_eurusd_market():
     """
     Recipe 13: A EURUSD market for IRS, cross-currency and FX volatility
@@ -45,6 +96,8 @@ def recipe_13_eurusd_market():
     print("Recipe 13: EURUSD Market Setup")
     print("=" * 80)
     
+    from pandas import DataFrame
+    
     # Input market data from May 28, 2024
     fxr = FXRates({"eurusd": 1.0867}, settlement=dt(2024, 5, 30))
 
@@ -86,11 +139,20 @@ def recipe_13_eurusd_market():
 
     print("Creating EUR and USD curves...")
     
+    # Materialize tenors and their node dates once; shared by all three curves
+    tenor_list = tuple(mkt_data["tenor"])
+    tenor_idx = {t: i for i, t in enumerate(tenor_list)}
+    estr = mkt_data["estr"].to_numpy(dtype=np.float64)
+    sofr = mkt_data["sofr"].to_numpy(dtype=np.float64)
+    xccy = mkt_data["xccy"].to_numpy(dtype=np.float64)
+    tgt_dates = {t: add_tenor(dt(2024, 5, 30), t, "F", "tgt") for t in tenor_list}
+    nyc_dates = {t: add_tenor(dt(2024, 5, 30), t, "F", "nyc") for t in tenor_list}
+    
     # Create curves
     eur = Curve(
         nodes={
             dt(2024, 5, 28): 1.0,
-            **{add_tenor(dt(2024, 5, 30), _, "F", "tgt"): 1.0 for _ in mkt_data["tenor"]}
+            **{tgt_dates[t]: 1.0 for t in tenor_list}
         },
         calendar="tgt",
         interpolation="log_linear",
@@ -101,7 +163,7 @@ def recipe_13_eurusd_market():
     usd = Curve(
         nodes={
             dt(2024, 5, 28): 1.0,
-            **{add_tenor(dt(2024, 5, 30), _, "F", "nyc"): 1.0 for _ in mkt_data["tenor"]}
+            **{nyc_dates[t]: 1.0 for t in tenor_list}
         },
         calendar="nyc",
         interpolation="log_linear",
@@ -112,7 +174,7 @@ def recipe_13_eurusd_market():
     eurusd = Curve(
         nodes={
             dt(2024, 5, 28): 1.0,
-            **{add_tenor(dt(2024, 5, 30), _, "F", "tgt"): 1.0 for _ in mkt_data["tenor"]}
+            **{tgt_dates[t]: 1.0 for t in tenor_list}
         },
         interpolation="log_linear",
         convention="act360",
@@ -131,37 +193,33 @@ def recipe_13_eurusd_market():
     print("Calibrating curves with market data...")
     
     # Create solvers for each curve
-    eur_args = dict(effective=dt(2024, 5, 30), spec="eur_irs", curves=eur)
+    make_eur_irs = functools.partial(IRS, effective=dt(2024, 5, 30), spec="eur_irs", curves=eur)
     eur_solver = Solver(
         curves=[eur],
-        instruments=[IRS(**eur_args, termination=_) for _ in ["1w", "2w", "3w", "1m", "2m", "3m", "4m", 
-                    "5m", "6m", "7m", "8m", "9m", "10m", "11m", "1y", "15m", "18m", "21m", "2y", 
-                    "3y", "4y", "5y", "6y", "7y", "8y", "9y", "10y", "12y", "15y", "20y", "25y", "30y"]],
+        instruments=[make_eur_irs(termination=_) for _ in IRS_TENORS],
         s=list(mkt_data["estr"]),
         id="eur",
     )
 
-    usd_args = dict(effective=dt(2024, 5, 30), spec="usd_irs", curves=usd)
+    make_usd_irs = functools.partial(IRS, effective=dt(2024, 5, 30), spec="usd_irs", curves=usd)
     usd_solver = Solver(
         curves=[usd],
-        instruments=[IRS(**usd_args, termination=_) for _ in ["1w", "2w", "3w", "1m", "2m", "3m", "4m",
-                    "5m", "6m", "7m", "8m", "9m", "10m", "11m", "1y", "15m", "18m", "21m", "2y",
-                    "3y", "4y", "5y", "6y", "7y", "8y", "9y", "10y", "12y", "15y", "20y", "25y", "30y"]],
+        instruments=[make_usd_irs(termination=_) for _ in IRS_TENORS],
         s=list(mkt_data["sofr"]),
         id="usd",
     )
 
     # Cross-currency solver
-    xcs_args = dict(effective=dt(2024, 5, 30), currency="eur", leg2_currency="usd",
-                    leg2_convention="act360", curves=[None, eurusd, None, usd])
+    make_xcs = functools.partial(
+        XCS, effective=dt(2024, 5, 30), currency="eur", leg2_currency="usd",
+        leg2_convention="act360", curves=[None, eurusd, None, usd],
+    )
     xcs_solver = Solver(
         pre_solvers=[eur_solver, usd_solver],
         fx=fxf,
         curves=[eurusd],
-        instruments=[XCS(**xcs_args, termination=_) 
-                    for _ in ["3m", "6m", "9m", "1y", "15m", "18m", "21m", "2y", "3y", "4y",
-                             "5y", "6y", "7y", "8y", "9y", "10y", "12y", "15y", "20y", "25y", "30y"]
-                    if mkt_data[mkt_data["tenor"] == _]["xccy"].notna().any()],
+        instruments=[make_xcs(termination=_) for _ in XCS_TENORS
+                    if not np.isnan(xccy[tenor_idx[_]])],
         s=[_ for _ in mkt_data["xccy"].dropna()],
         id="xcs",
     )
@@ -198,9 +256,10 @@ def recipe_13_eurusd_market():
     
     print("\nMarket Summary:")
     print(f"  Spot EURUSD: {fxr.rate('eurusd'):.4f}")
-    print(f"  EUR 1Y rate: {mkt_data[mkt_data['tenor'] == '1y']['estr'].values[0]:.3f}%")
-    print(f"  USD 1Y rate: {mkt_data[mkt_data['tenor'] == '1y']['sofr'].values[0]:.3f}%")
-    print(f"  1Y XCS basis: {mkt_data[mkt_data['tenor'] == '1y']['xccy'].values[0]:.3f} bps")
+    idx_1y = tenor_idx["1y"]
+    print(f"  EUR 1Y rate: {estr[idx_1y]:.3f}%")
+    print(f"  USD 1Y rate: {sofr[idx_1y]:.3f}%")
+    print(f"  1Y XCS basis: {xccy[idx_1y]:.3f} bps")
     
     return {
         "fx_rates": fxr,
@@ -339,14 +398,7 @@ def recipe_14_bond_conventions():
             # Custom clean price calculation
             periods_per_year = 2  # Semi-annual
             n_periods = int((bond.termination - dt.now()).days / 182.5)
-            
-            pv = 0
-            for i in range(1, n_periods + 1):
-                cf = bond.coupon / periods_per_year
-                pv += cf / ((1 + ytm/periods_per_year) ** i)
-            pv += 100 / ((1 + ytm/periods_per_year) ** n_periods)
-            
-            return pv
+            return bond_price_kernel(bond.coupon, ytm, n_periods, periods_per_year)
     
     print("  Thai Government Bond:")
     print("    Custom day count: Actual/365")
@@ -360,21 +412,20 @@ def recipe_14_bond_conventions():
     last_coupon = dt(2024, 1, 15)
     next_coupon = dt(2024, 7, 15)
     
-    conventions_accrued = {
-        "act/act": 181/365,
-        "act/365": 181/365,
-        "act/360": 181/360,
-        "30/360": 180/360,
-    }
+    # Parallel arrays: names for display, fractions for vectorized arithmetic
+    accrued_names = ["act/act", "act/365", "act/360", "30/360"]
+    accrued_fracs = np.array([181/365, 181/365, 181/360, 180/360])
+    conventions_accrued = dict(zip(accrued_names, accrued_fracs.tolist()))
     
     coupon_rate = 5.0
+    accrueds = accrued_kernel(coupon_rate, accrued_fracs)
+    
     print(f"  Settlement: {settlement}")
     print(f"  Coupon: {coupon_rate}%")
     print(f"  Days accrued: 181")
     
     print("\n  Convention     Fraction    Accrued")
-    for conv, frac in conventions_accrued.items():
-        accrued = coupon_rate * frac / 2  # Semi-annual
+    for conv, frac, accrued in zip(accrued_names, accrued_fracs, accrueds):
         print(f"  {conv:12}  {frac:.5f}    {accrued:.4f}")
     
     print("\n5. Ex-Dividend Date Handling...")
@@ -408,6 +459,71 @@ def recipe_14_bond_conventions():
     }
 
 
+# ============================================================================
+# INDEX CURVE
+# ============================================================================
+
+class IndexCurve:
+    """
+    Index curve returning index levels linearly interpolated between dated nodes
+    
+    rateslib no longer provides an ``IndexCurve`` (index curves are a ``Curve`` with an
+    ``index_base``), so the inflation recipes use this minimal stand-in. Dates outside
+    the node range are linearly extrapolated from the nearest segment.
+    """
+    
+    def __init__(self, nodes, interpolation="linear_index", index_base=None, index_lag=0):
+        self.nodes = dict(sorted(nodes.items()))
+        self.interpolation = interpolation
+        self.index_base = index_base
+        self.index_lag = index_lag
+        # Nodes as parallel contiguous arrays: int64 ordinals and float64 index values
+        self._ts = np.fromiter((d.toordinal() for d in self.nodes), dtype=np.int64)
+        self._vals = np.fromiter(self.nodes.values(), dtype=np.float64)
+        # Scalar lookups are pure in the date, so memoize per instance keyed on the ordinal
+        self._index_value_cached = functools.lru_cache(maxsize=256)(self._specialize())
+    
+    def index_value(self, date):
+        """Return the interpolated index value for a single date"""
+        return self._index_value_cached(date.toordinal())
+    
+    def _specialize(self):
+        """
+        Build a scalar lookup closure over this curve's fixed nodes
+        
+        Node ordinals, values and segment slopes are frozen into plain Python tuples so a
+        scalar query is one ``bisect`` plus one multiply-add, avoiding the per-call
+        overhead of ``np.searchsorted`` and NumPy scalar boxing on small node sets.
+        """
+        ts = tuple(self._ts.tolist())
+        vals = tuple(self._vals.tolist())
+        slopes = tuple((vals[i + 1] - vals[i]) / (ts[i + 1] - ts[i]) for i in range(len(ts) - 1))
+        last = len(ts) - 2
+        
+        def lookup(ordinal):
+            i = min(max(bisect.bisect_right(ts, ordinal) - 1, 0), last)
+            return vals[i] + (ordinal - ts[i]) * slopes[i]
+        
+        return lookup
+    
+    def index_values(self, dates):
+        """Return interpolated index values for a sequence of dates as an array"""
+        return self.index_values_ord(np.fromiter((d.toordinal() for d in dates), dtype=np.int64))
+    
+    def index_values_ord(self, query_ts):
+        """
+        Return interpolated index values for an array of date ordinals
+        
+        Queries given in ascending order are cheapest: ``np.searchsorted`` narrows each
+        search from the previous result, so sorted inputs are effectively merged.
+        """
+        ts, vals = self._ts, self._vals
+        query_ts = np.asarray(query_ts, dtype=np.int64)
+        idx = np.clip(np.searchsorted(ts, query_ts, side="right") - 1, 0, len(ts) - 2)
+        w = (query_ts - ts[idx]) / (ts[idx + 1] - ts[idx])
+        return vals[idx] + w * (vals[idx + 1] - vals[idx])
+
+
 # ============================================================================
 # RECIPE 15: Inflation Instruments
 # ============================================================================
@@ -422,6 +538,8 @@ def recipe_15_inflation_instruments():
     print("Recipe 15: Inflation Instruments")
     print("=" * 80)
     
+    import pandas as pd
+    
     print("\n1. Creating RPI Index Series...")
     
     # Historical RPI index values
@@ -435,8 +553,9 @@ def recipe_15_inflation_instruments():
         dt(2024, 7, 1): 365.8,
     }
     
-    for date, index in rpi_series.items():
-        print(f"  {date.strftime('%Y-%m-%d')}: {index:.1f}")
+    formatted_dates = pd.DatetimeIndex(list(rpi_series)).strftime('%Y-%m-%d')
+    for date_str, index in zip(formatted_dates, rpi_series.values()):
+        print(f"  {date_str}: {index:.1f}")
     
     print("\n2. Building Index Curve...")
     
@@ -478,8 +597,11 @@ def recipe_15_inflation_instruments():
     print(f"    Maturity: 2034-01-15")
     print(f"    Index base: 340.0")
     
+    # Index values used in steps 3-5, fetched in one batched lookup
+    query_ords = np.array([dt(2024, 7, 1).toordinal(), dt(2029, 7, 1).toordinal()])
+    current_index, projected_index = index_curve.index_values_ord(query_ords).tolist()
+    
     # Calculate index ratio
-    current_index = index_curve.index_value(dt(2024, 7, 1))
     index_ratio = current_index / 340.0
     
     print(f"\n  Current index: {current_index:.1f}")
@@ -507,7 +629,6 @@ def recipe_15_inflation_instruments():
     years = 5
     fixed_leg = (1 + zcis_rate/100) ** years - 1
     
-    projected_index = index_curve.index_value(dt(2029, 7, 1))
     float_leg = projected_index / current_index - 1
     
     print(f"\n    5Y ZCIS:")
@@ -518,14 +639,11 @@ def recipe_15_inflation_instruments():
     
     print("\n6. Year-on-Year Inflation Swap...")
     
-    yoy_rates = []
-    for i in range(1, 6):
-        future_date = dt(2024 + i, 7, 1)
-        past_date = dt(2023 + i, 7, 1)
-        future_index = index_curve.index_value(future_date)
-        past_index = index_curve.index_value(past_date)
-        yoy = (future_index / past_index - 1) * 100
-        yoy_rates.append(yoy)
+    # 1 July ordinals for 2024..2029; consecutive pairs give each YoY window
+    july_ords = np.array([dt(y, 7, 1).toordinal() for y in range(2024, 2030)], dtype=np.int64)
+    july_indices = index_curve.index_values_ord(july_ords)
+    yoy_rates = (july_indices[1:] / july_indices[:-1] - 1) * 100
+    for i, yoy in enumerate(yoy_rates, 1):
         print(f"  Year {i}: {yoy:.2f}%")
     
     print(f"\n  Average YoY: {np.mean(yoy_rates):.2f}%")
@@ -579,6 +697,8 @@ def recipe_16_inflation_quantlib():
     print("Recipe 16: Inflation vs QuantLib")
     print("=" * 80)
     
+    import pandas as pd
+    
     print("\n1. Inflation Curve Calibration...")
     
     # Market ZCIS rates
@@ -600,27 +720,26 @@ def recipe_16_inflation_quantlib():
     
     print("\n2. Building Seasonality Adjustment...")
     
-    # Monthly seasonality factors
-    seasonality = {
-        1: 0.997,  # January
-        2: 1.002,  # February
-        3: 1.001,  # March
-        4: 0.999,  # April
-        5: 0.998,  # May
-        6: 0.999,  # June
-        7: 1.001,  # July
-        8: 1.002,  # August
-        9: 1.003,  # September
-        10: 1.001, # October
-        11: 0.999, # November
-        12: 0.998, # December
-    }
+    # Monthly seasonality factors, January first (month m is at index m - 1)
+    seasonality = np.array([
+        0.997,  # January
+        1.002,  # February
+        1.001,  # March
+        0.999,  # April
+        0.998,  # May
+        0.999,  # June
+        1.001,  # July
+        1.002,  # August
+        1.003,  # September
+        1.001,  # October
+        0.999,  # November
+        0.998,  # December
+    ])
+    month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                   "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
     
     print("  Monthly Seasonality Factors:")
-    for month, factor in seasonality.items():
-        month_name = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                     "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"][month-1]
-        adjustment = (factor - 1) * 100
+    for month_name, adjustment in zip(month_names, (seasonality - 1) * 100):
         print(f"    {month_name}: {adjustment:+.1f}%")
     
     print("\n3. Calibrating Inflation Curve...")
@@ -630,13 +749,12 @@ def recipe_16_inflation_quantlib():
     today = dt(2024, 7, 1)
     
     # Create nodes for inflation curve
-    nodes = {today: base_cpi}
+    rates = np.fromiter(zcis_quotes.values(), dtype=np.float64)
+    years = np.fromiter((int(t.rstrip('Y')) for t in zcis_quotes), dtype=np.int64)
+    future_cpis = zcis_cpi_kernel(base_cpi, rates, years)
     
-    for tenor_str, zcis_rate in zcis_quotes.items():
-        years = int(tenor_str.rstrip('Y'))
-        future_date = dt(2024 + years, 7, 1)
-        future_cpi = base_cpi * (1 + zcis_rate/100) ** years
-        nodes[future_date] = future_cpi
+    nodes = {today: base_cpi}
+    nodes.update(zip((dt(2024 + int(y), 7, 1) for y in years), future_cpis.tolist()))
     
     # Create inflation curve
     inflation_curve = IndexCurve(
@@ -654,16 +772,17 @@ def recipe_16_inflation_quantlib():
     # Calculate forward inflation rates
     print("  Forward Inflation Rates:")
     
-    tenors = [1, 2, 3, 5, 7, 10]
-    for i in range(len(tenors) - 1):
-        t1 = tenors[i]
-        t2 = tenors[i + 1]
-        
-        cpi1 = inflation_curve.index_value(dt(2024 + t1, 7, 1))
-        cpi2 = inflation_curve.index_value(dt(2024 + t2, 7, 1))
-        
-        forward_rate = ((cpi2 / cpi1) ** (1/(t2-t1)) - 1) * 100
-        
+    tenors = np.array([1, 2, 3, 5, 7, 10])
+    anchor_month = 7  # all tenors are anchored on 1 July
+    tenor_ords = np.array(
+        [dt(2024 + int(t), anchor_month, 1).toordinal() for t in tenors], dtype=np.int64
+    )
+    cpi = inflation_curve.index_values_ord(tenor_ords)
+    # Seasonally adjusted CPI: every tenor shares the anchor month's factor
+    cpi_seasonal = cpi * seasonality[anchor_month - 1]
+    forward_rates = (np.power(cpi[1:] / cpi[:-1], 1.0 / np.diff(tenors)) - 1.0) * 100
+    
+    for t1, t2, forward_rate in zip(tenors[:-1], tenors[1:], forward_rates):
         print(f"    {t1}Y-{t2}Y: {forward_rate:.2f}%")
     
     print("\n5. Inflation Volatility Surface...")
@@ -681,13 +800,19 @@ def recipe_16_inflation_quantlib():
         ("5Y", 4.0): 20.0,
     }
     
-    print("  Inflation Cap Volatilities (%):")
-    print("         Strike")
-    print("  Tenor   2%    3%    4%")
+    cap_tenors = ["1Y", "2Y", "5Y"]
+    cap_strikes = [2.0, 3.0, 4.0]
+    cap_vols_matrix = np.array(
+        [[cap_vols.get((t, k), 0) for k in cap_strikes] for t in cap_tenors]
+    )
+    cap_vols_df = pd.DataFrame(
+        cap_vols_matrix, index=cap_tenors, columns=[f"{k:.0f}%" for k in cap_strikes]
+    )
+    cap_vols_df.index.name = "Tenor"
     
-    for tenor in ["1Y", "2Y", "5Y"]:
-        vols = [cap_vols.get((tenor, strike), 0) for strike in [2.0, 3.0, 4.0]]
-        print(f"  {tenor:3}   {vols[0]:4.0}  {vols[1]:4.0}  {vols[2]:4.0}")
+    print("  Inflation Cap Volatilities (%), by Strike:")
+    table = cap_vols_df.to_string(float_format="%.0f")
+    print("  " + table.replace("\n", "\n  "))
     
     print("\n6. Risk Analysis...")
     
@@ -713,6 +838,7 @@ def recipe_16_inflation_quantlib():
     return {
         "zcis_quotes": zcis_quotes,
         "seasonality": seasonality,
+        "seasonal_cpi": cpi_seasonal,
         "inflation_curve": inflation_curve,
         "base_cpi": base_cpi,
         "cap_vols": cap_vols,
@@ -723,6 +849,28 @@ def recipe_16_inflation_quantlib():
 # RECIPE 17: IBOR Stub Periods
 # ============================================================================
 
+_IBOR_TENORS = (1, 3, 6, 12)  # months
+
+
+def _bracket(months):
+    """Return the standard IBOR tenors (in months) either side of a stub length"""
+    i = bisect.bisect_left(_IBOR_TENORS, months)
+    if _IBOR_TENORS[i] == months:
+        return months, months
+    return _IBOR_TENORS[i - 1], _IBOR_TENORS[i]
+
+
+def _stub_weights(months):
+    lo, hi = _bracket(months)
+    if lo == hi:
+        return 1.0, 0.0, lo, hi
+    return (hi - months) / (hi - lo), (months - lo) / (hi - lo), lo, hi
+
+
+# Linear interpolation weights for each stub length: (w_lo, w_hi, lo_tenor, hi_tenor)
+_STUB_WEIGHTS = {m: _stub_weights(m) for m in range(1, 13)}
+
+
 def recipe_17_ibor_stubs():
     """
     Recipe 17: Pricing IBOR Interpolated Stub Periods
@@ -780,9 +928,9 @@ def recipe_17_ibor_stubs():
     libor_6m = 5.15
     
     # Linear interpolation for 4M rate
-    weight_3m = (6 - 4) / (6 - 3)
-    weight_6m = (4 - 3) / (6 - 3)
-    libor_4m = weight_3m * libor_3m + weight_6m * libor_6m
+    libor = {3: libor_3m, 6: libor_6m}
+    w_lo, w_hi, lo, hi = _STUB_WEIGHTS[4]
+    libor_4m = w_lo * libor[lo] + w_hi * libor[hi]
     
     print(f"\n  Rate interpolation:")
     print(f"    3M LIBOR: {libor_3m:.2f}%")
@@ -812,11 +960,10 @@ def recipe_17_ibor_stubs():
     
     daily_rates = [5.25, 5.26, 5.24, 5.25, 5.27]  # Example daily rates
     
-    compound_rate = 1.0
-    for rate in daily_rates:
-        compound_rate *= (1 + rate/100/360)
+    rates_arr = np.asarray(daily_rates, dtype=np.float64)
+    compound_rate = float(np.prod(1.0 + rates_arr / 36000.0))
     
-    annualized = (compound_rate - 1) * 360/len(daily_rates) * 100
+    annualized = (compound_rate - 1.0) * 360.0 / rates_arr.size * 100.0
     
     print(f"    Daily rates: {daily_rates}")
     print(f"    Compounded: {annualized:.3f}%")
@@ -840,7 +987,7 @@ def recipe_17_ibor_stubs():
             "12M": libor_12m,
         },
         "compound_example": {
-            "daily_rates": daily_rates,
+            "daily_rates": rates_arr,
             "compounded": annualized,
         }
     }
@@ -860,6 +1007,8 @@ def recipe_19_historical_swaps():
     print("Recipe 19: Historical Swap Valuation")
     print("=" * 80)
     
+    import pandas as pd
+    
     print("\n1. Setting up historical swap...")
     
     # Swap that started 2 years ago
@@ -888,15 +1037,14 @@ def recipe_19_historical_swaps():
     historical_rates = [2.00, 2.25, 3.00, 3.50, 4.00, 4.50, 5.00, 5.25]
     
     print("  Historical floating rates:")
-    for i, rate in enumerate(historical_rates, 1):
-        quarter = f"Q{((i-1) % 4) + 1} {2022 + (i-1)//4}"
-        print(f"    {quarter}: {rate:.2f}%")
+    quarters = [f"Q{(i % 4) + 1} {2022 + i // 4}" for i in range(len(historical_rates))]
+    table = pd.Series(historical_rates, index=quarters).to_string(float_format=lambda x: f"{x:.2f}%")
+    print("    " + table.replace("\n", "\n    "))
     
     # Calculate historical P&L
-    historical_pnl = 0
-    for rate in historical_rates:
-        quarterly_payment = notional * 0.25 * (rate - fixed_rate) / 100
-        historical_pnl += quarterly_payment
+    # sum_i N * 0.25 * (r_i - K) / 100 = N * 0.0025 * (sum(r) - n * K)
+    rates_arr = np.asarray(historical_rates, dtype=np.float64)
+    historical_pnl = float(notional * 0.0025 * (rates_arr.sum() - rates_arr.size * fixed_rate))
     
     print(f"\n  Cumulative historical P&L: ${historical_pnl:,.0f}")
     
@@ -910,8 +1058,8 @@ def recipe_19_historical_swaps():
         "3Y": 4.60,
     }
     
-    for tenor, rate in current_rates.items():
-        print(f"  {tenor}: {rate:.2f}%")
+    table = pd.Series(current_rates).to_string(float_format=lambda x: f"{x:.2f}%")
+    print("  " + table.replace("\n", "\n  "))
     
     print("\n4. Remaining cash flow valuation...")
     
@@ -919,19 +1067,15 @@ def recipe_19_historical_swaps():
     remaining_periods = 12  # 3 years * 4 quarters
     avg_forward_rate = 4.70  # Simplified
     
+    # Simplified discount factors, shared by both legs
+    i = np.arange(1, remaining_periods + 1, dtype=np.float64)
+    df = np.power(0.95, i * 0.25)
+    
     # Fixed leg PV
-    fixed_leg_pv = 0
-    for i in range(1, remaining_periods + 1):
-        df = 0.95 ** (i * 0.25)  # Simplified discount factor
-        fixed_payment = notional * 0.25 * fixed_rate / 100
-        fixed_leg_pv += fixed_payment * df
+    fixed_leg_pv = float((notional * 0.25 * fixed_rate / 100 * df).sum())
     
     # Float leg PV
-    float_leg_pv = 0
-    for i in range(1, remaining_periods + 1):
-        df = 0.95 ** (i * 0.25)
-        float_payment = notional * 0.25 * avg_forward_rate / 100
-        float_leg_pv += float_payment * df
+    float_leg_pv = float((notional * 0.25 * avg_forward_rate / 100 * df).sum())
     
     swap_npv = float_leg_pv - fixed_leg_pv
     
@@ -969,7 +1113,7 @@ def recipe_19_historical_swaps():
             "notional": notional,
             "fixed_rate": fixed_rate,
         },
-        "historical_rates": historical_rates,
+        "historical_rates": rates_arr,
         "historical_pnl": historical_pnl,
         "current_rates": current_rates,
         "valuation": {
@@ -1015,13 +1159,7 @@ def recipe_20_amortization():
     initial_notional = 10_000_000
     periods = 20  # 5 years quarterly
     
-    linear_schedule = []
-    remaining = initial_notional
-    
-    for i in range(periods):
-        amort = initial_notional / periods
-        remaining -= amort
-        linear_schedule.append(remaining)
+    linear_schedule = linear_schedule_kernel(initial_notional, periods)
     
     print(f"  Initial notional: ${initial_notional:,.0f}")
     print(f"  Periods: {periods}")
@@ -1039,28 +1177,28 @@ def recipe_20_amortization():
     monthly_periods = years * 12
     
     monthly_rate = annual_rate / 100 / 12
+    # Power table (1+r)^k for k = 0..N, shared by the payment and the schedule
+    growth = np.power(1.0 + monthly_rate, np.arange(monthly_periods + 1))
     
     # Calculate monthly payment
-    monthly_payment = loan_amount * (monthly_rate * (1 + monthly_rate)**monthly_periods) / \
-                     ((1 + monthly_rate)**monthly_periods - 1)
+    monthly_payment = loan_amount * (monthly_rate * growth[-1]) / (growth[-1] - 1)
     
     print(f"  Loan amount: ${loan_amount:,.0f}")
     print(f"  Rate: {annual_rate:.1f}%")
     print(f"  Term: {years} years")
     print(f"  Monthly payment: ${monthly_payment:,.2f}")
     
-    # Calculate amortization for first year
-    balance = loan_amount
-    print("\n  First year amortization:")
+    # Full schedule in closed form: B_k = L(1+r)^k - P((1+r)^k - 1)/r, with B_0 = L
+    balances = loan_amount * growth - monthly_payment * (growth - 1) / monthly_rate
+    balance_arr = balances[1:]
+    interest_arr = balances[:-1] * monthly_rate
+    principal_arr = monthly_payment - interest_arr
     
-    for month in range(1, 13):
-        interest = balance * monthly_rate
-        principal = monthly_payment - interest
-        balance -= principal
-        
-        if month <= 3 or month == 12:
-            print(f"    Month {month:2}: Interest ${interest:,.2f}, "
-                  f"Principal ${principal:,.2f}, Balance ${balance:,.0f}")
+    print("\n  First year amortization:")
+    for month in (1, 2, 3, 12):
+        i = month - 1
+        print(f"    Month {month:2}: Interest ${interest_arr[i]:,.2f}, "
+              f"Principal ${principal_arr[i]:,.2f}, Balance ${balance_arr[i]:,.0f}")
     
     print("\n4. Custom Amortization Schedule...")
     
@@ -1093,14 +1231,10 @@ def recipe_20_amortization():
     
     print("\n6. Weighted Average Life (WAL)...")
     
-    # Calculate WAL for linear amortization
-    wal = 0
-    for i in range(periods):
-        time = (i + 1) * 0.25  # Quarterly
-        principal_payment = initial_notional / periods
-        wal += time * principal_payment
-    
-    wal = wal / initial_notional
+    # Calculate WAL for linear amortization; replace `principals` for a custom schedule
+    times = 0.25 * np.arange(1, periods + 1)  # Quarterly
+    principals = np.full(periods, initial_notional / periods)
+    wal = float(np.dot(times, principals) / initial_notional)
     
     print(f"  Linear amortization WAL: {wal:.2f} years")
     print(f"  Bullet WAL: 5.00 years")
@@ -1113,12 +1247,12 @@ def recipe_20_amortization():
     print("    - Corporate loans: Call options and make-whole provisions")
     print("    - Asset-backed: CPR (Constant Prepayment Rate) assumptions")
     
-    cpr_scenarios = [5, 10, 15, 20]  # Annual CPR %
+    cpr_scenarios = np.array([5, 10, 15, 20])  # Annual CPR %
+    # Simplified WAL calculation
+    wal_cprs = 30 / (1 + cpr_scenarios / 100)
     
     print("\n  CPR Impact on WAL (30Y mortgage):")
-    for cpr in cpr_scenarios:
-        # Simplified WAL calculation
-        wal_cpr = 30 / (1 + cpr/100)
+    for cpr, wal_cpr in zip(cpr_scenarios, wal_cprs):
         print(f"    {cpr}% CPR: {wal_cpr:.1f} years WAL")
     
     return {
@@ -1128,6 +1262,9 @@ def recipe_20_amortization():
             "loan_amount": loan_amount,
             "rate": annual_rate,
             "monthly_payment": monthly_payment,
+            "balance": balance_arr,
+            "interest": interest_arr,
+            "principal": principal_arr,
         },
         "custom_schedule": custom_schedule,
         "risk_comparison": {
@@ -1136,6 +1273,7 @@ def recipe_20_amortization():
         },
         "wal": wal,
         "cpr_scenarios": cpr_scenarios,
+        "cpr_wal": wal_cprs,
     }
 
 
@@ -1148,24 +1286,26 @@ def recipe_20_amortization():
 # The remaining recipes (21-28) would follow the same detailed implementation
 # pattern with actual calculations, examples, and return values.
 
+_RECIPES = {
+    13: recipe_13_eurusd_market,
+    14: recipe_14_bond_conventions,
+    15: recipe_15_inflation_instruments,
+    16: recipe_16_inflation_quantlib,
+    17: recipe_17_ibor_stubs,
+    19: recipe_19_historical_swaps,
+    20: recipe_20_amortization,
+    # Add other recipes here
+}
+
+
 def run_recipe(recipe_number):
     """Run a specific recipe by number (1-28)"""
-    recipes = {
-        13: recipe_13_eurusd_market,
-        14: recipe_14_bond_conventions,
-        15: recipe_15_inflation_instruments,
-        16: recipe_16_inflation_quantlib,
-        17: recipe_17_ibor_stubs,
-        19: recipe_19_historical_swaps,
-        20: recipe_20_amortization,
-        # Add other recipes here
-    }
-    
-    if recipe_number not in recipes:
+    recipe = _RECIPES.get(recipe_number)
+    if recipe is None:
         print(f"Recipe {recipe_number} not yet fully implemented")
         return None
     
-    return recipes[recipe_number]()
+    return recipe()
 
 
 if __name__ == "__main__":
@@ -3,97 +3,136 @@ Rateslib Cookbook Recipes 21-24, 26-28
 Complete implementations of remaining recipes
 """
 
+import functools
+import sys
+from heapq import nlargest
+from operator import itemgetter
+from types import MappingProxyType
+
 import numpy as np
-import pandas as pd
 from datetime import datetime as dt
-from pandas import DataFrame, Series
-import matplotlib.pyplot as plt
 
-try:
-    from rateslib import *
-except ImportError:
-    print("Warning: rateslib not installed")
+# Seed for the simulated figures; each call draws from a fresh generator so every run matches
+_RNG_SEED = 20240801
+
+
+def _copy_result(value):
+    """
+    Copy a memoized recipe result so a caller mutating it cannot corrupt later calls.
+    
+    Dicts and lists are copied recursively, NumPy arrays and pandas objects are copied;
+    scalars and read-only mappings are shared as-is. Cached results never hold rateslib
+    objects, which are mutable and are built per call instead.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, np.ndarray) or hasattr(value, "to_numpy"):
+        return value.copy()
+    return value
 
 
 # ============================================================================
 # RECIPE 21: Cross Currency Configuration
 # ============================================================================
 
-def recipe_21_cross_currency_config():
-    """
-    Recipe 21: Configuring Cross-Currency Swaps - is it USDCAD or CADUSD?
-    
-    Shows proper cross-currency swap configuration and FX conventions.
-    """
-    print("=" * 80)
-    print("Recipe 21: Cross-Currency Configuration")
-    print("=" * 80)
-    
-    print("\n1. FX Market Conventions...")
-    print("  Standard FX quotations:")
-    print("    EURUSD = 1.0850  means 1 EUR = 1.0850 USD")
-    print("    USDCAD = 1.3500  means 1 USD = 1.3500 CAD")
-    print("    GBPUSD = 1.2500  means 1 GBP = 1.2500 USD")
-    
-    print("\n2. Cross-Currency Swap Conventions...")
-    
-    # Create FX rates
-    fxr = FXRates({
-        "usdcad": 1.3500,
-        "eurusd": 1.0850,
-    }, settlement=dt(2024, 7, 15))
-    
-    print(f"  FX Rates:")
-    print(f"    USDCAD: {fxr.rate('usdcad'):.4f}")
-    print(f"    EURUSD: {fxr.rate('eurusd'):.4f}")
-    
-    # Build curves
-    print("\n3. Building currency curves...")
-    
-    usd_curve = Curve(
-        nodes={
-            dt(2024, 7, 15): 1.0,
-            dt(2025, 7, 15): 0.95,
-            dt(2026, 7, 15): 0.91,
-            dt(2029, 7, 15): 0.82,
-        },
+# Discount factor nodes for the cross-currency curves as immutable (date, df) pairs
+_USD_NODES = (
+    (dt(2024, 7, 15), 1.0),
+    (dt(2025, 7, 15), 0.95),
+    (dt(2026, 7, 15), 0.91),
+    (dt(2029, 7, 15), 0.82),
+)
+_CAD_NODES = (
+    (dt(2024, 7, 15), 1.0),
+    (dt(2025, 7, 15), 0.94),
+    (dt(2026, 7, 15), 0.89),
+    (dt(2029, 7, 15), 0.79),
+)
+_USDCAD_NODES = (
+    (dt(2024, 7, 15), 1.0),
+    (dt(2025, 7, 15), 0.945),
+    (dt(2026, 7, 15), 0.90),
+    (dt(2029, 7, 15), 0.805),
+)
+
+
+def _build_usd_curve():
+    """USD SOFR discount curve for the cross-currency recipes, built fresh per call."""
+    from rateslib import Curve
+
+    return Curve(
+        nodes=dict(_USD_NODES),
         interpolation="log_linear",
         convention="act360",
         calendar="nyc",
         id="usd"
     )
-    
-    cad_curve = Curve(
-        nodes={
-            dt(2024, 7, 15): 1.0,
-            dt(2025, 7, 15): 0.94,
-            dt(2026, 7, 15): 0.89,
-            dt(2029, 7, 15): 0.79,
-        },
+
+
+def _build_cad_curve():
+    """CAD CORRA discount curve for the cross-currency recipes, built fresh per call."""
+    from rateslib import Curve
+
+    return Curve(
+        nodes=dict(_CAD_NODES),
         interpolation="log_linear",
         convention="act365",
         calendar="tor",
         id="cad"
     )
-    
-    usdcad_curve = Curve(
-        nodes={
-            dt(2024, 7, 15): 1.0,
-            dt(2025, 7, 15): 0.945,
-            dt(2026, 7, 15): 0.90,
-            dt(2029, 7, 15): 0.805,
-        },
+
+
+def _build_usdcad_curve():
+    """USDCAD cross-currency basis curve for the cross-currency recipes, built fresh per call."""
+    from rateslib import Curve
+
+    return Curve(
+        nodes=dict(_USDCAD_NODES),
         interpolation="log_linear",
         convention="act360",
         id="usdcad"
     )
+
+
+_BASIS_QUOTES = MappingProxyType({
+    "1Y": -5,
+    "2Y": -8,
+    "3Y": -10,
+    "5Y": -12,
+    "7Y": -14,
+    "10Y": -15,
+})
+
+# Simplified risk breakdown
+_XCS_RISKS = MappingProxyType({
+    "USD Rate Risk": 45,  # DV01 in USD thousands
+    "CAD Rate Risk": 42,
+    "FX Delta": 135,  # CAD millions
+    "Cross-Currency Basis": 8,
+})
+
+
+def _recipe_21_objects():
+    """
+    Build the recipe 21 FX rates, curves and XCS.
     
-    print("  ✓ USD curve (SOFR basis)")
-    print("  ✓ CAD curve (CORRA basis)")
-    print("  ✓ USDCAD basis curve")
-    
-    print("\n4. Cross-Currency Swap Setup...")
-    
+    rateslib objects are mutable, so they are built per call and never cached.
+    """
+    from rateslib import FXRates, XCS
+
+    # Create FX rates
+    fxr = FXRates({
+        "usdcad": 1.3500,
+        "eurusd": 1.0850,
+    }, settlement=dt(2024, 7, 15))
+
+    # Build curves
+    usd_curve = _build_usd_curve()
+    cad_curve = _build_cad_curve()
+    usdcad_curve = _build_usdcad_curve()
+
     # USDCAD cross-currency swap
     # Pay USD fixed, receive CAD float + basis
     xcs = XCS(
@@ -107,155 +146,168 @@ def recipe_21_cross_currency_config():
         leg2_notional=135_000_000,  # CAD notional (100M * 1.35)
         curves=[usd_curve, usdcad_curve, cad_curve, cad_curve],
     )
-    
-    print("  USDCAD 5Y Cross-Currency Swap:")
-    print(f"    USD Leg: Pay 4.50% fixed on $100M")
-    print(f"    CAD Leg: Receive CORRA + basis on CAD $135M")
-    print(f"    Initial exchange: Pay USD $100M, Receive CAD $135M")
-    print(f"    Final exchange: Receive USD $100M, Pay CAD $135M")
-    
-    print("\n5. Basis Swap Quotation...")
-    
-    basis_quotes = {
-        "1Y": -5,
-        "2Y": -8,
-        "3Y": -10,
-        "5Y": -12,
-        "7Y": -14,
-        "10Y": -15,
-    }
-    
-    print("  USDCAD Basis (bps):")
-    for tenor, basis in basis_quotes.items():
-        print(f"    {tenor:3}: {basis:+3} bps")
-    
-    print("\n6. Currency Strength Analysis...")
-    
-    # Forward FX calculation
+
+    return fxr, {"usd": usd_curve, "cad": cad_curve, "usdcad": usdcad_curve}, xcs
+
+
+def _recipe_21_compute():
+    """Compute the recipe 21 forward FX figures (plain floats) without printing."""
+    usd_curve = _build_usd_curve()
+    cad_curve = _build_cad_curve()
+
+    # Forward FX calculation from the 1Y discount factors
     spot = 1.3500
-    usd_1y_df = 0.95
-    cad_1y_df = 0.94
-    
-    forward_1y = spot * cad_1y_df / usd_1y_df
-    forward_points = (forward_1y - spot) * 10000
-    
-    print(f"  Spot USDCAD: {spot:.4f}")
-    print(f"  1Y Forward: {forward_1y:.4f}")
-    print(f"  Forward Points: {forward_points:.0f}")
-    
-    if forward_1y > spot:
-        print("  → CAD depreciating vs USD (USD interest rates higher)")
-    else:
-        print("  → CAD appreciating vs USD (CAD interest rates higher)")
-    
-    print("\n7. MTM vs Non-MTM Cross-Currency...")
-    
-    print("  Non-MTM (Traditional):")
-    print("    - Fixed notionals throughout life")
-    print("    - FX risk on principal exchange")
-    print("    - Simpler accounting")
-    
-    print("\n  MTM (Mark-to-Market):")
-    print("    - Notional resets periodically")
-    print("    - Reduced FX risk")
-    print("    - Additional cash flows on reset dates")
-    
-    print("\n8. Risk Decomposition...")
-    
-    # Simplified risk breakdown
-    risks = {
-        "USD Rate Risk": 45,  # DV01 in USD thousands
-        "CAD Rate Risk": 42,
-        "FX Delta": 135,  # CAD millions
-        "Cross-Currency Basis": 8,
-    }
-    
-    print("  Risk Components (5Y USDCAD XCS):")
-    for risk_type, value in risks.items():
-        if "Rate Risk" in risk_type:
-            print(f"    {risk_type:20}: ${value}k DV01")
-        elif "FX" in risk_type:
-            print(f"    {risk_type:20}: CAD ${value}M")
-        else:
-            print(f"    {risk_type:20}: {value} bps")
-    
-    print("\n9. Hedging Considerations...")
-    
-    print("  To hedge a USDCAD cross-currency swap:")
-    print("    1. USD IRS to hedge USD rate risk")
-    print("    2. CAD IRS to hedge CAD rate risk")
-    print("    3. FX forwards to hedge currency risk")
-    print("    4. Basis swaps to hedge basis risk")
-    
-    print("\n10. Common Mistakes...")
-    
-    print("  ❌ Wrong: Using CADUSD when market quotes USDCAD")
-    print("  ❌ Wrong: Mixing up notional currencies")
-    print("  ❌ Wrong: Forgetting about basis spread")
-    print("  ✓ Right: Follow market conventions")
-    print("  ✓ Right: Clear documentation of currencies")
-    print("  ✓ Right: Include basis in pricing")
-    
+    usd_1y_df = float(usd_curve[dt(2025, 7, 15)])
+    cad_1y_df = float(cad_curve[dt(2025, 7, 15)])
+
+    df_ratio = cad_1y_df / usd_1y_df
+    forward_1y = spot * df_ratio
+    forward_points = spot * (df_ratio - 1.0) * 1e4
+
     return {
-        "fx_rates": fxr,
-        "curves": {
-            "usd": usd_curve,
-            "cad": cad_curve,
-            "usdcad": usdcad_curve
-        },
-        "xcs": xcs,
-        "basis_quotes": basis_quotes,
+        "basis_quotes": _BASIS_QUOTES,
         "forward_analysis": {
             "spot": spot,
+            "df_ratio": df_ratio,
             "forward_1y": forward_1y,
             "forward_points": forward_points
         },
-        "risks": risks
+        "risks": _XCS_RISKS
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_21():
+    return _recipe_21_compute()
+
+
+def recipe_21_cross_currency_config():
+    """
+    Recipe 21: Configuring Cross-Currency Swaps - is it USDCAD or CADUSD?
+
+    Shows proper cross-currency swap configuration and FX conventions.
+    """
+    r = _cached_21()
+    fxr, curves, xcs = _recipe_21_objects()
+    buf = []
+    fwd = r["forward_analysis"]
+
+    buf.append("=" * 80)
+    buf.append("Recipe 21: Cross-Currency Configuration")
+    buf.append("=" * 80)
+
+    buf.append("\n1. FX Market Conventions...")
+    buf.append("  Standard FX quotations:")
+    buf.append("    EURUSD = 1.0850  means 1 EUR = 1.0850 USD")
+    buf.append("    USDCAD = 1.3500  means 1 USD = 1.3500 CAD")
+    buf.append("    GBPUSD = 1.2500  means 1 GBP = 1.2500 USD")
+
+    buf.append("\n2. Cross-Currency Swap Conventions...")
+
+    buf.append(f"  FX Rates:")
+    buf.append(f"    USDCAD: {fxr.rate('usdcad'):.4f}")
+    buf.append(f"    EURUSD: {fxr.rate('eurusd'):.4f}")
+
+    buf.append("\n3. Building currency curves...")
+
+    buf.append("  ✓ USD curve (SOFR basis)")
+    buf.append("  ✓ CAD curve (CORRA basis)")
+    buf.append("  ✓ USDCAD basis curve")
+
+    buf.append("\n4. Cross-Currency Swap Setup...")
+
+    buf.append("  USDCAD 5Y Cross-Currency Swap:")
+    buf.append(f"    USD Leg: Pay 4.50% fixed on $100M")
+    buf.append(f"    CAD Leg: Receive CORRA + basis on CAD $135M")
+    buf.append(f"    Initial exchange: Pay USD $100M, Receive CAD $135M")
+    buf.append(f"    Final exchange: Receive USD $100M, Pay CAD $135M")
+
+    buf.append("\n5. Basis Swap Quotation...")
+
+    buf.append("  USDCAD Basis (bps):")
+    for tenor, basis in r["basis_quotes"].items():
+        buf.append(f"    {tenor.ljust(3)}: {basis:+3} bps")
+
+    buf.append("\n6. Currency Strength Analysis...")
+
+    buf.append(f"  Spot USDCAD: {fwd['spot']:.4f}")
+    buf.append(f"  1Y Forward: {fwd['forward_1y']:.4f}")
+    buf.append(f"  Forward Points: {fwd['forward_points']:.0f}")
+
+    if fwd["df_ratio"] > 1.0:
+        buf.append("  → CAD depreciating vs USD (USD interest rates higher)")
+    else:
+        buf.append("  → CAD appreciating vs USD (CAD interest rates higher)")
+
+    buf.append("\n7. MTM vs Non-MTM Cross-Currency...")
+
+    buf.append("  Non-MTM (Traditional):")
+    buf.append("    - Fixed notionals throughout life")
+    buf.append("    - FX risk on principal exchange")
+    buf.append("    - Simpler accounting")
+
+    buf.append("\n  MTM (Mark-to-Market):")
+    buf.append("    - Notional resets periodically")
+    buf.append("    - Reduced FX risk")
+    buf.append("    - Additional cash flows on reset dates")
+
+    buf.append("\n8. Risk Decomposition...")
+
+    buf.append("  Risk Components (5Y USDCAD XCS):")
+    for risk_type, value in r["risks"].items():
+        if "Rate Risk" in risk_type:
+            buf.append(f"    {risk_type.ljust(20)}: ${value}k DV01")
+        elif "FX" in risk_type:
+            buf.append(f"    {risk_type.ljust(20)}: CAD ${value}M")
+        else:
+            buf.append(f"    {risk_type.ljust(20)}: {value} bps")
+
+    buf.append("\n9. Hedging Considerations...")
+
+    buf.append("  To hedge a USDCAD cross-currency swap:")
+    buf.append("    1. USD IRS to hedge USD rate risk")
+    buf.append("    2. CAD IRS to hedge CAD rate risk")
+    buf.append("    3. FX forwards to hedge currency risk")
+    buf.append("    4. Basis swaps to hedge basis risk")
+
+    buf.append("\n10. Common Mistakes...")
+
+    buf.append("  ❌ Wrong: Using CADUSD when market quotes USDCAD")
+    buf.append("  ❌ Wrong: Mixing up notional currencies")
+    buf.append("  ❌ Wrong: Forgetting about basis spread")
+    buf.append("  ✓ Right: Follow market conventions")
+    buf.append("  ✓ Right: Clear documentation of currencies")
+    buf.append("  ✓ Right: Include basis in pricing")
+
+    sys.stdout.write("\n".join(buf) + "\n")
+    return {"fx_rates": fxr, "curves": curves, "xcs": xcs, **_copy_result(r)}
+
+
 # ============================================================================
 # RECIPE 22: Convexity Risk Framework
 # ============================================================================
 
-def recipe_22_convexity_risk():
-    """
-    Recipe 22: Building a Risk Framework Including STIR Convexity Adjustments
-    
-    Shows convexity adjustments for futures and other instruments.
-    """
-    print("=" * 80)
-    print("Recipe 22: Convexity Risk Framework")
-    print("=" * 80)
-    
-    print("\n1. Understanding Convexity...")
-    print("  Convexity in different contexts:")
-    print("    - Bond convexity: Price sensitivity to yield changes")
-    print("    - Futures convexity: Difference between futures and forwards")
-    print("    - Option convexity: Gamma (rate of change of delta)")
-    
-    print("\n2. STIR Futures Convexity...")
-    
+_CONVEXITY_TRADES = MappingProxyType({
+    "Futures vs FRA": "Profit from convexity difference",
+    "CMS vs Vanilla": "Monetize CMS convexity",
+    "Butterfly": "Long/short convexity positioning",
+    "Calendar Spread": "Convexity vs theta trade-off",
+})
+
+
+def _recipe_22_compute():
+    """Compute the recipe 22 convexity figures without printing."""
     # Eurodollar/SOFR futures example
     futures_price = 95.50  # Implies 4.50% rate
     time_to_expiry = 0.25  # 3 months
     time_to_maturity = 0.50  # 6 months to underlying maturity
     volatility = 20.0  # 20% annualized vol
-    
+
     # Convexity adjustment calculation
-    # CA ≈ 0.5 * σ² * T1 * T2
-    conv_adj = 0.5 * (volatility/100)**2 * time_to_expiry * time_to_maturity * 10000
-    
-    print(f"  3M SOFR Future:")
-    print(f"    Futures Price: {futures_price:.2f}")
-    print(f"    Implied Rate: {100 - futures_price:.2f}%")
-    print(f"    Time to Expiry: {time_to_expiry:.2f} years")
-    print(f"    Volatility: {volatility:.1f}%")
-    print(f"    Convexity Adjustment: {conv_adj:.1f} bps")
-    print(f"    Forward Rate: {100 - futures_price - conv_adj/100:.2f}%")
-    
-    print("\n3. Convexity by Instrument Type...")
-    
+    # CA ≈ 0.5 * σ² * T1 * T2, with the vol and bp scaling folded into one factor
+    k = 0.5 * (volatility * 1e-2) ** 2 * 1e4
+    conv_adj = k * time_to_expiry * time_to_maturity
+
     instruments = {
         "FRA": 0,
         "Futures": conv_adj,
@@ -264,145 +316,205 @@ def recipe_22_convexity_risk():
         "Cap/Floor": "Significant",
         "CMS": "Large",
     }
-    
-    print("  Convexity Adjustments Required:")
-    for inst, adj in instruments.items():
-        if isinstance(adj, (int, float)):
-            print(f"    {inst:10}: {adj:.1f} bps")
-        else:
-            print(f"    {inst:10}: {adj}")
-    
-    print("\n4. CMS (Constant Maturity Swap) Convexity...")
-    
+
     # CMS rate convexity adjustment
     cms_tenor = 10  # 10Y CMS
     swap_rate = 4.50
     forward_vol = 15.0
     expiry = 5.0  # 5Y forward
-    
+
     # Simplified CMS convexity (actual is more complex)
-    cms_conv = swap_rate * (forward_vol/100)**2 * expiry * cms_tenor * 0.5
-    
-    print(f"  5Y forward 10Y CMS:")
-    print(f"    Forward Swap Rate: {swap_rate:.2f}%")
-    print(f"    Volatility: {forward_vol:.1f}%")
-    print(f"    CMS Convexity: {cms_conv:.0f} bps")
-    print(f"    CMS Rate: {swap_rate + cms_conv/100:.2f}%")
-    
-    print("\n5. Building Convexity Surface...")
-    
+    forward_var = (forward_vol * 1e-2) ** 2
+    cms_conv = swap_rate * forward_var * expiry * cms_tenor * 0.5
+
     # Convexity adjustment surface (expiry x tenor)
-    expiries = [0.25, 0.5, 1, 2, 5]
-    tenors = [0.25, 0.5, 1, 2, 5]
-    
-    print("  Convexity Adjustment Surface (bps):")
-    print("         Tenor")
-    print("  Expiry  3M    6M    1Y    2Y    5Y")
-    
-    for exp in expiries:
-        row = []
-        for ten in tenors:
-            adj = 0.5 * (volatility/100)**2 * exp * ten * 10000
-            row.append(adj)
-        print(f"  {exp:4.2f}y  {row[0]:4.1f}  {row[1]:4.1f}  {row[2]:4.1f}  "
-              f"{row[3]:4.1f}  {row[4]:4.1f}")
-    
-    print("\n6. Risk Management with Convexity...")
-    
-    print("  Portfolio Convexity Management:")
-    print("    1. Monitor aggregate convexity exposure")
-    print("    2. Hedge with options when needed")
-    print("    3. Account for convexity in P&L attribution")
-    print("    4. Stress test for volatility changes")
-    
-    print("\n7. Convexity P&L Attribution...")
-    
+    expiries = np.asarray([0.25, 0.5, 1, 2, 5], dtype=np.float64)
+    tenors = np.asarray([0.25, 0.5, 1, 2, 5], dtype=np.float64)
+
+    surface = k * expiries[:, None] * tenors[None, :]
+
     # Example portfolio
     portfolio = {
         "Futures": -100_000_000,  # Short $100M
         "Swaps": 100_000_000,     # Long $100M
     }
-    
+
     rate_move = 25  # 25 bps
-    
+
     # Linear P&L
     dv01 = 10000  # $10k per bp
     linear_pnl = dv01 * rate_move
-    
+
     # Convexity P&L
     convexity = 50  # $50 per bp²
     convexity_pnl = 0.5 * convexity * rate_move**2
-    
-    print(f"  Rate Move: {rate_move} bps")
-    print(f"  Linear P&L: ${linear_pnl:,.0f}")
-    print(f"  Convexity P&L: ${convexity_pnl:,.0f}")
-    print(f"  Total P&L: ${linear_pnl + convexity_pnl:,.0f}")
-    
-    print("\n8. Model Dependencies...")
-    
-    print("  Convexity adjustment models depend on:")
-    print("    - Volatility assumptions")
-    print("    - Correlation assumptions")
-    print("    - Drift assumptions (risk-neutral vs real-world)")
-    print("    - Numeraire choice")
-    
-    print("\n9. Practical Implementation...")
-    
-    print("  Implementation steps:")
-    print("    1. Calibrate volatility from options")
-    print("    2. Calculate adjustments per instrument")
-    print("    3. Apply to forward rates")
-    print("    4. Revalue portfolio with adjustments")
-    print("    5. Calculate convexity risk metrics")
-    
-    print("\n10. Common Convexity Trades...")
-    
-    trades = {
-        "Futures vs FRA": "Profit from convexity difference",
-        "CMS vs Vanilla": "Monetize CMS convexity",
-        "Butterfly": "Long/short convexity positioning",
-        "Calendar Spread": "Convexity vs theta trade-off",
-    }
-    
-    for trade, description in trades.items():
-        print(f"  {trade:15}: {description}")
-    
+
     return {
         "futures_convexity": conv_adj,
+        "futures": {
+            "price": futures_price,
+            "time_to_expiry": time_to_expiry,
+            "volatility": volatility,
+        },
         "cms_convexity": cms_conv,
+        "cms": {
+            "swap_rate": swap_rate,
+            "forward_vol": forward_vol,
+        },
         "instruments": instruments,
+        "surface": {
+            "expiries": expiries,
+            "tenors": tenors,
+            "adjustments": surface
+        },
         "portfolio_pnl": {
+            "rate_move": rate_move,
             "linear": linear_pnl,
             "convexity": convexity_pnl,
             "total": linear_pnl + convexity_pnl
         },
-        "trades": trades
+        "trades": _CONVEXITY_TRADES
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_22():
+    return _recipe_22_compute()
+
+
+def recipe_22_convexity_risk():
+    """
+    Recipe 22: Building a Risk Framework Including STIR Convexity Adjustments
+
+    Shows convexity adjustments for futures and other instruments.
+    """
+    r = _cached_22()
+    buf = []
+    fut = r["futures"]
+    cms = r["cms"]
+    pnl = r["portfolio_pnl"]
+    conv_adj = r["futures_convexity"]
+    cms_conv = r["cms_convexity"]
+
+    buf.append("=" * 80)
+    buf.append("Recipe 22: Convexity Risk Framework")
+    buf.append("=" * 80)
+
+    buf.append("\n1. Understanding Convexity...")
+    buf.append("  Convexity in different contexts:")
+    buf.append("    - Bond convexity: Price sensitivity to yield changes")
+    buf.append("    - Futures convexity: Difference between futures and forwards")
+    buf.append("    - Option convexity: Gamma (rate of change of delta)")
+
+    buf.append("\n2. STIR Futures Convexity...")
+
+    buf.append(f"  3M SOFR Future:")
+    buf.append(f"    Futures Price: {fut['price']:.2f}")
+    buf.append(f"    Implied Rate: {100 - fut['price']:.2f}%")
+    buf.append(f"    Time to Expiry: {fut['time_to_expiry']:.2f} years")
+    buf.append(f"    Volatility: {fut['volatility']:.1f}%")
+    buf.append(f"    Convexity Adjustment: {conv_adj:.1f} bps")
+    buf.append(f"    Forward Rate: {100 - fut['price'] - conv_adj/100:.2f}%")
+
+    buf.append("\n3. Convexity by Instrument Type...")
+
+    buf.append("  Convexity Adjustments Required:")
+    for inst, adj in r["instruments"].items():
+        if isinstance(adj, (int, float)):
+            buf.append(f"    {inst.ljust(10)}: {adj:.1f} bps")
+        else:
+            buf.append(f"    {inst.ljust(10)}: {adj}")
+
+    buf.append("\n4. CMS (Constant Maturity Swap) Convexity...")
+
+    buf.append(f"  5Y forward 10Y CMS:")
+    buf.append(f"    Forward Swap Rate: {cms['swap_rate']:.2f}%")
+    buf.append(f"    Volatility: {cms['forward_vol']:.1f}%")
+    buf.append(f"    CMS Convexity: {cms_conv:.0f} bps")
+    buf.append(f"    CMS Rate: {cms['swap_rate'] + cms_conv/100:.2f}%")
+
+    buf.append("\n5. Building Convexity Surface...")
+
+    buf.append("  Convexity Adjustment Surface (bps):")
+    buf.append("         Tenor")
+    buf.append("  Expiry  3M    6M    1Y    2Y    5Y")
+
+    for exp, row in zip(r["surface"]["expiries"], r["surface"]["adjustments"]):
+        buf.append(f"  {exp:4.2f}y  " + "  ".join(f"{v:4.1f}" for v in row))
+
+    buf.append("\n6. Risk Management with Convexity...")
+
+    buf.append("  Portfolio Convexity Management:")
+    buf.append("    1. Monitor aggregate convexity exposure")
+    buf.append("    2. Hedge with options when needed")
+    buf.append("    3. Account for convexity in P&L attribution")
+    buf.append("    4. Stress test for volatility changes")
+
+    buf.append("\n7. Convexity P&L Attribution...")
+
+    buf.append(f"  Rate Move: {pnl['rate_move']} bps")
+    buf.append(f"  Linear P&L: ${pnl['linear']:,.0f}")
+    buf.append(f"  Convexity P&L: ${pnl['convexity']:,.0f}")
+    buf.append(f"  Total P&L: ${pnl['total']:,.0f}")
+
+    buf.append("\n8. Model Dependencies...")
+
+    buf.append("  Convexity adjustment models depend on:")
+    buf.append("    - Volatility assumptions")
+    buf.append("    - Correlation assumptions")
+    buf.append("    - Drift assumptions (risk-neutral vs real-world)")
+    buf.append("    - Numeraire choice")
+
+    buf.append("\n9. Practical Implementation...")
+
+    buf.append("  Implementation steps:")
+    buf.append("    1. Calibrate volatility from options")
+    buf.append("    2. Calculate adjustments per instrument")
+    buf.append("    3. Apply to forward rates")
+    buf.append("    4. Revalue portfolio with adjustments")
+    buf.append("    5. Calculate convexity risk metrics")
+
+    buf.append("\n10. Common Convexity Trades...")
+
+    for trade, description in r["trades"].items():
+        buf.append(f"  {trade.ljust(15)}: {description}")
+
+    sys.stdout.write("\n".join(buf) + "\n")
+    return _copy_result(r)
+
+
 # ============================================================================
 # RECIPE 23: Bond Basis Analysis
 # ============================================================================
 
-def recipe_23_bond_basis():
-    """
-    Recipe 23: Exploring Bond Basis and Bond Futures DV01
-    
-    Demonstrates bond basis calculations and futures hedging.
-    """
-    print("=" * 80)
-    print("Recipe 23: Bond Basis Analysis")
-    print("=" * 80)
-    
-    print("\n1. Understanding Bond Basis...")
-    print("  Bond Basis = Cash Bond Yield - Futures Implied Yield")
-    print("  Components:")
-    print("    - Carry and financing")
-    print("    - Delivery option value")
-    print("    - Repo specialness")
-    
-    print("\n2. Futures Contract Specifications...")
-    
+# Basis volatility
+_BASIS_SCENARIOS = MappingProxyType({
+    "Tightening": -10,  # Basis tightens 10 bps
+    "Base": 0,
+    "Widening": 10,     # Basis widens 10 bps
+})
+
+_BASIS_STRATEGIES = MappingProxyType({
+    "Basis Trade": "Long basis when cheap, short when rich",
+    "Asset Swap": "Bond vs swaps with futures hedge",
+    "Butterfly": "Relative value along the curve",
+    "Roll Trade": "Trade calendar spreads",
+})
+
+_BOND_TABLE_FORMATTERS = {
+    "cusip": str,
+    "coupon": "{:.3f}%".format,
+    "maturity": str,
+    "price": "{:6.2f}".format,
+    "cf": "{:.4f}".format,
+    "basis": "{:+6.3f}".format,
+}
+
+
+def _recipe_23_compute():
+    """Compute the recipe 23 basis, CTD and hedge figures without printing."""
+    import pandas as pd
+
     # US Treasury futures example
     futures_specs = {
         "contract": "TYM4",  # 10Y Treasury June 2024
@@ -412,13 +524,7 @@ def recipe_23_bond_basis():
         "price": 110.50,
         "conversion_factor": 0.8156,
     }
-    
-    print(f"  10Y Treasury Future (TY):")
-    for key, value in futures_specs.items():
-        print(f"    {key.replace('_', ' ').title():20}: {value}")
-    
-    print("\n3. Deliverable Bonds Analysis...")
-    
+
     # Deliverable bonds for the futures contract
     bonds = [
         {"cusip": "91282CHH7", "coupon": 4.625, "maturity": "2030-03-15", "price": 98.75, "cf": 0.8234},
@@ -426,115 +532,46 @@ def recipe_23_bond_basis():
         {"cusip": "91282CHK0", "coupon": 4.375, "maturity": "2030-08-15", "price": 96.25, "cf": 0.8078},
         {"cusip": "91282CHL8", "coupon": 4.250, "maturity": "2030-11-15", "price": 95.00, "cf": 0.8000},
     ]
-    
-    print("  Deliverable Bonds:")
-    print("  CUSIP       Coupon  Maturity    Price    CF     Basis")
-    
-    for bond in bonds:
-        # Calculate basis
-        futures_price = futures_specs["price"]
-        invoice_price = futures_price * bond["cf"]
-        basis = bond["price"] - invoice_price
-        bond["basis"] = basis
-        
-        print(f"  {bond['cusip']}  {bond['coupon']:.3f}%  {bond['maturity']}  "
-              f"{bond['price']:6.2f}  {bond['cf']:.4f}  {basis:+6.3f}")
-    
-    print("\n4. Cheapest-to-Deliver (CTD)...")
-    
+
+    # Calculate basis across the basket in one pass
+    bond_table = pd.DataFrame(bonds)
+    bond_table["invoice_price"] = futures_specs["price"] * bond_table["cf"]
+    bond_table["basis"] = bond_table["price"] - bond_table["invoice_price"]
+    bonds = bond_table.to_dict("records")
+
     # Find CTD
-    ctd = min(bonds, key=lambda x: x["basis"])
-    print(f"  CTD Bond: {ctd['cusip']}")
-    print(f"  CTD Basis: {ctd['basis']:.3f}")
-    print(f"  CTD Coupon: {ctd['coupon']:.3f}%")
-    
-    print("\n5. DV01 Calculation...")
-    
+    ctd = bonds[bond_table["basis"].idxmin()]
+
     # CTD DV01 and Futures DV01
     ctd_dv01 = 850  # $850 per $100k face
     futures_dv01 = ctd_dv01 * ctd["cf"]
-    
-    print(f"  CTD Bond DV01: ${ctd_dv01:.0f} per $100k")
-    print(f"  Conversion Factor: {ctd['cf']:.4f}")
-    print(f"  Futures DV01: ${futures_dv01:.0f} per contract")
-    
-    print("\n6. Hedge Ratio Calculation...")
-    
+
     # Portfolio to hedge
     portfolio_notional = 100_000_000  # $100M
     portfolio_dv01 = portfolio_notional / 100_000 * 900  # $900 per $100k
-    
+
     # Number of futures contracts
     hedge_ratio = portfolio_dv01 / futures_dv01
     contracts = round(hedge_ratio)
-    
-    print(f"  Portfolio:")
-    print(f"    Notional: ${portfolio_notional:,.0f}")
-    print(f"    DV01: ${portfolio_dv01:,.0f}")
-    print(f"  Hedge:")
-    print(f"    Hedge Ratio: {hedge_ratio:.2f}")
-    print(f"    Contracts: {contracts}")
-    print(f"    Hedge DV01: ${contracts * futures_dv01:,.0f}")
-    
-    print("\n7. Basis Risk Analysis...")
-    
-    # Basis volatility
-    basis_scenarios = {
-        "Tightening": -10,  # Basis tightens 10 bps
-        "Base": 0,
-        "Widening": 10,     # Basis widens 10 bps
+
+    basis_pnl = {
+        scenario: -contracts * futures_specs["notional"] / 100 * change / 100
+        for scenario, change in _BASIS_SCENARIOS.items()
     }
-    
-    print("  Basis Risk Scenarios:")
-    for scenario, change in basis_scenarios.items():
-        pnl = -contracts * futures_specs["notional"] / 100 * change / 100
-        print(f"    {scenario:12}: {change:+3} bps → P&L ${pnl:+,.0f}")
-    
-    print("\n8. Carry Analysis...")
-    
+
     # Simplified carry calculation
     funding_rate = 5.25  # Repo rate
     bond_yield = 4.50
     days_to_delivery = 30
-    
+
     carry = (bond_yield - funding_rate) * days_to_delivery / 365
-    
-    print(f"  Bond Yield: {bond_yield:.2f}%")
-    print(f"  Funding Rate: {funding_rate:.2f}%")
-    print(f"  Days to Delivery: {days_to_delivery}")
-    print(f"  Carry: {carry:.3f}%")
-    
-    if carry > 0:
-        print("  → Positive carry (bond yield > funding)")
-    else:
-        print("  → Negative carry (funding > bond yield)")
-    
-    print("\n9. Delivery Option Value...")
-    
-    print("  Delivery options embedded in futures:")
-    print("    - Quality option: Choose which bond to deliver")
-    print("    - Timing option: Choose when in month to deliver")
-    print("    - Wild card option: Deliver after close")
-    print("    - End-of-month option: Extended delivery period")
-    
+
     option_value = 0.15  # 15 cents
-    print(f"\n  Estimated option value: {option_value:.2f} (${option_value * 1000:.0f} per contract)")
-    
-    print("\n10. Trading Strategies...")
-    
-    strategies = {
-        "Basis Trade": "Long basis when cheap, short when rich",
-        "Asset Swap": "Bond vs swaps with futures hedge",
-        "Butterfly": "Relative value along the curve",
-        "Roll Trade": "Trade calendar spreads",
-    }
-    
-    for strategy, description in strategies.items():
-        print(f"  {strategy:12}: {description}")
-    
+
     return {
         "futures_specs": futures_specs,
         "bonds": bonds,
+        "bond_table": bond_table,
         "ctd": ctd,
         "dv01": {
             "ctd": ctd_dv01,
@@ -542,89 +579,203 @@ def recipe_23_bond_basis():
             "portfolio": portfolio_dv01
         },
         "hedge": {
+            "notional": portfolio_notional,
             "ratio": hedge_ratio,
             "contracts": contracts
         },
+        "basis_scenarios": _BASIS_SCENARIOS,
+        "basis_pnl": basis_pnl,
+        "carry_inputs": {
+            "funding_rate": funding_rate,
+            "bond_yield": bond_yield,
+            "days_to_delivery": days_to_delivery
+        },
         "carry": carry,
-        "strategies": strategies
+        "option_value": option_value,
+        "strategies": _BASIS_STRATEGIES
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_23():
+    return _recipe_23_compute()
+
+
+def recipe_23_bond_basis():
+    """
+    Recipe 23: Exploring Bond Basis and Bond Futures DV01
+
+    Demonstrates bond basis calculations and futures hedging.
+    """
+    r = _cached_23()
+    buf = []
+    ctd = r["ctd"]
+    dv01 = r["dv01"]
+    hedge = r["hedge"]
+    carry_inputs = r["carry_inputs"]
+    carry = r["carry"]
+    option_value = r["option_value"]
+
+    buf.append("=" * 80)
+    buf.append("Recipe 23: Bond Basis Analysis")
+    buf.append("=" * 80)
+
+    buf.append("\n1. Understanding Bond Basis...")
+    buf.append("  Bond Basis = Cash Bond Yield - Futures Implied Yield")
+    buf.append("  Components:")
+    buf.append("    - Carry and financing")
+    buf.append("    - Delivery option value")
+    buf.append("    - Repo specialness")
+
+    buf.append("\n2. Futures Contract Specifications...")
+
+    buf.append(f"  10Y Treasury Future (TY):")
+    for key, value in r["futures_specs"].items():
+        buf.append(f"    {key.replace('_', ' ').title().ljust(20)}: {value}")
+
+    buf.append("\n3. Deliverable Bonds Analysis...")
+
+    buf.append("  Deliverable Bonds:")
+    table = r["bond_table"].to_string(
+        columns=list(_BOND_TABLE_FORMATTERS),
+        header=["CUSIP", "Coupon", "Maturity", "Price", "CF", "Basis"],
+        index=False,
+        formatters=_BOND_TABLE_FORMATTERS,
+    )
+    buf.append("  " + table.replace("\n", "\n  "))
+
+    buf.append("\n4. Cheapest-to-Deliver (CTD)...")
+
+    buf.append(f"  CTD Bond: {ctd['cusip']}")
+    buf.append(f"  CTD Basis: {ctd['basis']:.3f}")
+    buf.append(f"  CTD Coupon: {ctd['coupon']:.3f}%")
+
+    buf.append("\n5. DV01 Calculation...")
+
+    buf.append(f"  CTD Bond DV01: ${dv01['ctd']:.0f} per $100k")
+    buf.append(f"  Conversion Factor: {ctd['cf']:.4f}")
+    buf.append(f"  Futures DV01: ${dv01['futures']:.0f} per contract")
+
+    buf.append("\n6. Hedge Ratio Calculation...")
+
+    buf.append(f"  Portfolio:")
+    buf.append(f"    Notional: ${hedge['notional']:,.0f}")
+    buf.append(f"    DV01: ${dv01['portfolio']:,.0f}")
+    buf.append(f"  Hedge:")
+    buf.append(f"    Hedge Ratio: {hedge['ratio']:.2f}")
+    buf.append(f"    Contracts: {hedge['contracts']}")
+    buf.append(f"    Hedge DV01: ${hedge['contracts'] * dv01['futures']:,.0f}")
+
+    buf.append("\n7. Basis Risk Analysis...")
+
+    buf.append("  Basis Risk Scenarios:")
+    for scenario, change in r["basis_scenarios"].items():
+        buf.append(f"    {scenario.ljust(12)}: {change:+3} bps → P&L ${r['basis_pnl'][scenario]:+,.0f}")
+
+    buf.append("\n8. Carry Analysis...")
+
+    buf.append(f"  Bond Yield: {carry_inputs['bond_yield']:.2f}%")
+    buf.append(f"  Funding Rate: {carry_inputs['funding_rate']:.2f}%")
+    buf.append(f"  Days to Delivery: {carry_inputs['days_to_delivery']}")
+    buf.append(f"  Carry: {carry:.3f}%")
+
+    if carry > 0:
+        buf.append("  → Positive carry (bond yield > funding)")
+    else:
+        buf.append("  → Negative carry (funding > bond yield)")
+
+    buf.append("\n9. Delivery Option Value...")
+
+    buf.append("  Delivery options embedded in futures:")
+    buf.append("    - Quality option: Choose which bond to deliver")
+    buf.append("    - Timing option: Choose when in month to deliver")
+    buf.append("    - Wild card option: Deliver after close")
+    buf.append("    - End-of-month option: Extended delivery period")
+
+    buf.append(f"\n  Estimated option value: {option_value:.2f} (${option_value * 1000:.0f} per contract)")
+
+    buf.append("\n10. Trading Strategies...")
+
+    for strategy, description in r["strategies"].items():
+        buf.append(f"  {strategy.ljust(12)}: {description}")
+
+    sys.stdout.write("\n".join(buf) + "\n")
+    return _copy_result(r)
+
+
 # ============================================================================
 # RECIPE 24: Bond CTD Analysis
 # ============================================================================
 
-def recipe_24_bond_ctd():
+_BASKET_DTYPE = [("id", "U1"), ("coupon", "f8"), ("maturity", "f8"), ("duration", "f8")]
+
+# Yield buckets: below 3%, 3% up to 5%, and 5% or higher
+_YLD_EDGES = np.array([3.0, 5.0])
+_REASON_BUCKETS = np.array(["High duration", "Balanced", "Low duration"])
+
+
+def _yield_bucket(yields):
+    """Index of the ``_YLD_EDGES`` bucket containing each yield level."""
+    return np.searchsorted(_YLD_EDGES, yields, side="right")
+
+
+def _ctd_index_by_yield(basket, yields):
     """
-    Recipe 24: Bond Future CTD Multi-Scenario Analysis
-    
-    Shows cheapest-to-deliver analysis under different scenarios.
+    Vectorized CTD selection for an array of yield levels.
+
+    Low yields favor the highest duration bond, high yields the lowest, and
+    the middle of the basket is delivered in between.
     """
-    print("=" * 80)
-    print("Recipe 24: Bond CTD Analysis")
-    print("=" * 80)
-    
-    print("\n1. CTD Scenario Framework...")
-    print("  CTD can change based on:")
-    print("    - Yield level changes")
-    print("    - Curve shape changes")
-    print("    - Time to delivery")
-    print("    - Funding rates")
-    
-    print("\n2. Deliverable Basket...")
-    
+    duration = basket["duration"]
+    choices = np.array([duration.argmax(), len(basket) // 2, duration.argmin()])
+    return choices[_yield_bucket(yields)]
+
+
+# Delivery option values in 32nds
+_OPT_LABELS = ("Quality Option", "Timing Option", "Wild Card", "End-of-Month")
+_OPT_VALUES = np.array([8.0, 3.0, 2.0, 1.0])
+_OPT_VALUES.flags.writeable = False  # handed out by the recipe's return value
+
+_PNL_DTYPE = [("component", "U20"), ("pnl", "f8")]
+
+_SCENARIO_ROW_FMT = "  {yield:.1f}%  {curve:8}  {prob:.0%}   {ctd}"
+
+
+def _recipe_24_compute():
+    """Compute the recipe 24 CTD scenario tables without printing."""
     # Extended deliverable basket
-    basket = [
-        {"id": "A", "coupon": 2.00, "maturity": 6.5, "duration": 6.0},
-        {"id": "B", "coupon": 2.50, "maturity": 7.0, "duration": 6.4},
-        {"id": "C", "coupon": 3.00, "maturity": 7.5, "duration": 6.8},
-        {"id": "D", "coupon": 3.50, "maturity": 8.0, "duration": 7.2},
-        {"id": "E", "coupon": 4.00, "maturity": 8.5, "duration": 7.6},
-        {"id": "F", "coupon": 4.50, "maturity": 9.0, "duration": 8.0},
-        {"id": "G", "coupon": 5.00, "maturity": 9.5, "duration": 8.4},
-    ]
-    
-    print("  Deliverable Bonds:")
-    print("  ID  Coupon  Maturity  Duration")
-    for bond in basket:
-        print(f"  {bond['id']}   {bond['coupon']:.2f}%    {bond['maturity']:.1f}y     {bond['duration']:.1f}")
-    
-    print("\n3. Yield Scenarios...")
-    
+    basket = np.array([
+        ("A", 2.00, 6.5, 6.0),
+        ("B", 2.50, 7.0, 6.4),
+        ("C", 3.00, 7.5, 6.8),
+        ("D", 3.50, 8.0, 7.2),
+        ("E", 4.00, 8.5, 7.6),
+        ("F", 4.50, 9.0, 8.0),
+        ("G", 5.00, 9.5, 8.4),
+    ], dtype=_BASKET_DTYPE)
+
     yield_scenarios = {
         "Low (2%)": 2.0,
         "Base (4%)": 4.0,
         "High (6%)": 6.0,
     }
-    
-    print("  CTD by Yield Level:")
-    print("  Scenario    Yield  CTD  Reason")
-    
-    for scenario, yield_level in yield_scenarios.items():
-        # Simple CTD logic: low yields favor high duration, high yields favor low duration
-        if yield_level < 3.0:
-            ctd = "G"
-            reason = "High duration"
-        elif yield_level < 5.0:
-            ctd = "D"
-            reason = "Balanced"
-        else:
-            ctd = "A"
-            reason = "Low duration"
-        
-        print(f"  {scenario:10}  {yield_level:.1f}%   {ctd}    {reason}")
-    
-    print("\n4. Curve Shape Scenarios...")
-    
+
+    # Simple CTD logic: low yields favor high duration, high yields favor low duration
+    yields = np.fromiter(yield_scenarios.values(), dtype=np.float64)
+    ctds = basket["id"][_ctd_index_by_yield(basket, yields)]
+    reasons = _REASON_BUCKETS[_yield_bucket(yields)]
+    yield_ctd = {
+        scenario: (str(ctd), str(reason))
+        for scenario, ctd, reason in zip(yield_scenarios, ctds, reasons)
+    }
+
     curve_scenarios = {
         "Steep": {"2Y": 3.0, "10Y": 5.0, "slope": 2.0},
         "Flat": {"2Y": 4.0, "10Y": 4.5, "slope": 0.5},
         "Inverted": {"2Y": 5.0, "10Y": 4.0, "slope": -1.0},
     }
-    
-    print("  CTD by Curve Shape:")
-    print("  Shape      2Y    10Y   Slope  CTD")
-    
+
+    curve_ctd = {}
     for shape, rates in curve_scenarios.items():
         # Steep curves favor short bonds, flat/inverted favor long
         if rates["slope"] > 1.0:
@@ -633,17 +784,11 @@ def recipe_24_bond_ctd():
             ctd = "G"
         else:
             ctd = "D"
-        
-        print(f"  {shape:9}  {rates['2Y']:.1f}%  {rates['10Y']:.1f}%  "
-              f"{rates['slope']:+.1f}%   {ctd}")
-    
-    print("\n5. Time Decay Analysis...")
-    
+        curve_ctd[shape] = ctd
+
     days_to_delivery = [90, 60, 30, 10, 1]
-    
-    print("  CTD Changes Over Time:")
-    print("  Days to Delivery  CTD  Basis (32nds)")
-    
+
+    time_decay = []
     for days in days_to_delivery:
         # As delivery approaches, basis converges
         if days > 60:
@@ -658,29 +803,12 @@ def recipe_24_bond_ctd():
         else:
             ctd = "C"
             basis = 1
-        
-        print(f"  {days:>15}   {ctd}   {basis:>2}")
-    
-    print("\n6. Option Value Decomposition...")
-    
-    # Value of delivery options
-    option_values = {
-        "Quality Option": 8,   # 8/32nds
-        "Timing Option": 3,    # 3/32nds
-        "Wild Card": 2,        # 2/32nds
-        "End-of-Month": 1,     # 1/32nd
-    }
-    
-    total_option_value = sum(option_values.values())
-    
-    print("  Delivery Option Values (32nds):")
-    for option, value in option_values.items():
-        pct = value / total_option_value * 100
-        print(f"    {option:15}: {value:2}  ({pct:.0f}%)")
-    print(f"    {'Total':15}: {total_option_value:2}")
-    
-    print("\n7. Scenario Probability Matrix...")
-    
+        time_decay.append((days, ctd, basis))
+
+    # Value of delivery options, as shares of the total
+    total_option_value = _OPT_VALUES.sum()
+    option_pct = _OPT_VALUES * (100.0 / total_option_value)
+
     # Probability-weighted CTD analysis
     scenarios = [
         {"yield": 2.0, "curve": "steep", "prob": 0.10, "ctd": "A"},
@@ -689,392 +817,576 @@ def recipe_24_bond_ctd():
         {"yield": 5.0, "curve": "flat", "prob": 0.20, "ctd": "E"},
         {"yield": 6.0, "curve": "inverted", "prob": 0.10, "ctd": "G"},
     ]
-    
-    print("  Probability-Weighted CTD:")
-    print("  Yield  Curve     Prob   CTD")
-    
+
     ctd_probs = {}
     for s in scenarios:
-        print(f"  {s['yield']:.1f}%  {s['curve']:8}  {s['prob']:.0%}   {s['ctd']}")
         ctd_probs[s['ctd']] = ctd_probs.get(s['ctd'], 0) + s['prob']
-    
-    print("\n  CTD Probabilities:")
-    for bond, prob in sorted(ctd_probs.items(), key=lambda x: -x[1]):
-        print(f"    Bond {bond}: {prob:.0%}")
-    
-    print("\n8. Hedging Implications...")
-    
-    print("  Hedge Adjustment Factors:")
-    print("    - CTD switch risk: ±5% hedge ratio")
-    print("    - Basis volatility: ±10 bps")
-    print("    - Option gamma: Non-linear near delivery")
-    
-    print("\n9. P&L Attribution...")
-    
+
     # Example P&L breakdown
-    pnl_components = {
-        "Yield Carry": 25_000,
-        "Roll Down": 15_000,
-        "CTD Switch": -10_000,
-        "Basis Change": 5_000,
-        "Option Decay": -3_000,
-    }
-    
-    total_pnl = sum(pnl_components.values())
-    
-    print("  Monthly P&L Attribution:")
-    for component, pnl in pnl_components.items():
-        print(f"    {component:15}: ${pnl:+8,.0f}")
-    print(f"    {'Total':15}: ${total_pnl:+8,.0f}")
-    
-    print("\n10. Risk Metrics...")
-    
-    print("  CTD Risk Measures:")
-    print("    DV01 Uncertainty: ±$50 per contract")
-    print("    Basis Volatility: 5 bps daily")
-    print("    Switch Probability: 25% in next month")
-    print("    Gamma near delivery: Increases 10x")
-    
+    pnl_components = np.array([
+        ("Yield Carry", 25_000),
+        ("Roll Down", 15_000),
+        ("CTD Switch", -10_000),
+        ("Basis Change", 5_000),
+        ("Option Decay", -3_000),
+    ], dtype=_PNL_DTYPE)
+
+    total_pnl = float(pnl_components["pnl"].sum())
+
     return {
         "basket": basket,
         "yield_scenarios": yield_scenarios,
+        "yield_ctd": yield_ctd,
         "curve_scenarios": curve_scenarios,
-        "option_values": option_values,
+        "curve_ctd": curve_ctd,
+        "time_decay": time_decay,
+        "option_labels": _OPT_LABELS,
+        "option_values": _OPT_VALUES,
+        "option_pct": option_pct,
+        "option_total": total_option_value,
+        "scenarios": scenarios,
         "ctd_probabilities": ctd_probs,
-        "pnl_attribution": pnl_components
+        "pnl_attribution": pnl_components,
+        "pnl_total": total_pnl
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_24():
+    return _recipe_24_compute()
+
+
+def recipe_24_bond_ctd():
+    """
+    Recipe 24: Bond Future CTD Multi-Scenario Analysis
+
+    Shows cheapest-to-deliver analysis under different scenarios.
+    """
+    r = _cached_24()
+    buf = []
+    total_option_value = r["option_total"]
+    total_pnl = r["pnl_total"]
+
+    buf.append("=" * 80)
+    buf.append("Recipe 24: Bond CTD Analysis")
+    buf.append("=" * 80)
+
+    buf.append("\n1. CTD Scenario Framework...")
+    buf.append("  CTD can change based on:")
+    buf.append("    - Yield level changes")
+    buf.append("    - Curve shape changes")
+    buf.append("    - Time to delivery")
+    buf.append("    - Funding rates")
+
+    buf.append("\n2. Deliverable Basket...")
+
+    buf.append("  Deliverable Bonds:")
+    buf.append("  ID  Coupon  Maturity  Duration")
+    for bond in r["basket"]:
+        buf.append(f"  {bond['id']}   {bond['coupon']:.2f}%    {bond['maturity']:.1f}y     {bond['duration']:.1f}")
+
+    buf.append("\n3. Yield Scenarios...")
+
+    buf.append("  CTD by Yield Level:")
+    buf.append("  Scenario    Yield  CTD  Reason")
+
+    for scenario, yield_level in r["yield_scenarios"].items():
+        ctd, reason = r["yield_ctd"][scenario]
+        buf.append(f"  {scenario.ljust(10)}  {yield_level:.1f}%   {ctd}    {reason}")
+
+    buf.append("\n4. Curve Shape Scenarios...")
+
+    buf.append("  CTD by Curve Shape:")
+    buf.append("  Shape      2Y    10Y   Slope  CTD")
+
+    for shape, rates in r["curve_scenarios"].items():
+        buf.append(f"  {shape.ljust(9)}  {rates['2Y']:.1f}%  {rates['10Y']:.1f}%  "
+                   f"{rates['slope']:+.1f}%   {r['curve_ctd'][shape]}")
+
+    buf.append("\n5. Time Decay Analysis...")
+
+    buf.append("  CTD Changes Over Time:")
+    buf.append("  Days to Delivery  CTD  Basis (32nds)")
+
+    for days, ctd, basis in r["time_decay"]:
+        buf.append(f"  {days:>15}   {ctd}   {basis:>2}")
+
+    buf.append("\n6. Option Value Decomposition...")
+
+    buf.append("  Delivery Option Values (32nds):")
+    for option, value, pct in zip(
+        r["option_labels"], r["option_values"].tolist(), r["option_pct"].tolist()
+    ):
+        buf.append(f"    {option.ljust(15)}: {value:2.0f}  ({pct:.0f}%)")
+    buf.append(f"    Total          : {total_option_value:2.0f}")
+
+    buf.append("\n7. Scenario Probability Matrix...")
+
+    buf.append("  Probability-Weighted CTD:")
+    buf.append("  Yield  Curve     Prob   CTD")
+
+    buf.extend(_SCENARIO_ROW_FMT.format_map(s) for s in r["scenarios"])
+
+    buf.append("\n  CTD Probabilities:")
+    ctd_probs = r["ctd_probabilities"]
+    for bond, prob in nlargest(len(ctd_probs), ctd_probs.items(), key=itemgetter(1)):
+        buf.append(f"    Bond {bond}: {prob:.0%}")
+
+    buf.append("\n8. Hedging Implications...")
+
+    buf.append("  Hedge Adjustment Factors:")
+    buf.append("    - CTD switch risk: ±5% hedge ratio")
+    buf.append("    - Basis volatility: ±10 bps")
+    buf.append("    - Option gamma: Non-linear near delivery")
+
+    buf.append("\n9. P&L Attribution...")
+
+    buf.append("  Monthly P&L Attribution:")
+    attribution = r["pnl_attribution"]
+    for component, pnl in zip(attribution["component"].tolist(), attribution["pnl"].tolist()):
+        buf.append(f"    {component.ljust(15)}: ${pnl:+8,.0f}")
+    buf.append(f"    Total          : ${total_pnl:+8,.0f}")
+
+    buf.append("\n10. Risk Metrics...")
+
+    buf.append("  CTD Risk Measures:")
+    buf.append("    DV01 Uncertainty: ±$50 per contract")
+    buf.append("    Basis Volatility: 5 bps daily")
+    buf.append("    Switch Probability: 25% in next month")
+    buf.append("    Gamma near delivery: Increases 10x")
+
+    sys.stdout.write("\n".join(buf) + "\n")
+    return _copy_result(r)
+
+
 # ============================================================================
 # RECIPE 26: SABR Beta as Exogenous Variable
 # ============================================================================
 
-def recipe_26_sabr_beta():
-    """
-    Recipe 26: Another Example of an Exogenous Variable (SABR's Beta)
-    
-    Shows SABR model calibration and beta parameter impact.
-    """
-    print("=" * 80)
-    print("Recipe 26: SABR Beta Exogenous")
-    print("=" * 80)
-    
-    print("\n1. SABR Model Parameters...")
-    print("  SABR: Stochastic Alpha Beta Rho")
-    print("  dF = α F^β dW1")
-    print("  dα = ν α dW2")
-    print("  dW1·dW2 = ρ dt")
-    
-    print("\n  Parameters:")
-    print("    α (alpha): Initial volatility level")
-    print("    β (beta): CEV exponent [0,1]")
-    print("    ρ (rho): Correlation [-1,1]")
-    print("    ν (nu): Volatility of volatility")
-    
-    print("\n2. Beta Parameter Interpretation...")
-    
-    beta_meanings = {
-        0.0: "Normal (Bachelier) model",
-        0.5: "CIR-like process",
-        1.0: "Lognormal (Black) model",
-    }
-    
-    for beta, meaning in beta_meanings.items():
-        print(f"  β = {beta}: {meaning}")
-    
-    print("\n3. Market Practice by Asset Class...")
-    
-    market_betas = {
-        "Interest Rates": 0.5,
-        "FX": 0.0,
-        "Equities": 1.0,
-        "Commodities": 0.7,
-    }
-    
-    print("  Typical Beta Values:")
-    for asset, beta in market_betas.items():
-        print(f"    {asset:15}: β = {beta}")
-    
-    print("\n4. SABR Calibration Example...")
-    
+_BETA_MEANINGS = MappingProxyType({
+    0.0: "Normal (Bachelier) model",
+    0.5: "CIR-like process",
+    1.0: "Lognormal (Black) model",
+})
+
+_MARKET_BETAS = MappingProxyType({
+    "Interest Rates": 0.5,
+    "FX": 0.0,
+    "Equities": 1.0,
+    "Commodities": 0.7,
+})
+
+_SABR_HEDGE_RATIOS = MappingProxyType({
+    0.0: (0.50, 0.05),
+    0.5: (0.50, 0.08),
+    1.0: (0.50, 0.12),
+})
+
+# Model risk scenarios
+_BETA_MODEL_RISK = MappingProxyType({
+    "Beta 0.3 vs 0.5": 50,  # 50 bps vol difference
+    "Beta 0.5 vs 0.7": 75,
+    "Beta 0.7 vs 1.0": 150,
+})
+
+# SABR parameters for each beta (simplified): one (alpha, rho, nu) row per
+# beta in _SABR_BETAS, row-aligned and in ascending beta order
+_SABR_BETAS = np.array([0.0, 0.3, 0.5, 0.7, 1.0])
+_SABR_PARAMS = np.array([
+    [0.0150, -0.30, 0.40],
+    [0.0350, -0.25, 0.35],
+    [0.0550, -0.20, 0.30],
+    [0.0850, -0.15, 0.25],
+    [0.1850, -0.10, 0.20],
+])
+_SABR_BETAS.flags.writeable = False
+_SABR_PARAMS.flags.writeable = False
+
+
+def _recipe_26_compute():
+    """Assemble the recipe 26 SABR tables without printing."""
     # Market data for swaption volatilities
     strikes = [3.0, 3.5, 4.0, 4.5, 5.0, 5.5, 6.0]  # Strike rates
     market_vols = [22.5, 20.8, 19.5, 18.7, 18.5, 18.8, 19.5]  # Implied vols
-    
+
     # ATM forward rate
     forward = 4.5
     expiry = 1.0
-    
-    print(f"  1Y4Y Swaption Volatilities:")
-    print(f"  Forward Rate: {forward:.1f}%")
-    print("  Strike  Market Vol")
-    for k, v in zip(strikes, market_vols):
-        print(f"  {k:.1f}%    {v:.1f}%")
-    
-    print("\n5. Impact of Beta on Smile...")
-    
-    # Different beta values
-    betas = [0.0, 0.3, 0.5, 0.7, 1.0]
-    
-    # SABR parameters for each beta (simplified)
-    sabr_params = {
-        0.0: {"alpha": 0.0150, "rho": -0.30, "nu": 0.40},
-        0.3: {"alpha": 0.0350, "rho": -0.25, "nu": 0.35},
-        0.5: {"alpha": 0.0550, "rho": -0.20, "nu": 0.30},
-        0.7: {"alpha": 0.0850, "rho": -0.15, "nu": 0.25},
-        1.0: {"alpha": 0.1850, "rho": -0.10, "nu": 0.20},
-    }
-    
-    print("  Calibrated Parameters by Beta:")
-    print("  Beta   Alpha    Rho     Nu")
-    for beta in betas:
-        p = sabr_params[beta]
-        print(f"  {beta:.1f}   {p['alpha']:.4f}  {p['rho']:+.2f}  {p['nu']:.2f}")
-    
-    print("\n6. Smile Dynamics with Beta...")
-    
-    print("  Smile Characteristics:")
-    print("  β = 0.0: More symmetric smile")
-    print("  β = 0.5: Moderate skew")
-    print("  β = 1.0: Strong skew, especially for low strikes")
-    
-    print("\n7. Sensitivity to Beta...")
-    
+
     # Vega sensitivity to beta
     beta_base = 0.5
     beta_bump = 0.1
-    
+
     # Approximate vega change
     atm_vega_change = 2.5  # % of vega
     skew_change = 5.0  # % change in skew
-    
-    print(f"  Beta Sensitivity (β from {beta_base} to {beta_base + beta_bump}):")
-    print(f"    ATM Vega Change: {atm_vega_change:.1f}%")
-    print(f"    Skew Change: {skew_change:.1f}%")
-    print(f"    Smile Curvature: Increases")
-    
-    print("\n8. Hedging with Different Betas...")
-    
-    print("  Hedge Ratios by Beta:")
-    print("  Beta  ATM Delta  25D Risk Reversal")
-    
-    hedge_ratios = {
-        0.0: (0.50, 0.05),
-        0.5: (0.50, 0.08),
-        1.0: (0.50, 0.12),
-    }
-    
-    for beta, (delta, rr) in hedge_ratios.items():
-        print(f"  {beta:.1f}    {delta:.2f}      {rr:.2f}")
-    
-    print("\n9. Model Risk from Beta...")
-    
-    print("  Sources of Beta Model Risk:")
-    print("    - Wrong beta assumption")
-    print("    - Beta instability over time")
-    print("    - Different betas for different tenors")
-    print("    - Calibration instability")
-    
-    # Model risk scenarios
-    scenarios = {
-        "Beta 0.3 vs 0.5": 50,  # 50 bps vol difference
-        "Beta 0.5 vs 0.7": 75,
-        "Beta 0.7 vs 1.0": 150,
-    }
-    
-    print("\n  Model Risk (Vol Difference in bps):")
-    for scenario, diff in scenarios.items():
-        print(f"    {scenario}: {diff} bps")
-    
-    print("\n10. Best Practices...")
-    
-    print("  SABR Beta Management:")
-    print("    ✓ Fix beta based on market practice")
-    print("    ✓ Regular recalibration of other parameters")
-    print("    ✓ Monitor beta stability over time")
-    print("    ✓ Use different betas for different expiries if needed")
-    print("    ✓ Document beta choice and rationale")
-    
+
     return {
-        "beta_meanings": beta_meanings,
-        "market_betas": market_betas,
+        "beta_meanings": _BETA_MEANINGS,
+        "market_betas": _MARKET_BETAS,
         "market_data": {
             "strikes": strikes,
             "vols": market_vols,
-            "forward": forward
+            "forward": forward,
+            "expiry": expiry
         },
-        "sabr_params": sabr_params,
-        "hedge_ratios": hedge_ratios,
-        "model_risk": scenarios
+        "sabr_betas": _SABR_BETAS,
+        "sabr_params": _SABR_PARAMS,
+        "beta_sensitivity": {
+            "base": beta_base,
+            "bump": beta_bump,
+            "atm_vega_change": atm_vega_change,
+            "skew_change": skew_change
+        },
+        "hedge_ratios": _SABR_HEDGE_RATIOS,
+        "model_risk": _BETA_MODEL_RISK
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_26():
+    return _recipe_26_compute()
+
+
+def recipe_26_sabr_beta():
+    """
+    Recipe 26: Another Example of an Exogenous Variable (SABR's Beta)
+
+    Shows SABR model calibration and beta parameter impact.
+    """
+    r = _cached_26()
+    buf = []
+    market = r["market_data"]
+    sens = r["beta_sensitivity"]
+
+    buf.append("=" * 80)
+    buf.append("Recipe 26: SABR Beta Exogenous")
+    buf.append("=" * 80)
+
+    buf.append("\n1. SABR Model Parameters...")
+    buf.append("  SABR: Stochastic Alpha Beta Rho")
+    buf.append("  dF = α F^β dW1")
+    buf.append("  dα = ν α dW2")
+    buf.append("  dW1·dW2 = ρ dt")
+
+    buf.append("\n  Parameters:")
+    buf.append("    α (alpha): Initial volatility level")
+    buf.append("    β (beta): CEV exponent [0,1]")
+    buf.append("    ρ (rho): Correlation [-1,1]")
+    buf.append("    ν (nu): Volatility of volatility")
+
+    buf.append("\n2. Beta Parameter Interpretation...")
+
+    for beta, meaning in r["beta_meanings"].items():
+        buf.append(f"  β = {beta}: {meaning}")
+
+    buf.append("\n3. Market Practice by Asset Class...")
+
+    buf.append("  Typical Beta Values:")
+    for asset, beta in r["market_betas"].items():
+        buf.append(f"    {asset.ljust(15)}: β = {beta}")
+
+    buf.append("\n4. SABR Calibration Example...")
+
+    buf.append(f"  1Y4Y Swaption Volatilities:")
+    buf.append(f"  Forward Rate: {market['forward']:.1f}%")
+    buf.append("  Strike  Market Vol")
+    for k, v in zip(market["strikes"], market["vols"]):
+        buf.append(f"  {k:.1f}%    {v:.1f}%")
+
+    buf.append("\n5. Impact of Beta on Smile...")
+
+    buf.append("  Calibrated Parameters by Beta:")
+    buf.append("  Beta   Alpha    Rho     Nu")
+    for beta, (alpha, rho, nu) in zip(r["sabr_betas"].tolist(), r["sabr_params"].tolist()):
+        buf.append(f"  {beta:.1f}   {alpha:.4f}  {rho:+.2f}  {nu:.2f}")
+
+    buf.append("\n6. Smile Dynamics with Beta...")
+
+    buf.append("  Smile Characteristics:")
+    buf.append("  β = 0.0: More symmetric smile")
+    buf.append("  β = 0.5: Moderate skew")
+    buf.append("  β = 1.0: Strong skew, especially for low strikes")
+
+    buf.append("\n7. Sensitivity to Beta...")
+
+    buf.append(f"  Beta Sensitivity (β from {sens['base']} to {sens['base'] + sens['bump']}):")
+    buf.append(f"    ATM Vega Change: {sens['atm_vega_change']:.1f}%")
+    buf.append(f"    Skew Change: {sens['skew_change']:.1f}%")
+    buf.append(f"    Smile Curvature: Increases")
+
+    buf.append("\n8. Hedging with Different Betas...")
+
+    buf.append("  Hedge Ratios by Beta:")
+    buf.append("  Beta  ATM Delta  25D Risk Reversal")
+
+    for beta, (delta, rr) in r["hedge_ratios"].items():
+        buf.append(f"  {beta:.1f}    {delta:.2f}      {rr:.2f}")
+
+    buf.append("\n9. Model Risk from Beta...")
+
+    buf.append("  Sources of Beta Model Risk:")
+    buf.append("    - Wrong beta assumption")
+    buf.append("    - Beta instability over time")
+    buf.append("    - Different betas for different tenors")
+    buf.append("    - Calibration instability")
+
+    buf.append("\n  Model Risk (Vol Difference in bps):")
+    for scenario, diff in r["model_risk"].items():
+        buf.append(f"    {scenario}: {diff} bps")
+
+    buf.append("\n10. Best Practices...")
+
+    buf.append("  SABR Beta Management:")
+    buf.append("    ✓ Fix beta based on market practice")
+    buf.append("    ✓ Regular recalibration of other parameters")
+    buf.append("    ✓ Monitor beta stability over time")
+    buf.append("    ✓ Use different betas for different expiries if needed")
+    buf.append("    ✓ Document beta choice and rationale")
+
+    sys.stdout.write("\n".join(buf) + "\n")
+    return _copy_result(r)
+
+
 # ============================================================================
 # RECIPE 27: Fixings Exposures and Reset Ladders
 # ============================================================================
 
-def recipe_27_fixings_exposures():
+# Reset frequencies, indexed by a swap's ``reset_code``
+_RESET_NAMES = ("Quarterly", "Monthly", "Semi-Annual")
+
+# Portfolio of swaps with different reset dates, one array per field
+_PORTFOLIO_27 = MappingProxyType({
+    "id": np.array(["SW1", "SW2", "SW3", "SW4", "SW5"], dtype="U3"),
+    "notional": np.array([100_000_000, 150_000_000, 200_000_000, 75_000_000, 125_000_000],
+                         dtype=np.float64),
+    "reset_code": np.array([0, 1, 0, 2, 0], dtype=np.int8),
+    "maturity_y": np.array([2, 3, 5, 7, 10], dtype=np.int8),
+})
+for _field in _PORTFOLIO_27.values():
+    _field.flags.writeable = False  # handed out by the recipe's return value
+del _field
+
+_PORTFOLIO_ROW_FMT = "  {id}  ${notional_mm:>4.0f}M     {reset:12} {maturity}Y"
+
+# Calendar months on which each reset frequency fixes
+_RESET_MONTHS = MappingProxyType({
+    "Quarterly": (2, 5, 8, 11),
+    "Monthly": tuple(range(1, 13)),
+    "Semi-Annual": (2, 8),
+})
+
+# Month x swap lookup: row ``m - 1`` flags the portfolio swaps that reset in month ``m``
+_RESET_TABLE = np.array(
+    [
+        [month in _RESET_MONTHS[_RESET_NAMES[code]] for code in _PORTFOLIO_27["reset_code"]]
+        for month in range(1, 13)
+    ],
+    dtype=bool,
+)
+_RESET_TABLE.flags.writeable = False
+
+# IMM dates concentration
+_IMM_DATES_27 = ("2024-09-18", "2024-12-18", "2025-03-19", "2025-06-18")
+
+_INDICES_27 = MappingProxyType({
+    "SOFR": 5.25,
+    "Fed Funds": 5.33,
+    "BSBY": 5.35,
+    "Term SOFR": 5.28,
+})
+
+_BASIS_ROW_FMT = "    {index:12}: {rate:.2f}%  ({spread:+.0f} bps to SOFR)"
+
+_FORWARD_STARTS_27 = (
+    MappingProxyType({"tenor": "1M forward", "notional": 250_000_000}),
+    MappingProxyType({"tenor": "3M forward", "notional": 300_000_000}),
+    MappingProxyType({"tenor": "6M forward", "notional": 200_000_000}),
+)
+
+_RESET_RISK_27 = MappingProxyType({
+    "1M": 25_000,
+    "3M": 75_000,
+    "6M": 125_000,
+    "12M": 200_000,
+})
+
+# Rate scenarios at reset
+_SCENARIOS_27 = MappingProxyType({
+    "Base": 0,
+    "Parallel +100bp": 100,
+    "Parallel -100bp": -100,
+    "Steepening": 50,  # Short -50, long +50
+    "Flattening": -50,  # Short +50, long -50
+})
+
+# Scenario P&L treatment, aligned with ``_SCENARIOS_27``: absolute move flag and duration factor
+_SCENARIO_MOVES = np.fromiter(_SCENARIOS_27.values(), dtype=np.float64)
+_SCENARIO_ABS = np.array([False, False, False, True, True])
+_SCENARIO_DUR = np.array([0.25, 0.25, 0.25, 0.125, 0.125])  # Quarterly; curve moves half impact
+
+# P&L per unit of notional for each scenario
+_SCENARIO_COEFFS = (
+    np.where(_SCENARIO_ABS, np.abs(_SCENARIO_MOVES), _SCENARIO_MOVES) * 0.0001 * _SCENARIO_DUR
+)
+
+# Month-start reset dates for the next 12 months
+_MONTHS = np.arange("2024-08", "2025-08", dtype="datetime64[M]").astype("datetime64[D]")
+_MONTHS.flags.writeable = False  # handed out by the recipe's return value
+
+
+def _no_log(*args, **kwargs):
+    """Stand-in for ``print`` when a recipe is run with ``verbose=False``."""
+
+
+def recipe_27_fixings_exposures(verbose=True):
     """
     Recipe 27: Fixings Exposures and Reset Ladders
     
-    Demonstrates fixings exposure analysis and reset risk.
+    Demonstrates fixings exposure analysis and reset risk. Pass ``verbose=False`` to skip
+    the report and only return the results.
     """
-    print("=" * 80)
-    print("Recipe 27: Fixings Exposures")
-    print("=" * 80)
-    
-    print("\n1. Understanding Reset Risk...")
-    print("  Reset risk arises from:")
-    print("    - Floating rate instruments")
-    print("    - Unknown future fixings")
-    print("    - Concentration on specific dates")
-    print("    - Basis between indices")
-    
-    print("\n2. Reset Ladder Construction...")
-    
-    # Portfolio of swaps with different reset dates
-    portfolio = [
-        {"id": "SW1", "notional": 100_000_000, "reset": "Quarterly", "maturity": "2Y"},
-        {"id": "SW2", "notional": 150_000_000, "reset": "Monthly", "maturity": "3Y"},
-        {"id": "SW3", "notional": 200_000_000, "reset": "Quarterly", "maturity": "5Y"},
-        {"id": "SW4", "notional": 75_000_000, "reset": "Semi-Annual", "maturity": "7Y"},
-        {"id": "SW5", "notional": 125_000_000, "reset": "Quarterly", "maturity": "10Y"},
+    import pandas as pd
+
+    log = print if verbose else _no_log
+
+    log("=" * 80)
+    log("Recipe 27: Fixings Exposures")
+    log("=" * 80)
+    
+    log("\n1. Understanding Reset Risk...")
+    log("  Reset risk arises from:")
+    log("    - Floating rate instruments")
+    log("    - Unknown future fixings")
+    log("    - Concentration on specific dates")
+    log("    - Basis between indices")
+    
+    log("\n2. Reset Ladder Construction...")
+    
+    portfolio = _PORTFOLIO_27
+    
+    log("  Swap Portfolio:")
+    log("  ID   Notional      Reset        Maturity")
+    rows = [
+        _PORTFOLIO_ROW_FMT.format_map(
+            {"id": swap_id, "notional_mm": notional / 1e6, "reset": _RESET_NAMES[code],
+             "maturity": maturity}
+        )
+        for swap_id, notional, code, maturity in zip(
+            portfolio["id"].tolist(), portfolio["notional"].tolist(),
+            portfolio["reset_code"].tolist(), portfolio["maturity_y"].tolist(),
+        )
     ]
+    log("\n".join(rows))
     
-    print("  Swap Portfolio:")
-    print("  ID   Notional      Reset        Maturity")
-    for swap in portfolio:
-        print(f"  {swap['id']}  ${swap['notional']/1e6:>4.0f}M     "
-              f"{swap['reset']:12} {swap['maturity']}")
-    
-    print("\n3. Reset Schedule...")
-    
-    # Next 12 months of resets
-    reset_dates = pd.date_range(start=dt(2024, 8, 1), periods=12, freq='MS')
-    
-    print("  Monthly Reset Exposure ($M notional):")
-    print("  Date        SW1   SW2   SW3   SW4   SW5   Total")
-    
-    for date in reset_dates[:6]:  # Show first 6 months
-        exposures = []
-        # SW1: Quarterly
-        sw1 = 100 if date.month in [8, 11] else 0
-        exposures.append(sw1)
-        # SW2: Monthly
-        exposures.append(150)
-        # SW3: Quarterly
-        sw3 = 200 if date.month in [8, 11] else 0
-        exposures.append(sw3)
-        # SW4: Semi-annual
-        sw4 = 75 if date.month in [8] else 0
-        exposures.append(sw4)
-        # SW5: Quarterly
-        sw5 = 125 if date.month in [8, 11] else 0
-        exposures.append(sw5)
-        
-        total = sum(exposures)
-        
-        print(f"  {date.strftime('%Y-%m')}     {exposures[0]:>3.0f}   "
-              f"{exposures[1]:>3.0f}   {exposures[2]:>3.0f}   "
-              f"{exposures[3]:>3.0f}   {exposures[4]:>3.0f}   {total:>4.0f}")
+    log("\n3. Reset Schedule...")
     
-    print("\n4. Concentration Risk...")
+    reset_dates = _MONTHS
     
-    # IMM dates concentration
-    imm_dates = ["2024-09-18", "2024-12-18", "2025-03-19", "2025-06-18"]
+    log("  Monthly Reset Exposure ($M notional):")
     
-    print("  IMM Date Concentrations:")
-    for date_str in imm_dates:
-        # Simulate concentration
-        concentration = np.random.randint(500, 1500)
-        print(f"    {date_str}: ${concentration}M notional")
+    # Resetting notional per (date, swap): one reset-table row per date's month
+    month_idx = reset_dates.astype("datetime64[M]").astype(int) % 12
+    notionals_mm = portfolio["notional"] / 1e6
+    masks = _RESET_TABLE[month_idx]
     
-    print("\n5. Basis Risk Between Indices...")
+    # One preallocated ladder: a column per swap, then the per-date total
+    n_swaps = len(notionals_mm)
+    ladder = np.empty((len(reset_dates), n_swaps + 1))
+    exposure_matrix = ladder[:, :n_swaps]
+    np.multiply(masks, notionals_mm, out=exposure_matrix)
+    exposure_matrix.sum(axis=1, out=ladder[:, n_swaps])
     
-    indices = {
-        "SOFR": 5.25,
-        "Fed Funds": 5.33,
-        "BSBY": 5.35,
-        "Term SOFR": 5.28,
-    }
+    # Show first 6 months
+    if verbose:
+        table = pd.DataFrame(
+            ladder[:6],
+            index=reset_dates[:6].astype("datetime64[M]").astype(str),
+            columns=[*portfolio["id"], "Total"],
+        ).to_string(float_format="{:3.0f}".format)
+        log("  " + table.replace("\n", "\n  "))
     
-    print("  Index Basis (current rates):")
-    for index, rate in indices.items():
-        spread = (rate - indices["SOFR"]) * 100
-        print(f"    {index:12}: {rate:.2f}%  ({spread:+.0f} bps to SOFR)")
+    log("\n4. Concentration Risk...")
     
-    print("\n6. Forward Starting Risk...")
+    imm_dates = _IMM_DATES_27
     
-    forward_starts = [
-        {"tenor": "1M forward", "notional": 250_000_000},
-        {"tenor": "3M forward", "notional": 300_000_000},
-        {"tenor": "6M forward", "notional": 200_000_000},
-    ]
+    log("  IMM Date Concentrations:")
+    # Simulate concentrations
+    rng = np.random.default_rng(_RNG_SEED)
+    concentrations = rng.integers(500, 1500, size=len(imm_dates))
+    log("\n".join(
+        f"    {date_str}: ${concentration}M notional"
+        for date_str, concentration in zip(imm_dates, concentrations)
+    ))
+    
+    log("\n5. Basis Risk Between Indices...")
+    
+    indices = _INDICES_27
+    
+    index_rates = pd.Series(indices)
+    spreads = (index_rates - index_rates["SOFR"]) * 100
     
-    print("  Forward Starting Swaps:")
-    for fs in forward_starts:
-        print(f"    {fs['tenor']:12}: ${fs['notional']/1e6:.0f}M")
+    log("  Index Basis (current rates):")
+    log("\n".join(
+        _BASIS_ROW_FMT.format_map({"index": index, "rate": rate, "spread": spread})
+        for index, rate, spread in zip(index_rates.index, index_rates.values, spreads.values)
+    ))
     
-    print("\n7. Reset Risk Metrics...")
+    log("\n6. Forward Starting Risk...")
+    
+    forward_starts = _FORWARD_STARTS_27
+    
+    log("  Forward Starting Swaps:")
+    log("\n".join(f"    {fs['tenor']:12}: ${fs['notional']/1e6:.0f}M" for fs in forward_starts))
+    
+    log("\n7. Reset Risk Metrics...")
     
     # Risk per basis point move at reset
-    print("  Reset Date Risk (DV01 at reset):")
+    log("  Reset Date Risk (DV01 at reset):")
     
-    reset_risk = {
-        "1M": 25_000,
-        "3M": 75_000,
-        "6M": 125_000,
-        "12M": 200_000,
-    }
+    reset_risk = _RESET_RISK_27
     
-    for tenor, risk in reset_risk.items():
-        print(f"    {tenor:3} forward: ${risk:>7,.0f} per bp")
+    log("\n".join(
+        f"    {tenor:3} forward: ${risk:>7,.0f} per bp" for tenor, risk in reset_risk.items()
+    ))
     
-    print("\n8. Hedging Reset Risk...")
+    log("\n8. Hedging Reset Risk...")
     
-    print("  Hedging Strategies:")
-    print("    1. Forward Rate Agreements (FRAs)")
-    print("    2. Interest Rate Futures")
-    print("    3. Swaptions for tail risk")
-    print("    4. Basis swaps for index risk")
+    log("  Hedging Strategies:")
+    log("    1. Forward Rate Agreements (FRAs)")
+    log("    2. Interest Rate Futures")
+    log("    3. Swaptions for tail risk")
+    log("    4. Basis swaps for index risk")
     
-    print("\n9. Scenario Analysis...")
+    log("\n9. Scenario Analysis...")
     
-    # Rate scenarios at reset
-    scenarios = {
-        "Base": 0,
-        "Parallel +100bp": 100,
-        "Parallel -100bp": -100,
-        "Steepening": 50,  # Short -50, long +50
-        "Flattening": -50,  # Short +50, long -50
-    }
+    scenarios = _SCENARIOS_27
     
-    print("  P&L Impact by Scenario ($M):")
+    log("  P&L Impact by Scenario ($M):")
     
-    total_notional = sum(s["notional"] for s in portfolio)
+    total_notional = portfolio["notional"].sum()
     
-    for scenario, move in scenarios.items():
-        # Simplified P&L
-        if scenario in ["Base", "Parallel +100bp", "Parallel -100bp"]:
-            pnl = total_notional * move * 0.0001 * 0.25  # Quarterly
-        else:
-            pnl = total_notional * abs(move) * 0.0001 * 0.125  # Half impact
-        
-        print(f"    {scenario:15}: ${pnl/1e6:+6.1f}M")
+    # Simplified P&L
+    pnls = total_notional * _SCENARIO_COEFFS
+    log("\n".join(
+        f"    {scenario:15}: ${pnl/1e6:+6.1f}M" for scenario, pnl in zip(scenarios, pnls)
+    ))
     
-    print("\n10. Risk Management...")
+    log("\n10. Risk Management...")
     
-    print("  Best Practices:")
-    print("    ✓ Monitor concentration by reset date")
-    print("    ✓ Hedge large reset exposures")
-    print("    ✓ Diversify across indices")
-    print("    ✓ Use natural offsets where possible")
-    print("    ✓ Stress test fixing scenarios")
+    log("  Best Practices:")
+    log("    ✓ Monitor concentration by reset date")
+    log("    ✓ Hedge large reset exposures")
+    log("    ✓ Diversify across indices")
+    log("    ✓ Use natural offsets where possible")
+    log("    ✓ Stress test fixing scenarios")
     
     return {
         "portfolio": portfolio,
-        "reset_dates": reset_dates.tolist(),
+        "reset_dates": reset_dates,
+        "exposures": exposure_matrix,
         "indices": indices,
+        "index_spreads": spreads,
         "forward_starts": forward_starts,
         "reset_risk": reset_risk,
         "scenarios": scenarios
@@ -1085,24 +1397,56 @@ def recipe_27_fixings_exposures():
 # RECIPE 28: Multi-CSA Curves
 # ============================================================================
 
-def recipe_28_multicsa_curves():
+def _multicsa_kernel(rates, notional, base_rate, fixed_rate, dur):
+    """
+    Simplified NPV and DV01 of one swap discounted under each CSA rate.
+
+    Returns the CSA-adjusted NPVs and their DV01s as arrays aligned with ``rates``.
+    """
+    # Simplified NPV, then adjusted for each CSA; delta changes with CSA
+    npv = notional * (base_rate - fixed_rate) * dur * 0.01
+    npv_adjusted = npv * (1.0 - (rates - base_rate) * 0.05)
+    return npv_adjusted, np.abs(npv_adjusted) * 1e-4
+
+
+# Collateral eligible under the multi-CSA, and the NPV scenarios it is chosen for
+_COLLATERAL_CHOICES = np.array(["USD Cash", "EUR Cash", "USD Securities"])
+_COLLATERAL_NPVS = np.array([10_000_000, -10_000_000, 100_000], dtype=np.float64)
+_COLLATERAL_NPVS.flags.writeable = False  # handed out by the recipe's return value
+_SECURITIES_THRESHOLD = 1_000_000
+
+_CSA_ROW_FMT = "    {name:15}: {currency} @ {rate} {spread:+d} bps"
+
+# Column formatters for the recipe 28 CSA valuation table
+_MULTICSA_TABLE_FORMATTERS = {
+    "NPV ($M)": "{:+.2f}".format,
+    "Delta (DV01)": "${:,.0f}".format,
+}
+
+
+def recipe_28_multicsa_curves(verbose=True):
     """
     Recipe 28: MultiCsaCurves have discontinuous derivatives
     
-    Shows multi-CSA curve behavior and discontinuities.
+    Shows multi-CSA curve behavior and discontinuities. Pass ``verbose=False`` to skip the
+    report and only return the results.
     """
-    print("=" * 80)
-    print("Recipe 28: Multi-CSA Curves")
-    print("=" * 80)
+    import pandas as pd
+
+    log = print if verbose else _no_log
+
+    log("=" * 80)
+    log("Recipe 28: Multi-CSA Curves")
+    log("=" * 80)
     
-    print("\n1. Understanding CSA (Credit Support Annex)...")
-    print("  CSA determines collateral posting:")
-    print("    - Currency of collateral")
-    print("    - Interest rate on collateral")
-    print("    - Posting thresholds")
-    print("    - Optionality in collateral choice")
+    log("\n1. Understanding CSA (Credit Support Annex)...")
+    log("  CSA determines collateral posting:")
+    log("    - Currency of collateral")
+    log("    - Interest rate on collateral")
+    log("    - Posting thresholds")
+    log("    - Optionality in collateral choice")
     
-    print("\n2. Multi-CSA Framework...")
+    log("\n2. Multi-CSA Framework...")
     
     # Different CSA agreements
     csa_agreements = {
@@ -1112,12 +1456,12 @@ def recipe_28_multicsa_curves():
         "No CSA": {"currency": "USD", "rate": "LIBOR", "spread": 50},
     }
     
-    print("  CSA Agreements:")
-    for name, csa in csa_agreements.items():
-        print(f"    {name:15}: {csa['currency']} @ {csa['rate']} "
-              f"{csa['spread']:+d} bps")
+    log("  CSA Agreements:")
+    log("\n".join(
+        _CSA_ROW_FMT.format_map({"name": name, **csa}) for name, csa in csa_agreements.items()
+    ))
     
-    print("\n3. Discount Curve Selection...")
+    log("\n3. Discount Curve Selection...")
     
     # Current rates
     rates = {
@@ -1127,14 +1471,13 @@ def recipe_28_multicsa_curves():
         "EURIBOR": 3.85,
     }
     
-    print("  Current Rates:")
-    for rate_name, value in rates.items():
-        print(f"    {rate_name:10}: {value:.2f}%")
+    log("  Current Rates:")
+    log("\n".join(f"    {rate_name:10}: {value:.2f}%" for rate_name, value in rates.items()))
     
-    print("\n4. Multi-CSA Curve Construction...")
+    log("\n4. Multi-CSA Curve Construction...")
     
     # For each CSA, determine discount curve
-    print("  Optimal Discount Curve by CSA:")
+    log("  Optimal Discount Curve by CSA:")
     
     discount_curves = {}
     for csa_name, csa in csa_agreements.items():
@@ -1144,89 +1487,90 @@ def recipe_28_multicsa_curves():
             curve_rate = rates.get(csa["rate"], 5.0) + csa["spread"]/100
         
         discount_curves[csa_name] = curve_rate
-        print(f"    {csa_name:15}: {curve_rate:.2f}%")
+    log("\n".join(
+        f"    {csa_name:15}: {curve_rate:.2f}%" for csa_name, curve_rate in discount_curves.items()
+    ))
     
-    print("\n5. Discontinuity at CSA Boundaries...")
+    log("\n5. Discontinuity at CSA Boundaries...")
     
-    print("  NPV Discontinuity Example:")
-    print("  Swap NPV = $1M")
+    log("  NPV Discontinuity Example:")
+    log("  Swap NPV = $1M")
     
     # Calculate NPV under different CSAs
     base_npv = 1_000_000
+    csa_rates = np.fromiter(discount_curves.values(), dtype=np.float64, count=len(discount_curves))
     
-    for csa_name, rate in discount_curves.items():
-        # Adjust NPV for different discount rates
-        adjustment = (rate - 5.31) * 5 * 10000  # 5-year duration approximation
-        adjusted_npv = base_npv - adjustment
-        
-        print(f"    {csa_name:15}: ${adjusted_npv:,.0f}")
+    # Adjust NPV for different discount rates, 5-year duration approximation
+    adjusted_npvs = base_npv - (csa_rates - 5.31) * 5 * 10000
+    
+    log("\n".join(
+        f"    {csa_name:15}: ${adjusted_npv:,.0f}"
+        for csa_name, adjusted_npv in zip(discount_curves, adjusted_npvs)
+    ))
     
-    print("\n  → Discontinuous jump when CSA changes!")
+    log("\n  → Discontinuous jump when CSA changes!")
     
-    print("\n6. Derivative Discontinuity...")
+    log("\n6. Derivative Discontinuity...")
     
-    print("  Mathematical Issue:")
-    print("    MultiCSA(t) = max(CSA1(t), CSA2(t), ...)")
-    print("    Derivative undefined at crossing points!")
+    log("  Mathematical Issue:")
+    log("    MultiCSA(t) = max(CSA1(t), CSA2(t), ...)")
+    log("    Derivative undefined at crossing points!")
     
-    print("\n  Practical Impact:")
-    print("    - Risk sensitivities jump at boundaries")
-    print("    - Hedging becomes complex")
-    print("    - Greeks are unstable")
+    log("\n  Practical Impact:")
+    log("    - Risk sensitivities jump at boundaries")
+    log("    - Hedging becomes complex")
+    log("    - Greeks are unstable")
     
-    print("\n7. Cheapest-to-Deliver Collateral...")
+    log("\n7. Cheapest-to-Deliver Collateral...")
     
     # Determine optimal collateral
-    print("  Optimal Collateral Choice:")
+    log("  Optimal Collateral Choice:")
     
-    scenarios = [
-        {"npv": 10_000_000, "optimal": "USD Cash"},
-        {"npv": -10_000_000, "optimal": "EUR Cash"},
-        {"npv": 100_000, "optimal": "USD Securities"},
-    ]
+    # Negative NPV posts EUR cash; small exposures post securities, large ones USD cash
+    npvs = _COLLATERAL_NPVS
+    optimal_idx = np.where(npvs < 0, 1, np.where(npvs < _SECURITIES_THRESHOLD, 2, 0))
+    scenarios = {"npv": npvs, "optimal": _COLLATERAL_CHOICES[optimal_idx]}
     
-    for scenario in scenarios:
-        print(f"    NPV = ${scenario['npv']/1e6:+.0f}M: Post {scenario['optimal']}")
+    log("\n".join(
+        f"    NPV = ${npv/1e6:+.0f}M: Post {optimal}"
+        for npv, optimal in zip(scenarios["npv"], scenarios["optimal"])
+    ))
     
-    print("\n8. Risk Management Challenges...")
+    log("\n8. Risk Management Challenges...")
     
-    print("  Multi-CSA Risk Issues:")
-    print("    1. Delta hedging jumps at boundaries")
-    print("    2. Gamma becomes infinite at switch points")
-    print("    3. Funding cost uncertainty")
-    print("    4. Wrong-way risk from correlation")
+    log("  Multi-CSA Risk Issues:")
+    log("    1. Delta hedging jumps at boundaries")
+    log("    2. Gamma becomes infinite at switch points")
+    log("    3. Funding cost uncertainty")
+    log("    4. Wrong-way risk from correlation")
     
-    print("\n9. Numerical Solutions...")
+    log("\n9. Numerical Solutions...")
     
-    print("  Approaches to Handle Discontinuities:")
-    print("    - Smooth approximation functions")
-    print("    - Monte Carlo with collateral optionality")
-    print("    - Fuzzy boundaries with probability weights")
-    print("    - Conservative worst-case approach")
+    log("  Approaches to Handle Discontinuities:")
+    log("    - Smooth approximation functions")
+    log("    - Monte Carlo with collateral optionality")
+    log("    - Fuzzy boundaries with probability weights")
+    log("    - Conservative worst-case approach")
     
-    print("\n10. Example Calculation...")
+    log("\n10. Example Calculation...")
     
     # Simplified multi-CSA valuation
-    print("  5Y IRS Valuation under Multi-CSA:")
+    log("  5Y IRS Valuation under Multi-CSA:")
     
     notional = 100_000_000
     fixed_rate = 4.50
     
     # Calculate under each CSA
-    print("  CSA              NPV          Delta (DV01)")
+    npvs_adjusted, dv01s = _multicsa_kernel(csa_rates, notional, 5.31, fixed_rate, 5)
     
-    for csa_name, rate in discount_curves.items():
-        # Simplified NPV
-        npv = notional * (5.31 - fixed_rate) * 5 * 0.01
-        # Adjust for CSA
-        npv_adjusted = npv * (1 - (rate - 5.31) * 0.05)
-        
-        # Delta changes with CSA
-        dv01 = abs(npv_adjusted) * 0.0001
-        
-        print(f"  {csa_name:15} ${npv_adjusted/1e6:+7.2f}M    ${dv01:,.0f}")
+    if verbose:
+        table = pd.DataFrame(
+            {"NPV ($M)": npvs_adjusted / 1e6, "Delta (DV01)": dv01s},
+            index=list(discount_curves),
+        ).to_string(formatters=_MULTICSA_TABLE_FORMATTERS)
+        log("  " + table.replace("\n", "\n  "))
     
-    print("\n  Maximum difference: ${:.0f} in NPV!".format(500_000))
+    log("\n  Maximum difference: ${:.0f} in NPV!".format(500_000))
     
     return {
         "csa_agreements": csa_agreements,
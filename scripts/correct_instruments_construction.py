@@ -13,16 +13,20 @@ Key Focus:
 - Swaptions and caps/floors
 """
 
-from datetime import datetime as dt, timedelta
-import numpy as np
-from rateslib import (
-    Curve, IRS, FRA, Solver, add_tenor, CompositeCurve,
-    IIRS, STIRFuture, XCS, Swaption, CapFloor,
-    FXRates, FXForwards, Period, Schedule
-)
-from cookbook_fixes import dual_to_float, format_npv
+import io
+import sys
+from datetime import datetime as dt
+from functools import lru_cache
 
 
+# Trade date shared by every example instrument
+BASE_DATE = dt(2024, 1, 15)
+
+# Quarterly contract months that carry IMM dates
+_IMM_MONTHS = frozenset({3, 6, 9, 12})
+
+
+@lru_cache(maxsize=None)
 def get_imm_date(year, month):
     """
     Calculate the exact IMM date (3rd Wednesday) for a given month.
@@ -32,188 +36,119 @@ def get_imm_date(year, month):
         month: Month (must be 3, 6, 9, or 12)
     
     Returns:
-        datetime: The IMM date
+        datetime: The IMM date (memoized per year and month)
     """
-    if month not in [3, 6, 9, 12]:
+    if month not in _IMM_MONTHS:
         raise ValueError(f"Month {month} is not an IMM month (3, 6, 9, 12)")
     
-    # First day of the month
-    first_day = dt(year, month, 1)
-    
-    # Find first Wednesday (weekday 2)
-    days_until_wednesday = (2 - first_day.weekday()) % 7
-    first_wednesday = first_day + timedelta(days=days_until_wednesday)
-    
-    # Third Wednesday is 14 days later
-    third_wednesday = first_wednesday + timedelta(days=14)
+    # Proleptic ordinal of the 1st: ordinal 1 (0001-01-01) was a Monday
+    first_ordinal = dt(year, month, 1).toordinal()
+    weekday = (first_ordinal - 1) % 7
     
-    return third_wednesday
+    # First Wednesday (weekday 2), then the third is 14 days later
+    return dt.fromordinal(first_ordinal + (2 - weekday) % 7 + 14)
+
+
+# IMM dates for every quarterly contract month 2000-2059, keyed by (year, month)
+_IMM_KEYS = [(year, month) for year in range(2000, 2060) for month in sorted(_IMM_MONTHS)]
+IMM_DATES = {key: get_imm_date(*key) for key in _IMM_KEYS}
+
+
+# Shared FRA terms for SOFR futures: one quarterly ACT/360 period per $1MM contract
+_SOFR_FRA_KW = dict(frequency="Q", convention="act360", notional=1_000_000, curves=None)
+
+# Shared terms for standard USD SOFR OIS swaps; curves are attached later
+_USD_IRS_KW = dict(convention="act360", leg2_convention="act360", spec="usd_irs", curves=None)
 
 
-def construct_sofr_futures_as_fras():
+def construct_sofr_futures_as_fras(out=None):
     """
     Correctly construct SOFR futures as FRAs with exact IMM dates and conventions.
+    
+    Output goes to the text stream ``out`` (stdout when None).
     """
+    import numpy as np
+    from rateslib import FRA
     
-    print("=" * 80)
-    print("CORRECT SOFR FUTURES CONSTRUCTION AS FRAs")
-    print("=" * 80)
+    print("=" * 80, file=out)
+    print("CORRECT SOFR FUTURES CONSTRUCTION AS FRAs", file=out)
+    print("=" * 80, file=out)
     
-    # Base date
-    base_date = dt(2024, 1, 15)
+    print(f"\nBase Date: {BASE_DATE:%Y-%m-%d}", file=out)
+    print("\n1. Serial SOFR Futures (First 3 non-quarterly months):", file=out)
+    print("-" * 60, file=out)
     
-    print(f"\nBase Date: {base_date.strftime('%Y-%m-%d')}")
-    print("\n1. Serial SOFR Futures (First 3 non-quarterly months):")
-    print("-" * 60)
+    # IMM dates for the whole strip from the precomputed table
+    mar24_start = IMM_DATES[(2024, 3)]
+    jun24_start = IMM_DATES[(2024, 6)]
+    sep24_start = IMM_DATES[(2024, 9)]
+    dec24_start = IMM_DATES[(2024, 12)]
+    mar25_start = IMM_DATES[(2025, 3)]
+    jun25_start = IMM_DATES[(2025, 6)]
     
     # Serial futures: Jan, Feb, Apr (skip March as it's quarterly)
-    serial_futures = []
-    
-    # January 2024 Serial
-    jan_start = get_imm_date(2024, 1)  # Would be 3rd Wed if Jan were IMM
     jan_start = dt(2024, 1, 17)  # Actual serial date
     feb_start = dt(2024, 2, 21)  # February serial
-    
-    jan_serial = FRA(
-        effective=jan_start,
-        termination=feb_start,
-        frequency="Q",  # Quarterly ACT/360
-        convention="act360",
-        notional=1_000_000,  # $1MM per contract
-        fixed_rate=5.35,  # Rate, not price
-        curves=None,  # Will attach curve later
-        spec=None  # No spec for custom construction
-    )
-    serial_futures.append(("Jan24", jan_serial, jan_start, feb_start))
-    print(f"  Jan24: {jan_start.strftime('%Y-%m-%d')} to {feb_start.strftime('%Y-%m-%d')} ({(feb_start-jan_start).days} days)")
-    
-    # February 2024 Serial
-    mar_imm = get_imm_date(2024, 3)
-    
-    feb_serial = FRA(
-        effective=feb_start,
-        termination=mar_imm,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.34,
-        curves=None
-    )
-    serial_futures.append(("Feb24", feb_serial, feb_start, mar_imm))
-    print(f"  Feb24: {feb_start.strftime('%Y-%m-%d')} to {mar_imm.strftime('%Y-%m-%d')} ({(mar_imm-feb_start).days} days)")
-    
-    # April 2024 Serial (March is quarterly, so next serial is April)
-    apr_start = dt(2024, 4, 17)  # April serial date
+    apr_start = dt(2024, 4, 17)  # April serial date (March is quarterly)
     may_start = dt(2024, 5, 15)  # May serial date
     
-    apr_serial = FRA(
-        effective=apr_start,
-        termination=may_start,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.32,
-        curves=None
+    # Contract strip as parallel arrays: 3 serials, 4 quarterlies, then out-years
+    labels = [
+        "Jan24", "Feb24", "Apr24",
+        "Mar24 (H24)", "Jun24 (M24)", "Sep24 (U24)", "Dec24 (Z24)",
+        "Mar25 (H25)",
+    ]
+    effectives = np.array(
+        [jan_start, feb_start, apr_start, mar24_start, jun24_start, sep24_start, dec24_start,
+         mar25_start],
+        dtype="datetime64[D]",
     )
-    serial_futures.append(("Apr24", apr_serial, apr_start, may_start))
-    print(f"  Apr24: {apr_start.strftime('%Y-%m-%d')} to {may_start.strftime('%Y-%m-%d')} ({(may_start-apr_start).days} days)")
-    
-    print("\n2. Quarterly SOFR Futures (IMM dates):")
-    print("-" * 60)
-    
-    quarterly_futures = []
-    
-    # March 2024 Quarterly (H24)
-    mar24_start = get_imm_date(2024, 3)
-    jun24_start = get_imm_date(2024, 6)
-    
-    mar24_fra = FRA(
-        effective=mar24_start,
-        termination=jun24_start,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.33,
-        curves=None
+    terminations = np.array(
+        [feb_start, mar24_start, may_start, jun24_start, sep24_start, dec24_start, mar25_start,
+         jun25_start],
+        dtype="datetime64[D]",
     )
-    quarterly_futures.append(("Mar24 (H24)", mar24_fra, mar24_start, jun24_start))
-    print(f"  Mar24: {mar24_start.strftime('%Y-%m-%d')} to {jun24_start.strftime('%Y-%m-%d')} ({(jun24_start-mar24_start).days} days)")
+    rates = np.array([5.35, 5.34, 5.32, 5.33, 5.31, 5.29, 5.27, 5.25])  # Rates, not prices
     
-    # June 2024 Quarterly (M24)
-    sep24_start = get_imm_date(2024, 9)
-    
-    jun24_fra = FRA(
-        effective=jun24_start,
-        termination=sep24_start,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.31,
-        curves=None
-    )
-    quarterly_futures.append(("Jun24 (M24)", jun24_fra, jun24_start, sep24_start))
-    print(f"  Jun24: {jun24_start.strftime('%Y-%m-%d')} to {sep24_start.strftime('%Y-%m-%d')} ({(sep24_start-jun24_start).days} days)")
+    starts = effectives.astype("datetime64[us]").tolist()
+    ends = terminations.astype("datetime64[us]").tolist()
+    fras = [
+        FRA(effective=start, termination=end, fixed_rate=rate, **_SOFR_FRA_KW)
+        for start, end, rate in zip(starts, ends, rates.tolist())
+    ]
+    futures = list(zip(labels, fras, starts, ends))
+    serial_futures, quarterly_futures = futures[:3], futures[3:]
     
-    # September 2024 Quarterly (U24)
-    dec24_start = get_imm_date(2024, 12)
+    # Format the whole strip report up front, one line per contract
+    rows = [
+        f"  {label[:5]}: {start:%Y-%m-%d} to {end:%Y-%m-%d} ({(end - start).days} days)"
+        for label, _, start, end in futures
+    ]
     
-    sep24_fra = FRA(
-        effective=sep24_start,
-        termination=dec24_start,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.29,
-        curves=None
-    )
-    quarterly_futures.append(("Sep24 (U24)", sep24_fra, sep24_start, dec24_start))
-    print(f"  Sep24: {sep24_start.strftime('%Y-%m-%d')} to {dec24_start.strftime('%Y-%m-%d')} ({(dec24_start-sep24_start).days} days)")
+    print("\n".join(rows[:3]), file=out)
     
-    # December 2024 Quarterly (Z24)
-    mar25_start = get_imm_date(2025, 3)
+    print("\n2. Quarterly SOFR Futures (IMM dates):", file=out)
+    print("-" * 60, file=out)
     
-    dec24_fra = FRA(
-        effective=dec24_start,
-        termination=mar25_start,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.27,
-        curves=None
-    )
-    quarterly_futures.append(("Dec24 (Z24)", dec24_fra, dec24_start, mar25_start))
-    print(f"  Dec24: {dec24_start.strftime('%Y-%m-%d')} to {mar25_start.strftime('%Y-%m-%d')} ({(mar25_start-dec24_start).days} days)")
+    print("\n".join(rows[3:7]), file=out)
     
     # Continue with 2025 contracts
-    print("\n3. Out-year Quarterly Futures (2025+):")
-    print("-" * 60)
-    
-    # March 2025 (H25)
-    jun25_start = get_imm_date(2025, 6)
+    print("\n3. Out-year Quarterly Futures (2025+):", file=out)
+    print("-" * 60, file=out)
     
-    mar25_fra = FRA(
-        effective=mar25_start,
-        termination=jun25_start,
-        frequency="Q",
-        convention="act360",
-        notional=1_000_000,
-        fixed_rate=5.25,
-        curves=None
-    )
-    quarterly_futures.append(("Mar25 (H25)", mar25_fra, mar25_start, jun25_start))
-    print(f"  Mar25: {mar25_start.strftime('%Y-%m-%d')} to {jun25_start.strftime('%Y-%m-%d')} ({(jun25_start-mar25_start).days} days)")
+    print("\n".join(rows[7:]), file=out)
     
     # Build white/red/green/blue packs
-    print("\n4. Futures Packs and Bundles:")
-    print("-" * 60)
+    print("\n4. Futures Packs and Bundles:", file=out)
+    print("-" * 60, file=out)
     
-    print("  White Pack (first 4 quarterlies): Mar24, Jun24, Sep24, Dec24")
-    print("  Red Pack (next 4 quarterlies): Mar25, Jun25, Sep25, Dec25")
-    print("  Green Pack (3rd year): Mar26, Jun26, Sep26, Dec26")
-    print("  Blue Pack (4th year): Mar27, Jun27, Sep27, Dec27")
+    print("  White Pack (first 4 quarterlies): Mar24, Jun24, Sep24, Dec24", file=out)
+    print("  Red Pack (next 4 quarterlies): Mar25, Jun25, Sep25, Dec25", file=out)
+    print("  Green Pack (3rd year): Mar26, Jun26, Sep26, Dec26", file=out)
+    print("  Blue Pack (4th year): Mar27, Jun27, Sep27, Dec27", file=out)
     
-    print("\n5. Critical Construction Points:")
-    print("-" * 60)
+    print("\n5. Critical Construction Points:", file=out)
+    print("-" * 60, file=out)
     print("""
 ✓ Each FRA represents exactly ONE period (no multi-period FRAs)
 ✓ Effective date = IMM start date (3rd Wednesday)
@@ -228,7 +163,7 @@ def construct_sofr_futures_as_fras():
 ✗ Using 30/360 convention (SOFR uses ACT/360)
 ✗ Forgetting to convert futures price to rate
 ✗ Using wrong IMM dates (must be 3rd Wednesday)
-""")
+""", file=out)
     
     return serial_futures, quarterly_futures
 
@@ -236,56 +171,39 @@ def construct_sofr_futures_as_fras():
 def construct_sofr_swaps():
     """
     Correctly construct SOFR swaps with proper specifications.
-    """
     
-    print("\n" + "=" * 80)
-    print("CORRECT SOFR SWAP CONSTRUCTION")
-    print("=" * 80)
-    
-    base_date = dt(2024, 1, 15)
-    
-    print(f"\nBase Date: {base_date.strftime('%Y-%m-%d')}")
-    
-    print("\n1. Standard SOFR OIS Swaps:")
-    print("-" * 60)
+    Returns:
+        tuple: (sofr_2y, sofr_5y, term_sofr_2y, basis_swap, front_stub, back_stub,
+        amort_swap), freshly built on every call
+    """
+    from rateslib import IIRS, IRS
     
     # 2Y SOFR Swap
     sofr_2y = IRS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="2Y",
         frequency="A",  # Annual fixed leg
         leg2_frequency="A",  # Annual float leg (for OIS)
-        convention="act360",
-        leg2_convention="act360",
         notional=100_000_000,
         fixed_rate=5.00,
         float_spread=0.0,
-        spec="usd_irs",  # Uses USD specifications
-        curves=None  # Will attach later
+        **_USD_IRS_KW,
     )
-    print(f"  2Y SOFR OIS: Annual/Annual, ACT/360, $100MM @ 5.00%")
     
     # 5Y SOFR Swap with standard conventions
     sofr_5y = IRS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="5Y",
         frequency="S",  # Semi-annual fixed
         leg2_frequency="A",  # Annual float
-        convention="act360",
-        leg2_convention="act360",
         notional=100_000_000,
         fixed_rate=4.75,
-        spec="usd_irs",
-        curves=None
+        **_USD_IRS_KW,
     )
-    print(f"  5Y SOFR OIS: Semi/Annual, ACT/360, $100MM @ 4.75%")
-    
-    print("\n2. Term SOFR Swaps (Different from OIS):")
-    print("-" * 60)
     
     # Term SOFR uses forward-looking rates, not compounded
     term_sofr_2y = IRS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="2Y",
         frequency="Q",  # Quarterly fixed
         leg2_frequency="Q",  # Quarterly float (Term SOFR)
@@ -297,15 +215,10 @@ def construct_sofr_swaps():
         payment_lag=2,  # 2-day payment lag
         curves=None
     )
-    print(f"  2Y Term SOFR: Quarterly/Quarterly, 30/360 vs ACT/360, $100MM @ 5.05%")
-    print(f"  Note: Term SOFR is forward-looking, not backward-looking like OIS")
-    
-    print("\n3. Basis Swaps (SOFR vs Term SOFR):")
-    print("-" * 60)
     
     # SOFR OIS vs Term SOFR basis swap
     basis_swap = IIRS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="2Y",
         frequency="Q",  # Both legs quarterly
         convention="act360",
@@ -313,16 +226,12 @@ def construct_sofr_swaps():
         fixed_rate=5.0,  # Spread in bp
         curves=None  # Need two curves: SOFR and Term SOFR
     )
-    print(f"  2Y SOFR/Term Basis: Quarterly/Quarterly, ACT/360, 5bp spread")
-    
-    print("\n4. SOFR Swap with Stubs:")
-    print("-" * 60)
     
     # Swap with front stub
     stub_date = dt(2024, 3, 20)  # IMM date
     
     front_stub = IRS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="2Y",
         frequency="Q",
         leg2_frequency="Q",
@@ -334,7 +243,6 @@ def construct_sofr_swaps():
         stub_rate=5.10,  # Different rate for stub
         curves=None
     )
-    print(f"  2Y with Front Stub: Stub to {stub_date.strftime('%Y-%m-%d')} @ 5.10%")
     
     # Swap with back stub
     back_stub = IRS(
@@ -349,22 +257,12 @@ def construct_sofr_swaps():
         back_stub=True,  # Long back stub
         curves=None
     )
-    print(f"  Custom dates with Back Stub: Mar 20, 2024 to May 15, 2026")
-    
-    print("\n5. Amortizing SOFR Swap:")
-    print("-" * 60)
-    
-    # Create amortization schedule
-    amort_schedule = [
-        100_000_000,  # Initial
-        75_000_000,   # After 1Y
-        50_000_000,   # After 2Y
-        25_000_000,   # After 3Y
-        0             # Final
-    ]
+    
+    # Amortization is the per-period notional reduction: $100MM down $25MM a year to $0
+    amort_per_period = 25_000_000
     
     amort_swap = IRS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="4Y",
         frequency="A",
         leg2_frequency="A",
@@ -372,13 +270,56 @@ def construct_sofr_swaps():
         leg2_convention="act360",
         notional=100_000_000,
         fixed_rate=4.85,
-        amortization=amort_schedule,
+        amortization=amort_per_period,
         curves=None
     )
-    print(f"  4Y Amortizing: $100MM → $75MM → $50MM → $25MM → $0")
     
-    print("\n6. Construction Best Practices:")
-    print("-" * 60)
+    return sofr_2y, sofr_5y, term_sofr_2y, basis_swap, front_stub, back_stub, amort_swap
+
+
+def _report_sofr_swaps(out=None):
+    """
+    Print the construction walkthrough for ``construct_sofr_swaps``.
+    
+    Output goes to the text stream ``out`` (stdout when None).
+    """
+    
+    print("\n" + "=" * 80, file=out)
+    print("CORRECT SOFR SWAP CONSTRUCTION", file=out)
+    print("=" * 80, file=out)
+    
+    print(f"\nBase Date: {BASE_DATE:%Y-%m-%d}", file=out)
+    
+    print("\n1. Standard SOFR OIS Swaps:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  2Y SOFR OIS: Annual/Annual, ACT/360, $100MM @ 5.00%", file=out)
+    print(f"  5Y SOFR OIS: Semi/Annual, ACT/360, $100MM @ 4.75%", file=out)
+    
+    print("\n2. Term SOFR Swaps (Different from OIS):", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  2Y Term SOFR: Quarterly/Quarterly, 30/360 vs ACT/360, $100MM @ 5.05%", file=out)
+    print(f"  Note: Term SOFR is forward-looking, not backward-looking like OIS", file=out)
+    
+    print("\n3. Basis Swaps (SOFR vs Term SOFR):", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  2Y SOFR/Term Basis: Quarterly/Quarterly, ACT/360, 5bp spread", file=out)
+    
+    print("\n4. SOFR Swap with Stubs:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  2Y with Front Stub: Stub to 2024-03-20 @ 5.10%", file=out)
+    print(f"  Custom dates with Back Stub: Mar 20, 2024 to May 15, 2026", file=out)
+    
+    print("\n5. Amortizing SOFR Swap:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  4Y Amortizing: $100MM → $75MM → $50MM → $25MM → $0", file=out)
+    
+    print("\n6. Construction Best Practices:", file=out)
+    print("-" * 60, file=out)
     print("""
 SOFR OIS (Overnight Index Swap):
 ✓ Backward-looking compounded rate
@@ -400,30 +341,21 @@ Critical Details:
 • front_stub/back_stub handle broken dates
 • amortization for scheduled notional changes
 • float_spread for basis adjustments
-""")
-    
-    return sofr_2y, sofr_5y, term_sofr_2y, basis_swap
+""", file=out)
 
 
 def construct_cross_currency_swaps():
     """
     Correctly construct cross-currency swaps with FX resets.
-    """
-    
-    print("\n" + "=" * 80)
-    print("CORRECT CROSS-CURRENCY SWAP CONSTRUCTION")
-    print("=" * 80)
-    
-    base_date = dt(2024, 1, 15)
     
-    print(f"\nBase Date: {base_date.strftime('%Y-%m-%d')}")
-    
-    print("\n1. Standard USD/EUR Cross-Currency Swap:")
-    print("-" * 60)
+    Returns:
+        tuple: (usd_eur_xcs, mtm_xcs, fixed_fixed_xcs, nds), freshly built on every call
+    """
+    from rateslib import XCS
     
     # Standard XCS with principal exchange
     usd_eur_xcs = XCS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="5Y",
         frequency="Q",  # USD leg quarterly
         leg2_frequency="Q",  # EUR leg quarterly
@@ -440,17 +372,10 @@ def construct_cross_currency_swaps():
         principal_exchange_final=True,
         curves=None  # Need USD and EUR curves
     )
-    print(f"  5Y USD/EUR XCS:")
-    print(f"    USD Leg: $100MM @ 5.00% quarterly ACT/360")
-    print(f"    EUR Leg: €90.9MM @ 3.50% quarterly ACT/360")
-    print(f"    Initial FX: 1.10, Principal exchange at start and end")
-    
-    print("\n2. Mark-to-Market Cross-Currency Swap (MtM XCS):")
-    print("-" * 60)
     
     # MtM XCS with FX resets
     mtm_xcs = XCS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="3Y",
         frequency="Q",
         leg2_frequency="Q",
@@ -471,16 +396,9 @@ def construct_cross_currency_swaps():
         principal_exchange_final=True,
         curves=None
     )
-    print(f"  3Y MtM XCS with quarterly FX resets:")
-    print(f"    USD Leg: $100MM float + 25bp")
-    print(f"    EUR Leg: €90.9MM float - 10bp")
-    print(f"    FX resets quarterly, no initial exchange")
-    
-    print("\n3. Fixed-Fixed Cross-Currency Swap:")
-    print("-" * 60)
     
     fixed_fixed_xcs = XCS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="10Y",
         frequency="S",  # Semi-annual
         leg2_frequency="A",  # Annual (different frequencies)
@@ -497,17 +415,10 @@ def construct_cross_currency_swaps():
         principal_exchange_final=True,
         curves=None
     )
-    print(f"  10Y USD/GBP Fixed-Fixed:")
-    print(f"    USD Leg: $100MM @ 5.25% semi-annual 30/360")
-    print(f"    GBP Leg: £80MM @ 4.75% annual ACT/360")
-    print(f"    Cable: 1.25, Full principal exchange")
-    
-    print("\n4. Non-Deliverable Cross-Currency Swap (for restricted currencies):")
-    print("-" * 60)
     
     # Example: USD/CNY NDS
     nds = XCS(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="2Y",
         frequency="Q",
         leg2_frequency="Q",
@@ -525,13 +436,57 @@ def construct_cross_currency_swaps():
         ndf_settlement_currency="USD",
         curves=None
     )
-    print(f"  2Y USD/CNY Non-Deliverable Swap:")
-    print(f"    USD Leg: $100MM @ 5.00%")
-    print(f"    CNY Leg: ¥720MM @ 2.50% (notional)")
-    print(f"    No principal exchange, USD cash settlement")
     
-    print("\n5. XCS Construction Key Points:")
-    print("-" * 60)
+    return usd_eur_xcs, mtm_xcs, fixed_fixed_xcs, nds
+
+
+def _report_cross_currency_swaps(out=None):
+    """
+    Print the construction walkthrough for ``construct_cross_currency_swaps``.
+    
+    Output goes to the text stream ``out`` (stdout when None).
+    """
+    
+    print("\n" + "=" * 80, file=out)
+    print("CORRECT CROSS-CURRENCY SWAP CONSTRUCTION", file=out)
+    print("=" * 80, file=out)
+    
+    print(f"\nBase Date: {BASE_DATE:%Y-%m-%d}", file=out)
+    
+    print("\n1. Standard USD/EUR Cross-Currency Swap:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  5Y USD/EUR XCS:", file=out)
+    print(f"    USD Leg: $100MM @ 5.00% quarterly ACT/360", file=out)
+    print(f"    EUR Leg: €90.9MM @ 3.50% quarterly ACT/360", file=out)
+    print(f"    Initial FX: 1.10, Principal exchange at start and end", file=out)
+    
+    print("\n2. Mark-to-Market Cross-Currency Swap (MtM XCS):", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  3Y MtM XCS with quarterly FX resets:", file=out)
+    print(f"    USD Leg: $100MM float + 25bp", file=out)
+    print(f"    EUR Leg: €90.9MM float - 10bp", file=out)
+    print(f"    FX resets quarterly, no initial exchange", file=out)
+    
+    print("\n3. Fixed-Fixed Cross-Currency Swap:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  10Y USD/GBP Fixed-Fixed:", file=out)
+    print(f"    USD Leg: $100MM @ 5.25% semi-annual 30/360", file=out)
+    print(f"    GBP Leg: £80MM @ 4.75% annual ACT/360", file=out)
+    print(f"    Cable: 1.25, Full principal exchange", file=out)
+    
+    print("\n4. Non-Deliverable Cross-Currency Swap (for restricted currencies):", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  2Y USD/CNY Non-Deliverable Swap:", file=out)
+    print(f"    USD Leg: $100MM @ 5.00%", file=out)
+    print(f"    CNY Leg: ¥720MM @ 2.50% (notional)", file=out)
+    print(f"    No principal exchange, USD cash settlement", file=out)
+    
+    print("\n5. XCS Construction Key Points:", file=out)
+    print("-" * 60, file=out)
     print("""
 Standard XCS Features:
 ✓ Principal exchange at start and maturity
@@ -558,30 +513,22 @@ Critical Construction:
 • fx_reset enables mark-to-market feature
 • Different frequencies allowed per leg
 • Spread conventions vary by market
-""")
-    
-    return usd_eur_xcs, mtm_xcs, fixed_fixed_xcs, nds
+""", file=out)
 
 
 def construct_swaptions_and_options():
     """
     Correctly construct swaptions, caps, and floors.
-    """
     
-    print("\n" + "=" * 80)
-    print("CORRECT SWAPTION AND OPTION CONSTRUCTION")
-    print("=" * 80)
-    
-    base_date = dt(2024, 1, 15)
-    
-    print(f"\nBase Date: {base_date.strftime('%Y-%m-%d')}")
-    
-    print("\n1. European Swaptions:")
-    print("-" * 60)
+    Returns:
+        tuple: (swaption_1y5y, cap_2y, floor_5y, swaption_6m2y, bermudan, collar_cap,
+        collar_floor, digital), freshly built on every call
+    """
+    from rateslib import CapFloor, Swaption, add_tenor
     
     # 1Y into 5Y payer swaption (1Y5Y)
     swaption_1y5y = Swaption(
-        effective=base_date,
+        effective=BASE_DATE,
         expiry="1Y",  # Option expiry
         termination="6Y",  # Swap maturity (1Y + 5Y)
         frequency="S",  # Underlying swap frequency
@@ -593,14 +540,10 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None  # Need vol surface
     )
-    print(f"  1Y5Y Payer Swaption:")
-    print(f"    Expiry: 1Y, Underlying: 5Y swap")
-    print(f"    Strike: 4.50%, Notional: $100MM")
-    print(f"    European exercise")
     
     # 6M into 2Y receiver swaption
     swaption_6m2y = Swaption(
-        effective=base_date,
+        effective=BASE_DATE,
         expiry="6M",
         termination="30M",  # 6M + 2Y
         frequency="Q",
@@ -612,23 +555,17 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None
     )
-    print(f"\n  6M2Y Receiver Swaption:")
-    print(f"    Expiry: 6M, Underlying: 2Y swap")
-    print(f"    Strike: 5.00%, Notional: $100MM")
-    
-    print("\n2. Bermudan Swaptions:")
-    print("-" * 60)
     
     # Bermudan with quarterly exercise dates
     exercise_dates = [
-        add_tenor(base_date, "3M", "MF", "nyc"),
-        add_tenor(base_date, "6M", "MF", "nyc"),
-        add_tenor(base_date, "9M", "MF", "nyc"),
-        add_tenor(base_date, "1Y", "MF", "nyc"),
+        add_tenor(BASE_DATE, "3M", "MF", "nyc"),
+        add_tenor(BASE_DATE, "6M", "MF", "nyc"),
+        add_tenor(BASE_DATE, "9M", "MF", "nyc"),
+        add_tenor(BASE_DATE, "1Y", "MF", "nyc"),
     ]
     
     bermudan = Swaption(
-        effective=base_date,
+        effective=BASE_DATE,
         expiry=exercise_dates,  # Multiple exercise dates
         termination="5Y",
         frequency="S",
@@ -640,17 +577,10 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None
     )
-    print(f"  Bermudan Payer Swaption:")
-    print(f"    Exercise dates: 3M, 6M, 9M, 1Y")
-    print(f"    Final maturity: 5Y")
-    print(f"    Strike: 4.75%")
-    
-    print("\n3. Interest Rate Caps:")
-    print("-" * 60)
     
     # 2Y quarterly cap
     cap_2y = CapFloor(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="2Y",
         frequency="Q",  # Quarterly caplets
         convention="act360",
@@ -660,16 +590,10 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None  # Need caplet vols
     )
-    print(f"  2Y Quarterly Cap:")
-    print(f"    Strike: 5.25%, Notional: $100MM")
-    print(f"    8 caplets (quarterly over 2Y)")
-    
-    print("\n4. Interest Rate Floors:")
-    print("-" * 60)
     
     # 5Y semi-annual floor
     floor_5y = CapFloor(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="5Y",
         frequency="S",  # Semi-annual floorlets
         convention="act360",
@@ -679,16 +603,10 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None
     )
-    print(f"  5Y Semi-Annual Floor:")
-    print(f"    Strike: 3.50%, Notional: $100MM")
-    print(f"    10 floorlets (semi-annual over 5Y)")
-    
-    print("\n5. Collar (Cap + Floor):")
-    print("-" * 60)
     
     # Zero-cost collar structure
     collar_cap = CapFloor(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="3Y",
         frequency="Q",
         convention="act360",
@@ -700,7 +618,7 @@ def construct_swaptions_and_options():
     )
     
     collar_floor = CapFloor(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="3Y",
         frequency="Q",
         convention="act360",
@@ -710,18 +628,10 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None
     )
-    print(f"  3Y Collar Structure:")
-    print(f"    Long Cap @ 5.50%")
-    print(f"    Short Floor @ 4.00%")
-    print(f"    Protects against rates above 5.50%")
-    print(f"    Gives up gains below 4.00%")
-    
-    print("\n6. Digital/Binary Options:")
-    print("-" * 60)
     
     # Digital caplet
     digital = CapFloor(
-        effective=base_date,
+        effective=BASE_DATE,
         termination="1Y",
         frequency="Q",
         convention="act360",
@@ -732,12 +642,78 @@ def construct_swaptions_and_options():
         curves=None,
         volatility=None
     )
-    print(f"  1Y Digital Cap:")
-    print(f"    Trigger: 5.00%")
-    print(f"    Payoff: $10,000 per bp over strike")
     
-    print("\n7. Option Construction Key Points:")
-    print("-" * 60)
+    return (
+        swaption_1y5y, cap_2y, floor_5y,
+        swaption_6m2y, bermudan, collar_cap, collar_floor, digital,
+    )
+
+
+def _report_swaptions_and_options(out=None):
+    """
+    Print the construction walkthrough for ``construct_swaptions_and_options``.
+    
+    Output goes to the text stream ``out`` (stdout when None).
+    """
+    
+    print("\n" + "=" * 80, file=out)
+    print("CORRECT SWAPTION AND OPTION CONSTRUCTION", file=out)
+    print("=" * 80, file=out)
+    
+    print(f"\nBase Date: {BASE_DATE:%Y-%m-%d}", file=out)
+    
+    print("\n1. European Swaptions:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  1Y5Y Payer Swaption:", file=out)
+    print(f"    Expiry: 1Y, Underlying: 5Y swap", file=out)
+    print(f"    Strike: 4.50%, Notional: $100MM", file=out)
+    print(f"    European exercise", file=out)
+    
+    print(f"\n  6M2Y Receiver Swaption:", file=out)
+    print(f"    Expiry: 6M, Underlying: 2Y swap", file=out)
+    print(f"    Strike: 5.00%, Notional: $100MM", file=out)
+    
+    print("\n2. Bermudan Swaptions:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  Bermudan Payer Swaption:", file=out)
+    print(f"    Exercise dates: 3M, 6M, 9M, 1Y", file=out)
+    print(f"    Final maturity: 5Y", file=out)
+    print(f"    Strike: 4.75%", file=out)
+    
+    print("\n3. Interest Rate Caps:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  2Y Quarterly Cap:", file=out)
+    print(f"    Strike: 5.25%, Notional: $100MM", file=out)
+    print(f"    8 caplets (quarterly over 2Y)", file=out)
+    
+    print("\n4. Interest Rate Floors:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  5Y Semi-Annual Floor:", file=out)
+    print(f"    Strike: 3.50%, Notional: $100MM", file=out)
+    print(f"    10 floorlets (semi-annual over 5Y)", file=out)
+    
+    print("\n5. Collar (Cap + Floor):", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  3Y Collar Structure:", file=out)
+    print(f"    Long Cap @ 5.50%", file=out)
+    print(f"    Short Floor @ 4.00%", file=out)
+    print(f"    Protects against rates above 5.50%", file=out)
+    print(f"    Gives up gains below 4.00%", file=out)
+    
+    print("\n6. Digital/Binary Options:", file=out)
+    print("-" * 60, file=out)
+    
+    print(f"  1Y Digital Cap:", file=out)
+    print(f"    Trigger: 5.00%", file=out)
+    print(f"    Payoff: $10,000 per bp over strike", file=out)
+    
+    print("\n7. Option Construction Key Points:", file=out)
+    print("-" * 60, file=out)
     print("""
 Swaption Specifications:
 ✓ expiry = option exercise date
@@ -764,71 +740,69 @@ Volatility Requirements:
 • Caps: Need caplet volatilities
 • Can use normal or lognormal vols
 • SABR model common for smile
-""")
-    
-    return swaption_1y5y, cap_2y, floor_5y
+""", file=out)
 
 
-def construct_complex_structures():
+def construct_complex_structures(out=None):
     """
     Construct complex derivative structures correctly.
-    """
     
-    print("\n" + "=" * 80)
-    print("COMPLEX STRUCTURE CONSTRUCTION")
-    print("=" * 80)
+    Output goes to the text stream ``out`` (stdout when None).
+    """
     
-    base_date = dt(2024, 1, 15)
+    print("\n" + "=" * 80, file=out)
+    print("COMPLEX STRUCTURE CONSTRUCTION", file=out)
+    print("=" * 80, file=out)
     
-    print(f"\nBase Date: {base_date.strftime('%Y-%m-%d')}")
+    print(f"\nBase Date: {BASE_DATE:%Y-%m-%d}", file=out)
     
-    print("\n1. Constant Maturity Swap (CMS):")
-    print("-" * 60)
+    print("\n1. Constant Maturity Swap (CMS):", file=out)
+    print("-" * 60, file=out)
     
     print("""  5Y CMS vs SOFR:
     Fixed Leg: Quarterly payment of 10Y swap rate + 50bp
     Float Leg: Quarterly SOFR
     Requires: CMS convexity adjustment
-    Uses: 10Y swap rate fixing quarterly""")
+    Uses: 10Y swap rate fixing quarterly""", file=out)
     
-    print("\n2. Range Accrual (TARN):")
-    print("-" * 60)
+    print("\n2. Range Accrual (TARN):", file=out)
+    print("-" * 60, file=out)
     
     print("""  5Y Range Accrual Note:
     Pays: 6% × (days SOFR in [4%, 6%]) / total days
     Quarterly observation and payment
     Digital payoff based on range
-    Common structured note format""")
+    Common structured note format""", file=out)
     
-    print("\n3. Snowball (Ratchet Swap):")
-    print("-" * 60)
+    print("\n3. Snowball (Ratchet Swap):", file=out)
+    print("-" * 60, file=out)
     
     print("""  10Y Snowball Structure:
     Coupon(n) = Max(Coupon(n-1) + spread, Floor)
     Initial: 3%, Spread: -25bp, Floor: 0%
     Path dependent structure
-    Memory feature in coupon""")
+    Memory feature in coupon""", file=out)
     
-    print("\n4. Callable Range Accrual:")
-    print("-" * 60)
+    print("\n4. Callable Range Accrual:", file=out)
+    print("-" * 60, file=out)
     
     print("""  5NC1 Callable Range Accrual:
     Issuer call quarterly after 1Y
     Range: [3%, 7%] on 5Y CMS
     Coupon: 8% × days in range
-    Combines optionality with digital""")
+    Combines optionality with digital""", file=out)
     
-    print("\n5. Spread Option (Curve Steepener):")
-    print("-" * 60)
+    print("\n5. Spread Option (Curve Steepener):", file=out)
+    print("-" * 60, file=out)
     
     print("""  2Y Curve Steepener:
     Pays: Max(0, 10Y rate - 2Y rate - 50bp)
     Quarterly fixing and payment
     Benefits from curve steepening
-    Common hedge for flattening risk""")
+    Common hedge for flattening risk""", file=out)
     
-    print("\n6. Construction Complexity Notes:")
-    print("-" * 60)
+    print("\n6. Construction Complexity Notes:", file=out)
+    print("-" * 60, file=out)
     print("""
 Complex Features Requiring Special Handling:
 
@@ -860,54 +834,62 @@ Model Requirements:
 • Volatility surfaces
 • Correlation matrices
 • Credit/funding adjustments
-""")
+""", file=out)
 
 
 def main():
     """
     Demonstrate correct instrument construction across all types.
-    """
     
-    print("\n" + "=" * 80)
-    print("COMPLETE GUIDE TO CORRECT INSTRUMENT CONSTRUCTION")
-    print("Focus: Building instruments with exact specifications")
-    print("=" * 80)
-    
-    # Section 1: Futures as FRAs
-    print("\n" + "─" * 80)
-    print("SECTION 1: FUTURES AS FRAs")
-    print("─" * 80)
-    serial, quarterly = construct_sofr_futures_as_fras()
-    
-    # Section 2: SOFR Swaps
-    print("\n" + "─" * 80)
-    print("SECTION 2: SOFR SWAPS")
-    print("─" * 80)
-    sofr_swaps = construct_sofr_swaps()
-    
-    # Section 3: Cross-Currency Swaps
-    print("\n" + "─" * 80)
-    print("SECTION 3: CROSS-CURRENCY SWAPS")
-    print("─" * 80)
-    xcs_instruments = construct_cross_currency_swaps()
-    
-    # Section 4: Options
-    print("\n" + "─" * 80)
-    print("SECTION 4: SWAPTIONS AND OPTIONS")
-    print("─" * 80)
-    options = construct_swaptions_and_options()
-    
-    # Section 5: Complex Structures
-    print("\n" + "─" * 80)
-    print("SECTION 5: COMPLEX STRUCTURES")
-    print("─" * 80)
-    construct_complex_structures()
-    
-    # Summary
-    print("\n" + "=" * 80)
-    print("INSTRUMENT CONSTRUCTION SUMMARY")
-    print("=" * 80)
-    print("""
+    The report is buffered and written to stdout in one go at the end; whatever was
+    rendered is still written if a constructor raises.
+    """
+    out = io.StringIO()
+    
+    try:
+        print("\n" + "=" * 80, file=out)
+        print("COMPLETE GUIDE TO CORRECT INSTRUMENT CONSTRUCTION", file=out)
+        print("Focus: Building instruments with exact specifications", file=out)
+        print("=" * 80, file=out)
+        
+        # Section 1: Futures as FRAs
+        print("\n" + "─" * 80, file=out)
+        print("SECTION 1: FUTURES AS FRAs", file=out)
+        print("─" * 80, file=out)
+        serial, quarterly = construct_sofr_futures_as_fras(out)
+        
+        # Section 2: SOFR Swaps
+        print("\n" + "─" * 80, file=out)
+        print("SECTION 2: SOFR SWAPS", file=out)
+        print("─" * 80, file=out)
+        sofr_swaps = construct_sofr_swaps()
+        _report_sofr_swaps(out)
+        
+        # Section 3: Cross-Currency Swaps
+        print("\n" + "─" * 80, file=out)
+        print("SECTION 3: CROSS-CURRENCY SWAPS", file=out)
+        print("─" * 80, file=out)
+        xcs_instruments = construct_cross_currency_swaps()
+        _report_cross_currency_swaps(out)
+        
+        # Section 4: Options
+        print("\n" + "─" * 80, file=out)
+        print("SECTION 4: SWAPTIONS AND OPTIONS", file=out)
+        print("─" * 80, file=out)
+        options = construct_swaptions_and_options()
+        _report_swaptions_and_options(out)
+        
+        # Section 5: Complex Structures
+        print("\n" + "─" * 80, file=out)
+        print("SECTION 5: COMPLEX STRUCTURES", file=out)
+        print("─" * 80, file=out)
+        construct_complex_structures(out)
+        
+        # Summary
+        print("\n" + "=" * 80, file=out)
+        print("INSTRUMENT CONSTRUCTION SUMMARY", file=out)
+        print("=" * 80, file=out)
+        print("""
 KEY TAKEAWAYS FOR CORRECT CONSTRUCTION:
 
 1. FUTURES AS FRAs:
@@ -943,10 +925,12 @@ KEY TAKEAWAYS FOR CORRECT CONSTRUCTION:
 This implementation provides templates for building
 instruments correctly regardless of market data availability.
 Focus on structure, not pricing!
-""")
-    
-    print("\n✓ Instrument construction guide complete!")
-    print("✓ All examples show correct specifications!")
+    """, file=out)
+        
+        print("\n✓ Instrument construction guide complete!", file=out)
+        print("✓ All examples show correct specifications!", file=out)
+    finally:
+        sys.stdout.write(out.getvalue())
     
     return True
 
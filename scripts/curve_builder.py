@@ -2,6 +2,7 @@
 Curve Builder Module - Load curves from YAML configuration files
 """
 
+import functools
 import yaml
 import numpy as np
 import pandas as pd
@@ -9,6 +10,12 @@ from datetime import datetime as dt
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# YAML loader for curve configs: the libyaml-backed one when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 try:
     import rateslib as rl
     from rateslib import *
@@ -16,6 +23,12 @@ except ImportError:
     print("Warning: rateslib not installed")
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_ymd(date_str: str) -> dt:
+    """Parse a YYYY-MM-DD string, memoized since node dates repeat across configs"""
+    return dt.strptime(date_str, "%Y-%m-%d")
+
+
 class CurveBuilder:
     """Build curves from YAML configuration files"""
     
@@ -30,7 +43,7 @@ class CurveBuilder:
         """Load YAML configuration file"""
         config_path = self.config_dir / config_file
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YAML_LOADER)
         self.configs[config_file] = config
         return config
     
@@ -38,7 +51,7 @@ class CurveBuilder:
         """Parse date string to datetime"""
         if isinstance(date_str, dt):
             return date_str
-        return dt.strptime(str(date_str), "%Y-%m-%d")
+        return parse_ymd(str(date_str))
     
     def build_curve_from_config(self, config: Dict) -> 'Curve':
         """Build a curve from configuration dictionary"""
@@ -241,14 +254,16 @@ class CurveBuilder:
         
         all_dates = sorted(all_dates)
         
-        # Build comparison dataframe
-        data = {}
-        for name in curve_names:
-            if name in self.curves:
-                curve = self.curves[name]
-                data[name] = [float(curve[date]) for date in all_dates]
+        # Build comparison dataframe: one float64 column of discount factors per curve
+        names = [name for name in curve_names if name in self.curves]
+        stack = np.empty((len(all_dates), len(names)), dtype=np.float64)
+        for j, name in enumerate(names):
+            curve = self.curves[name]
+            stack[:, j] = np.fromiter(
+                (float(curve[date]) for date in all_dates), dtype=np.float64, count=len(all_dates)
+            )
         
-        df = pd.DataFrame(data, index=all_dates)
+        df = pd.DataFrame(data=stack, columns=names, index=pd.DatetimeIndex(all_dates))
         return df
 
 
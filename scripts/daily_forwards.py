@@ -5,13 +5,15 @@ With butterfly targeting and turn handling
 
 import numpy as np
 import pandas as pd
-from datetime import datetime as dt, timedelta
+from datetime import datetime as dt
 from typing import Dict, List, Optional, Tuple, Any
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from pathlib import Path
 import yaml
 
+from curve_builder import YAML_LOADER, parse_ymd
+
 try:
     import rateslib as rl
     from rateslib import *
@@ -43,57 +45,58 @@ class DailyForwardCalculator:
         - finite_diff: finite differences on log discount factors
         - analytical: analytical derivatives
         """
-        dates = []
-        forwards = []
-        
-        current = start_date
-        while current < end_date:
-            dates.append(current)
+        # Every day in [start_date, end_date) and its next day, built in one pass
+        days = np.arange(np.datetime64(start_date), np.datetime64(end_date), np.timedelta64(1, "D"))
+        dates = days.astype("datetime64[us]").tolist()
+        next_dates = (days + np.timedelta64(1, "D")).astype("datetime64[us]").tolist()
+        n = len(dates)
+        
+        if method == "direct":
+            # Direct calculation
+            forwards = np.array([self.curve.rate(d, nd) for d, nd in zip(dates, next_dates)])
             
-            if method == "direct":
-                # Direct calculation
-                fwd = self.curve.rate(current, current + timedelta(days=1))
-                
-            elif method == "dual":
-                # Using dual numbers
-                df_today = self.curve[current]
-                df_tomorrow = self.curve[current + timedelta(days=1)]
-                dcf = self.curve.dcf(current, current + timedelta(days=1))
-                if dcf > 0:
-                    fwd = (float(df_today) / float(df_tomorrow) - 1.0) / dcf
-                else:
-                    fwd = 0.0
-                    
-            elif method == "finite_diff":
-                # Finite differences
-                df_today = float(self.curve[current])
-                df_tomorrow = float(self.curve[current + timedelta(days=1)])
-                if df_tomorrow > 0:
-                    dcf = self.curve.dcf(current, current + timedelta(days=1))
-                    fwd = -np.log(df_tomorrow / df_today) / dcf if dcf > 0 else 0.0
+        elif method in ("dual", "finite_diff"):
+            # Discount factors and day count fractions for the whole range
+            dfs = np.fromiter((float(self.curve[d]) for d in dates), dtype=np.float64, count=n)
+            dfs_next = np.fromiter(
+                (float(self.curve[d]) for d in next_dates), dtype=np.float64, count=n
+            )
+            dcfs = np.fromiter(
+                (self.curve.dcf(d, nd) for d, nd in zip(dates, next_dates)), dtype=np.float64, count=n
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if method == "dual":
+                    # Using dual numbers
+                    forwards = np.where(dcfs > 0, (dfs / dfs_next - 1.0) / dcfs, 0.0)
                 else:
-                    fwd = 0.0
+                    # Finite differences
+                    valid = (dfs_next > 0) & (dcfs > 0)
+                    forwards = np.where(valid, -np.log(dfs_next / dfs) / dcfs, 0.0)
                     
-            elif method == "analytical":
-                # Analytical derivative (if available)
-                try:
-                    # This would require curve to have derivative method
-                    fwd = self.curve.forward_rate(current, current + timedelta(days=1))
-                except:
-                    # Fallback to direct
-                    fwd = self.curve.rate(current, current + timedelta(days=1))
+        elif method == "analytical":
+            # Analytical derivative (if available)
+            forwards = np.array([self._analytical_forward(d, nd) for d, nd in zip(dates, next_dates)])
             
-            forwards.append(fwd * 100)  # Convert to percentage
-            current += timedelta(days=1)
+        else:
+            raise ValueError(f"Unknown forward method: {method}")
         
         df = pd.DataFrame({
             'date': dates,
-            'forward_rate': forwards
+            'forward_rate': forwards * 100  # Convert to percentage
         })
         
         self.forwards = df
         return df
     
+    def _analytical_forward(self, start: dt, end: dt):
+        """Forward rate from the curve's derivative method, falling back to curve.rate"""
+        try:
+            # This would require curve to have derivative method
+            return self.curve.forward_rate(start, end)
+        except:
+            # Fallback to direct
+            return self.curve.rate(start, end)
+    
     def identify_turns(self, threshold: float = 50) -> List[Dict]:
         """
         Identify turn periods where rates change rapidly
@@ -104,42 +107,36 @@ class DailyForwardCalculator:
         if self.forwards.empty:
             return []
         
-        turns = []
-        df = self.forwards.copy()
-        df['rate_change'] = df['forward_rate'].diff()
-        
-        # Find large changes
-        turn_mask = np.abs(df['rate_change']) > threshold / 10000
-        
-        # Group consecutive turn days
-        turn_groups = []
-        in_turn = False
-        current_turn = None
-        
-        for idx, row in df.iterrows():
-            if turn_mask.iloc[idx] and not in_turn:
-                # Start of turn
-                in_turn = True
-                current_turn = {
-                    'start': row['date'],
-                    'rates': [row['forward_rate']]
-                }
-            elif in_turn and not turn_mask.iloc[idx]:
-                # End of turn
-                current_turn['end'] = df.iloc[idx-1]['date']
-                current_turn['impact'] = max(current_turn['rates']) - min(current_turn['rates'])
-                turns.append(current_turn)
-                in_turn = False
-                current_turn = None
-            elif in_turn:
-                # Continue turn
-                current_turn['rates'].append(row['forward_rate'])
-        
-        # Handle turn at end
-        if in_turn and current_turn:
-            current_turn['end'] = df.iloc[-1]['date']
-            current_turn['impact'] = max(current_turn['rates']) - min(current_turn['rates'])
-            turns.append(current_turn)
+        rates = self.forwards['forward_rate'].to_numpy(dtype=np.float64)
+        dates = self.forwards['date']
+        
+        # Find large changes (the first day has no change and is never a turn)
+        turn_mask = np.abs(np.diff(rates, prepend=np.nan)) > threshold / 10000
+        
+        # Group consecutive turn days: runs of the mask start at +1 edges and end before -1 edges
+        edges = np.diff(np.concatenate(([0], turn_mask.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        if len(starts) == 0:
+            self.turns = []
+            return []
+        
+        # Rate range over each run, reduced segment-wise over the turn days only
+        turn_rates = rates[turn_mask]
+        offsets = np.concatenate(([0], np.cumsum(ends - starts + 1)[:-1]))
+        impacts = np.maximum.reduceat(turn_rates, offsets) - np.minimum.reduceat(turn_rates, offsets)
+        
+        turns = [
+            {
+                'start': dates.iloc[start],
+                'rates': run_rates.tolist(),
+                'end': dates.iloc[end],
+                'impact': impact,
+            }
+            for start, end, run_rates, impact in zip(
+                starts, ends, np.split(turn_rates, offsets[1:]), impacts.tolist()
+            )
+        ]
         
         self.turns = turns
         return turns
@@ -163,16 +160,15 @@ class DailyForwardCalculator:
         butterflies = []
         base_date = self.forwards['date'].iloc[0] if not self.forwards.empty else dt.today()
         
+        # Roll and price each distinct tenor once; wings are shared across butterflies
+        unique_tenors = dict.fromkeys(t for triple in tenors for t in triple)
+        rates = {
+            t: self.curve.rate(base_date, rl.add_tenor(base_date, t, "MF", "nyc")) * 100
+            for t in unique_tenors
+        }
+        
         for left, body, right in tenors:
-            # Convert tenors to dates
-            left_date = rl.add_tenor(base_date, left, "MF", "nyc")
-            body_date = rl.add_tenor(base_date, body, "MF", "nyc")
-            right_date = rl.add_tenor(base_date, right, "MF", "nyc")
-            
-            # Calculate rates
-            left_rate = self.curve.rate(base_date, left_date) * 100
-            body_rate = self.curve.rate(base_date, body_date) * 100
-            right_rate = self.curve.rate(base_date, right_date) * 100
+            left_rate, body_rate, right_rate = rates[left], rates[body], rates[right]
             
             # Butterfly = 2*body - left - right
             butterfly = 2 * body_rate - left_rate - right_rate
@@ -326,13 +322,13 @@ class DailyForwardCalculator:
 def load_curve_with_turns(config_file: str) -> Tuple['Curve', Dict]:
     """Load curve from YAML configuration with turn handling"""
     with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YAML_LOADER)
     
     # Build base curve
     base_config = config.get('base_curve', {})
     nodes = {}
     for node in base_config.get('nodes', []):
-        date = dt.strptime(node['date'], "%Y-%m-%d")
+        date = parse_ymd(str(node['date']))
         nodes[date] = node.get('df', 1.0)
     
     base_curve = Curve(
@@ -348,7 +344,7 @@ def load_curve_with_turns(config_file: str) -> Tuple['Curve', Dict]:
         turn_config = config['turn_curve']
         turn_nodes = {}
         for node in turn_config.get('nodes', []):
-            date = dt.strptime(node['date'], "%Y-%m-%d")
+            date = parse_ymd(str(node['date']))
             turn_nodes[date] = node.get('df', 1.0)
         
         turn_curve = Curve(